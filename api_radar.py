@@ -5,20 +5,82 @@ Integra com: Câmara dos Deputados, Senado Federal, Câmara Municipal SP, ALESP
 
 import requests
 import json
+import os
+import gzip
+import hashlib
+import threading
+import tempfile
+import codecs
+from collections import namedtuple, deque
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterator, Iterable, Callable, Any, Tuple
 import re
 import time
 import xml.etree.ElementTree as ET
 import zipfile
-from io import BytesIO
 
-# URLs das APIs
-API_CAMARA = "https://dadosabertos.camara.leg.br/api/v2"
-API_SENADO = "https://legis.senado.leg.br/dadosabertos"
+import http_radar
+from registro_radar import RegistroPL
+
+# URLs das APIs (podem ser sobrescritas por variáveis de ambiente ou por usar_servidor_local)
+API_CAMARA = os.getenv("RADAR_API_CAMARA", "https://dadosabertos.camara.leg.br/api/v2")
+API_SENADO = os.getenv("RADAR_API_SENADO", "https://legis.senado.leg.br/dadosabertos")
 API_CAMARA_SP = None  # Verificar se há API pública
 API_ALESP = None  # Verificar se há API pública
 
+# Web service da Câmara Municipal de SP
+WS_CAMARA_SP = os.getenv("RADAR_WS_CAMARA_SP", "https://splegisws.saopaulo.sp.leg.br/ws/ws2.asmx")
+
+# Arquivo de dados abertos da ALESP (ZIP com XML de todas as proposituras)
+URL_ALESP_ZIP = os.getenv(
+    "RADAR_URL_ALESP_ZIP",
+    "https://www.al.sp.gov.br/repositorioDados/processo_legislativo/proposituras.zip"
+)
+
+
+def usar_servidor_local(base_url: str):
+    """
+    Aponta as quatro fontes para o servidor de respostas gravadas (servidor_replay.py)
+
+    As URLs viram {base_url}/{host real}/{caminho}, o formato que o servidor espera.
+    Também pode ser ativado com a variável de ambiente RADAR_REPLAY_URL.
+    """
+    global API_CAMARA, API_SENADO, WS_CAMARA_SP, URL_ALESP_ZIP
+    base = base_url.rstrip('/')
+    API_CAMARA = f"{base}/dadosabertos.camara.leg.br/api/v2"
+    API_SENADO = f"{base}/legis.senado.leg.br/dadosabertos"
+    WS_CAMARA_SP = f"{base}/splegisws.saopaulo.sp.leg.br/ws/ws2.asmx"
+    URL_ALESP_ZIP = f"{base}/www.al.sp.gov.br/repositorioDados/processo_legislativo/proposituras.zip"
+    http_radar.registrar_servidor_local(base)
+
+
+if os.getenv("RADAR_REPLAY_URL"):
+    usar_servidor_local(os.environ["RADAR_REPLAY_URL"])
+
+# Cache local em disco (índice pré-processado da ALESP, etc.)
+# Pode ser sobrescrito via variável de ambiente RADAR_CACHE_DIR
+CACHE_DIR = http_radar.CACHE_DIR
+
+# Teto de páginas por termo no modo "palavras_chave" (100 itens por página)
+CAMARA_PAGINAS_MAX_POR_TERMO = 50
+
+# Páginas pedidas à frente do consumidor em iterar_camara_deputados: poucas, para
+# que a busca pare logo depois que o limite é atingido
+CAMARA_PAGINAS_A_FRENTE = 2
+
+# Cache dos detalhes por proposição da Câmara: situação muda com a tramitação,
+# autoria praticamente nunca
+CAMARA_DETALHES_TTL = 6 * 60 * 60
+CAMARA_AUTORES_TTL = 30 * 24 * 60 * 60
+
+# Quantos autores listar antes de resumir como "e mais N"
+CAMARA_AUTORES_MAX = 3
+
+# Intervalo mínimo entre revalidações do proposituras.zip (o portal atualiza 1x por dia)
+ALESP_TTL_SEGUNDOS = 6 * 60 * 60
+
 # Termos para filtrar PLs relacionadas a LGBTQIA+
 # TERMOS ESPECÍFICOS primeiro (mais relevantes)
 TERMOS_BUSCA_ESPECIFICOS = [
@@ -83,6 +145,310 @@ TERMOS_BUSCA_CONTEXTUAIS = [
 
 TERMOS_BUSCA = TERMOS_BUSCA_ESPECIFICOS + TERMOS_BUSCA_CONTEXTUAIS
 
+# Palavras que dão contexto legislativo aos termos contextuais
+PALAVRAS_LEGISLATIVAS = [
+    'proíbe', 'veda', 'restringe', 'garante', 'reconhece', 'criminaliza',
+    'orientação', 'identidade', 'gênero', 'sexual', 'direito', 'direitos',
+    'dispõe', 'altera', 'estabelece', 'define'
+]
+
+# Regra do "trans": só conta com palavra LGBTQIA+ ou verbo/termo de direitos por perto
+PALAVRAS_CONTEXTO_TRANS = ['gênero', 'sexual', 'identidade', 'lgbt', 'transfobia', 'transexual', 'transgênero']
+PALAVRAS_ACAO_TRANS = ['proíbe', 'veda', 'restringe', 'garante', 'reconhece', 'criminaliza', 'direito', 'direitos']
+
+# Termos contextuais considerados no filtro de relevância
+TERMOS_CONTEXTUAIS_FILTRO = TERMOS_BUSCA_CONTEXTUAIS[:8]
+
+# ---------------------------------------------------------------------------
+# Matcher único de termos (compilado uma vez na importação)
+# ---------------------------------------------------------------------------
+# Todos os termos (específicos, contextuais e palavras auxiliares) viram uma só
+# regex em forma de trie dentro de um lookahead: em cada posição do texto ela
+# captura o termo mais longo que começa ali, numa única varredura. Como todo
+# termo presente começa em alguma posição e é prefixo do termo mais longo
+# encontrado nela, o conjunto de termos contidos em cada termo encontrado
+# (_SUBTERMOS) reconstrói exatamente o resultado de `termo in ementa` para
+# todos os termos.
+
+AnaliseEmenta = namedtuple("AnaliseEmenta", ["termos", "especificos", "contextuais", "legislativas", "relevante"])
+
+_RE_TRANS_PALAVRA = re.compile(r'\btrans\b')
+
+
+def _regex_trie(termos: List[str]) -> str:
+    """Monta uma alternância em forma de trie (ramifica por caractere, sem backtracking entre termos)"""
+    raiz = {}
+    for termo in termos:
+        no = raiz
+        for caractere in termo:
+            no = no.setdefault(caractere, {})
+        no[''] = {}
+    
+    def emitir(no):
+        alternativas = [re.escape(c) + emitir(filho) for c, filho in sorted(no.items()) if c != '']
+        if not alternativas:
+            return ''
+        corpo = alternativas[0] if len(alternativas) == 1 else '(?:' + '|'.join(alternativas) + ')'
+        return f'(?:{corpo})?' if '' in no else corpo
+    
+    return emitir(raiz)
+
+
+def _compilar_matcher():
+    vocabulario = sorted({
+        t.lower() for t in
+        TERMOS_BUSCA + PALAVRAS_LEGISLATIVAS + PALAVRAS_CONTEXTO_TRANS + PALAVRAS_ACAO_TRANS
+    })
+    regex = re.compile('(?=(' + _regex_trie(vocabulario) + '))')
+    subtermos = {t: frozenset(u for u in vocabulario if u in t) for t in vocabulario}
+    return regex, subtermos
+
+
+_RE_TERMOS, _SUBTERMOS = _compilar_matcher()
+_ESPECIFICOS_SEM_TRANS = frozenset(t.lower() for t in TERMOS_BUSCA_ESPECIFICOS if t != 'trans')
+_CONTEXTUAIS_FILTRO = frozenset(t.lower() for t in TERMOS_CONTEXTUAIS_FILTRO)
+_LEGISLATIVAS = frozenset(PALAVRAS_LEGISLATIVAS)
+_CONTEXTO_TRANS = frozenset(PALAVRAS_CONTEXTO_TRANS) | frozenset(PALAVRAS_ACAO_TRANS)
+
+
+def termos_na_ementa(ementa: str) -> frozenset:
+    """Todos os termos do vocabulário do radar presentes na ementa (uma única varredura)"""
+    encontrados = set()
+    for termo in set(_RE_TERMOS.findall(ementa.lower())):
+        encontrados |= _SUBTERMOS[termo]
+    return frozenset(encontrados)
+
+
+def analisar_ementa(ementa: str) -> AnaliseEmenta:
+    """
+    Aplica o filtro de relevância LGBTQIA+ usado por todas as fontes
+
+    Relevante = termo específico (com a regra especial do "trans") OU termo
+    contextual acompanhado de palavra legislativa.
+    """
+    termos = termos_na_ementa(ementa)
+    especificos = termos & _ESPECIFICOS_SEM_TRANS
+    if 'trans' in termos and termos & _CONTEXTO_TRANS and _RE_TRANS_PALAVRA.search(ementa.lower()):
+        especificos = especificos | {'trans'}
+    contextuais = termos & _CONTEXTUAIS_FILTRO
+    legislativas = termos & _LEGISLATIVAS
+    relevante = bool(especificos) or (bool(contextuais) and bool(legislativas))
+    return AnaliseEmenta(termos, especificos, contextuais, legislativas, relevante)
+
+
+def ementa_relevante(ementa: str) -> bool:
+    """Atalho para analisar_ementa(ementa).relevante"""
+    return analisar_ementa(ementa).relevante
+
+
+def _registrar_erro(erros: Optional[List[str]], mensagem: str):
+    """Mostra o aviso de uma requisição que falhou e, se pedido, acumula em `erros`"""
+    print(f"   ⚠️ {mensagem}")
+    if erros is not None:
+        erros.append(mensagem)
+
+
+def _buscar_pagina_camara(url: str, params: Dict) -> Dict:
+    """Busca uma página de /proposicoes pela sessão compartilhada (com cache por ano)"""
+    ano = params.get('ano') or str(params.get('dataApresentacaoFim', ''))[:4]
+    response = http_radar.get(url, params=params, timeout=15, cache_ttl=http_radar.ttl_para_ano(url, ano))
+    response.raise_for_status()
+    return response.json()
+
+
+def _ultima_pagina_camara(data: Dict) -> Optional[int]:
+    """Extrai o número da última página a partir dos links de paginação da API"""
+    for link in data.get('links', []) or []:
+        if link.get('rel') == 'last':
+            match = re.search(r'[?&]pagina=(\d+)', link.get('href', ''))
+            if match:
+                return int(match.group(1))
+    return None
+
+
+def _pl_camara(prop: Dict) -> RegistroPL:
+    """Converte uma proposição da API da Câmara no formato de PL do radar"""
+    return RegistroPL(
+        numero=f"{prop.get('siglaTipo', 'PL')} {prop.get('numero', 'N/A')}/{prop.get('ano', 'N/A')}",
+        ano=prop.get('ano', 'N/A'),
+        casa='Câmara',
+        ementa=prop.get('ementa', 'Sem ementa'),
+        autores='N/A',  # Preenchido por enriquecer_camara
+        data=prop.get('dataApresentacao', 'N/A'),
+        status=prop.get('statusProposicao', {}).get('descricaoSituacao', 'N/A') if prop.get('statusProposicao') else 'N/A',
+        fonte='Câmara dos Deputados',
+        id_origem=prop.get('id')  # Link montado sob demanda
+    )
+
+
+def _buscar_camara_palavras_chave(
+    termos: List[str],
+    data_inicio: str,
+    data_fim: str,
+    sigla_tipo: str,
+    limite: int,
+    concorrencia: int,
+    erros: Optional[List[str]] = None
+) -> List[Dict]:
+    """
+    Busca na Câmara usando o filtro `keywords` da API (um termo por consulta)
+
+    Cada termo é consultado na janela de datas de apresentação inteira, com todas
+    as páginas em paralelo. As proposições são unificadas por id e passam pelo
+    mesmo filtro local das outras fontes (regras como a do "trans" só existem aqui).
+    """
+    url = f"{API_CAMARA}/proposicoes"
+    itens_por_pagina = 100
+    
+    def params_consulta(termo, pagina):
+        return {
+            "siglaTipo": sigla_tipo,
+            "keywords": termo,
+            "dataApresentacaoInicio": data_inicio,
+            "dataApresentacaoFim": data_fim,
+            "itens": itens_por_pagina,
+            "pagina": pagina
+        }
+    
+    props_por_id = {}
+    
+    with ThreadPoolExecutor(max_workers=concorrencia) as executor:
+        primeiras = {termo: executor.submit(_buscar_pagina_camara, url, params_consulta(termo, 1)) for termo in termos}
+        
+        demais = []
+        for termo in termos:
+            try:
+                data = primeiras[termo].result()
+            except Exception as e:
+                _registrar_erro(erros, f"Erro ao consultar '{termo}' na Câmara: {e}")
+                continue
+            
+            dados = data.get('dados') or []
+            for prop in dados:
+                props_por_id.setdefault(prop.get('id'), prop)
+            
+            ultima = _ultima_pagina_camara(data) or 1
+            ultima = min(ultima, CAMARA_PAGINAS_MAX_POR_TERMO)
+            if dados:
+                print(f"   🔎 '{termo}': {len(dados)} proposições na página 1 de {ultima}")
+            for pagina in range(2, ultima + 1):
+                demais.append((termo, pagina, executor.submit(_buscar_pagina_camara, url, params_consulta(termo, pagina))))
+        
+        for termo, pagina, futuro in demais:
+            try:
+                for prop in futuro.result().get('dados') or []:
+                    props_por_id.setdefault(prop.get('id'), prop)
+            except Exception as e:
+                _registrar_erro(erros, f"Erro ao consultar '{termo}' (página {pagina}) na Câmara: {e}")
+    
+    print(f"   📊 {len(props_por_id)} proposições distintas retornadas pela API (antes do filtro)")
+    
+    # Mesma ordem da busca por páginas: ano mais recente primeiro
+    props = sorted(props_por_id.values(), key=lambda p: (-int(p.get('ano') or 0), p.get('id') or 0))
+    
+    pls_encontradas = []
+    for prop in props:
+        if len(pls_encontradas) >= limite:
+            break
+        if ementa_relevante(prop.get('ementa', '')):
+            pls_encontradas.append(_pl_camara(prop))
+    
+    return pls_encontradas
+
+
+def iterar_camara_deputados(
+    anos: Iterable[int],
+    sigla_tipo: str = "PL",
+    paginas_max: Optional[int] = None,
+    concorrencia: Optional[int] = None,
+    erros: Optional[List[str]] = None
+) -> Iterator[Dict]:
+    """
+    Gera as PLs relevantes da Câmara página a página, ano a ano (na ordem de `anos`)
+    
+    Cada página é filtrada assim que chega. Novas páginas só são pedidas depois
+    que o consumidor termina a anterior, e no máximo CAMARA_PAGINAS_A_FRENTE (ou
+    `concorrencia`, se menor) ficam em voo; ao parar de consumir (break/close),
+    nenhuma outra página é pedida.
+    
+    Args:
+        anos: Anos a percorrer (ex.: reversed(range(2020, 2026)) = mais recente primeiro)
+        sigla_tipo: Tipo de proposição (PL, PEC, etc)
+        paginas_max: Teto de páginas por ano (None = todas)
+        concorrencia: Teto de páginas em paralelo (None = limite do host)
+        erros: Lista que recebe as páginas que falharam (None = só avisar)
+    
+    Yields:
+        PLs no formato de _pl_camara (sem duplicatas)
+    """
+    url = f"{API_CAMARA}/proposicoes"
+    if concorrencia is None:
+        concorrencia = http_radar.limite_conexoes(url)
+    a_frente = max(1, min(concorrencia, CAMARA_PAGINAS_A_FRENTE))
+    
+    def params_pagina(ano, pagina):
+        return {"siglaTipo": sigla_tipo, "ano": ano, "itens": 100, "pagina": pagina}
+    
+    ids_vistos = set()
+    
+    def relevantes(dados):
+        for prop in dados:
+            if prop.get('id') not in ids_vistos and ementa_relevante(prop.get('ementa', '')):
+                ids_vistos.add(prop.get('id'))
+                yield _pl_camara(prop)
+    
+    em_voo = deque()
+    with ThreadPoolExecutor(max_workers=a_frente) as executor:
+        try:
+            for ano in anos:
+                # Primeira página: dados + quantas páginas o ano tem
+                try:
+                    data = _buscar_pagina_camara(url, params_pagina(ano, 1))
+                except Exception as e:
+                    _registrar_erro(erros, f"Erro ao buscar página 1 de {ano}: {e}")
+                    continue
+                dados = data.get('dados') or []
+                if not dados:
+                    continue
+                print(f"   📥 Buscando em {ano} (página 1): {len(dados)} PLs encontradas")
+                
+                ultima = _ultima_pagina_camara(data) or 1
+                if paginas_max:
+                    ultima = min(ultima, paginas_max)
+                proximas = iter(range(2, ultima + 1))
+                
+                def reabastecer():
+                    while len(em_voo) < a_frente:
+                        pagina = next(proximas, None)
+                        if pagina is None:
+                            return
+                        em_voo.append((pagina, executor.submit(_buscar_pagina_camara, url, params_pagina(ano, pagina))))
+                
+                yield from relevantes(dados)
+                reabastecer()
+                
+                while em_voo:
+                    pagina, futuro = em_voo.popleft()
+                    try:
+                        dados = futuro.result().get('dados') or []
+                    except Exception as e:
+                        _registrar_erro(erros, f"Erro ao buscar página {pagina} de {ano}: {e}")
+                        dados = []
+                    if not dados:
+                        break  # Não há mais páginas (ou erro): próximo ano
+                    print(f"   📥 Buscando em {ano} (página {pagina}): {len(dados)} PLs encontradas")
+                    yield from relevantes(dados)
+                    reabastecer()
+                
+                for _, futuro in em_voo:
+                    futuro.cancel()
+                em_voo.clear()
+        finally:
+            # Consumidor parou: não iniciar páginas que ainda estão na fila
+            for _, futuro in em_voo:
+                futuro.cancel()
+
+
 def buscar_camara_deputados(
     termos: List[str] = None,
     data_inicio: Optional[str] = None,
@@ -91,11 +457,19 @@ def buscar_camara_deputados(
     limite: int = 50,
     dias_atras: Optional[int] = None,  # Para compatibilidade
     ano_inicio_manual: Optional[int] = None,  # Ano explícito para buscar
-    ano_fim_manual: Optional[int] = None  # Ano explícito para buscar
+    ano_fim_manual: Optional[int] = None,  # Ano explícito para buscar
+    concorrencia: Optional[int] = None,  # Requisições paralelas (None = limite do host)
+    modo: str = "paginas",  # "paginas" (ano inteiro) ou "palavras_chave" (filtro na API)
+    detalhes: bool = True,  # Preencher Autores/Status via enriquecer_camara
+    erros: Optional[List[str]] = None  # Recebe as requisições que falharam
 ) -> List[Dict]:
     """
     Busca PLs na API da Câmara dos Deputados
     
+    No modo "paginas" consome iterar_camara_deputados: poucas páginas são buscadas
+    à frente, em paralelo, filtradas à medida que chegam, e a busca para assim que
+    o limite é atingido; a ordem dos resultados é a mesma da busca sequencial.
+    
     Args:
         termos: Lista de termos para buscar
         data_inicio: Data início (formato: YYYY-MM-DD)
@@ -103,6 +477,13 @@ def buscar_camara_deputados(
         sigla_tipo: Tipo de proposição (PL, PLS, PEC, etc)
         limite: Número máximo de resultados
         dias_atras: Quantos dias atrás buscar (usa para determinar quantos anos buscar)
+        concorrencia: Máximo de requisições simultâneas desta busca (1 = sequencial)
+        modo: "paginas" percorre as páginas de cada ano filtrando localmente;
+            "palavras_chave" envia os termos no parâmetro `keywords` da API
+            e baixa só as proposições que os mencionam
+        detalhes: Busca autores e situação de cada PL encontrada (em paralelo, com cache)
+        erros: Lista que recebe uma mensagem por consulta/página que falhou
+            (o resultado pode estar incompleto mesmo sem exceção)
     
     Returns:
         Lista de PLs encontradas
@@ -136,111 +517,32 @@ def buscar_camara_deputados(
     pls_encontradas = []
     url = f"{API_CAMARA}/proposicoes"
     
-    # Buscar em cada ano (do mais antigo para o mais recente)
-    for ano in reversed(anos_para_buscar):
-        if len(pls_encontradas) >= limite:
-            break
-            
-        try:
-            # Buscar PLs deste ano
-            # API da Câmara permite até 100 itens por página
-            # Para garantir que temos PLs suficientes após filtrar, buscar múltiplas páginas se necessário
-            itens_por_pagina = 100
-            limite_busca_por_ano = max(limite * 15, 500)  # Buscar bem mais para garantir resultados após filtro
-            
-            params = {
-                "siglaTipo": sigla_tipo,
-                "ano": ano,
-                "itens": itens_por_pagina,
-                "pagina": 1
-            }
-            
-            # Buscar múltiplas páginas se necessário
-            # Calcular quantas páginas precisamos buscar baseado no limite
-            # Se queremos 50 PLs, precisamos buscar muito mais antes do filtro (ex: 500-1000)
-            paginas_para_buscar = max(1, (limite_busca_por_ano // itens_por_pagina) + 1)
-            # Limitar a 20 páginas máx (2000 PLs por ano) para não exceder rate limits
-            paginas_para_buscar = min(paginas_para_buscar, 20)
-            
-            todas_props_ano = []
-            for pagina in range(1, paginas_para_buscar + 1):
+    # Sem teto de páginas: a busca para quando o limite é atingido e o ritmo de
+    # requisições é controlado pelo limite adaptativo por host (http_radar)
+    if concorrencia is None:
+        concorrencia = http_radar.limite_conexoes(url)
+    concorrencia = max(1, concorrencia)
+    
+    if modo == "palavras_chave":
+        if termos is TERMOS_BUSCA:
+            termos = TERMOS_BUSCA_ESPECIFICOS + TERMOS_BUSCA_CONTEXTUAIS[:8]
+        # Termos com expressão regular não fazem sentido como palavra-chave
+        termos_consulta = [t for t in termos if '.*' not in t]
+        janela_inicio = data_inicio or f"{min(anos_para_buscar)}-01-01"
+        janela_fim = data_fim or f"{max(anos_para_buscar)}-12-31"
+        print(f"   🔎 Consultando {len(termos_consulta)} termos na API da Câmara ({janela_inicio} a {janela_fim})...")
+        pls_encontradas = _buscar_camara_palavras_chave(
+            termos_consulta, janela_inicio, janela_fim, sigla_tipo, limite, concorrencia, erros
+        )
+    else:
+        # Páginas consumidas sob demanda: nenhuma página é pedida depois que o limite é atingido
+        with closing(iterar_camara_deputados(
+            reversed(anos_para_buscar), sigla_tipo, None, concorrencia, erros
+        )) as pls_stream:
+            for pl in pls_stream:
+                pls_encontradas.append(pl)
                 if len(pls_encontradas) >= limite:
                     break
-                
-                params['pagina'] = pagina
-                try:
-                    response = requests.get(url, params=params, timeout=15)
-                    response.raise_for_status()
-                    data = response.json()
-                    
-                    if 'dados' in data and len(data['dados']) > 0:
-                        todas_props_ano.extend(data['dados'])
-                        print(f"   📥 Buscando em {ano} (página {pagina}): {len(data['dados'])} PLs encontradas")
-                    else:
-                        break  # Não há mais páginas
-                except Exception as e:
-                    print(f"   ⚠️ Erro ao buscar página {pagina} de {ano}: {e}")
-                    break
-            
-            if todas_props_ano:
-                print(f"   📊 Total em {ano}: {len(todas_props_ano)} PLs (antes do filtro)")
-                
-                for prop in todas_props_ano:
-                    if len(pls_encontradas) >= limite:
-                        break
-                    
-                    # Filtrar por termos na ementa
-                    ementa = prop.get('ementa', '').lower()
-                    
-                    # Verificar termos específicos primeiro (mais confiável)
-                    tem_termo_especifico = False
-                    for termo in TERMOS_BUSCA_ESPECIFICOS:
-                        # Para "trans", evitar falsos positivos mas ser menos restritivo
-                        if termo == 'trans' and 'trans' in ementa:
-                            # Aceitar "trans" se aparecer com palavras LGBTQIA+ OU sozinho em contexto legislativo
-                            if re.search(r'\btrans\b', ementa) and (
-                                any(palavra in ementa for palavra in ['gênero', 'sexual', 'identidade', 'lgbt', 'transfobia', 'transexual', 'transgênero']) or
-                                any(palavra in ementa for palavra in ['proíbe', 'veda', 'restringe', 'garante', 'reconhece', 'criminaliza', 'direito', 'direitos'])
-                            ):
-                                tem_termo_especifico = True
-                                break
-                        elif termo.lower() in ementa:
-                            tem_termo_especifico = True
-                            break
-                    
-                    # Verificar termos contextuais com palavras-chave legislativas (mais flexível)
-                    palavras_legislativas = ['proíbe', 'veda', 'restringe', 'garante', 'reconhece', 'criminaliza', 
-                                            'orientação', 'identidade', 'gênero', 'sexual', 'direito', 'direitos',
-                                            'dispõe', 'altera', 'estabelece', 'define']
-                    tem_termo_contextual = any(
-                        termo.lower() in ementa 
-                        for termo in TERMOS_BUSCA_CONTEXTUAIS[:8]  # Mais termos contextuais
-                    ) and any(
-                        palavra in ementa for palavra in palavras_legislativas
-                    )
-                    
-                    # Aceitar se tem termo específico OU termo contextual válido
-                    if tem_termo_especifico or tem_termo_contextual:
-                        # Adicionar sem buscar detalhes completos (para performance)
-                        pls_encontradas.append({
-                            'Nº': f"{prop.get('siglaTipo', 'PL')} {prop.get('numero', 'N/A')}/{prop.get('ano', 'N/A')}",
-                            'Ano': str(prop.get('ano', 'N/A')),
-                            'Casa': 'Câmara',
-                            'Ementa': prop.get('ementa', 'Sem ementa'),
-                            'Autores': prop.get('siglaTipo', ''),
-                            'Data': prop.get('dataApresentacao', 'N/A'),
-                            'Link': f"https://www.camara.leg.br/proposicoesWeb/fichadetramitacao?idProposicao={prop.get('id', '')}",
-                            'Status': prop.get('statusProposicao', {}).get('descricaoSituacao', 'N/A') if prop.get('statusProposicao') else 'N/A',
-                            'Fonte': 'Câmara dos Deputados'
-                        })
-                        
-                        if len(pls_encontradas) >= limite:
-                            break
-            
-        except requests.exceptions.HTTPError as e:
-            print(f"   ⚠️ Erro ao buscar na Câmara (ano {ano}): {e.response.status_code}")
-        except Exception as e:
-            print(f"   ⚠️ Erro ao buscar na Câmara (ano {ano}): {e}")
     
     # Remover duplicatas
     pls_unicas = []
@@ -251,26 +553,115 @@ def buscar_camara_deputados(
             ids_vistos.add(id_pl)
             pls_unicas.append(pl)
     
-    return pls_unicas[:limite]
+    pls_unicas = pls_unicas[:limite]
+    if detalhes:
+        enriquecer_camara(pls_unicas, concorrencia=concorrencia)
+    
+    return pls_unicas
+
 
 def obter_detalhes_camara(id_proposicao: str) -> Optional[Dict]:
-    """Obtém detalhes completos de uma proposição da Câmara"""
+    """Obtém detalhes completos de uma proposição da Câmara (cache de CAMARA_DETALHES_TTL)"""
     try:
         url = f"{API_CAMARA}/proposicoes/{id_proposicao}"
-        response = requests.get(url, timeout=10)
+        response = http_radar.get(url, timeout=10, cache_ttl=CAMARA_DETALHES_TTL)
         response.raise_for_status()
         data = response.json()
         return data.get('dados', {})
     except:
         return None
 
+
+def obter_autores_camara(id_proposicao: str) -> Optional[List[Dict]]:
+    """Obtém os autores de uma proposição da Câmara (cache de CAMARA_AUTORES_TTL)"""
+    try:
+        url = f"{API_CAMARA}/proposicoes/{id_proposicao}/autores"
+        response = http_radar.get(url, timeout=10, cache_ttl=CAMARA_AUTORES_TTL)
+        response.raise_for_status()
+        return response.json().get('dados', [])
+    except:
+        return None
+
+
+def _id_proposicao_camara(pl: Dict) -> Optional[str]:
+    """Id da proposição (do registro ou do link de tramitação gerado por _pl_camara)"""
+    if getattr(pl, 'id_origem', None):
+        return str(pl.id_origem)
+    match = re.search(r'idProposicao=(\d+)', str(pl.get('Link', '')))
+    return match.group(1) if match else None
+
+
+def _formatar_autores_camara(autores: List[Dict]) -> str:
+    """Lista de autores da API -> "Nome (PART-UF), Nome e mais N" """
+    nomes = []
+    for autor in sorted(autores, key=lambda a: a.get('ordemAssinatura') or 0):
+        nome = autor.get('nome')
+        if nome and nome not in nomes:
+            nomes.append(nome)
+    if not nomes:
+        return 'N/A'
+    texto = ", ".join(nomes[:CAMARA_AUTORES_MAX])
+    if len(nomes) > CAMARA_AUTORES_MAX:
+        texto += f" e mais {len(nomes) - CAMARA_AUTORES_MAX}"
+    return texto
+
+
+def enriquecer_camara(pls: List[Dict], concorrencia: Optional[int] = None) -> List[Dict]:
+    """
+    Preenche Autores e Status das PLs da Câmara com os detalhes de cada proposição
+    
+    Ids repetidos são buscados uma única vez; detalhes e autores vêm em paralelo
+    (limitados por http_radar.MAX_CONEXOES_POR_HOST) e ficam no cache HTTP em disco,
+    então buscas seguintes só vão à rede para situações com mais de CAMARA_DETALHES_TTL.
+    
+    Args:
+        pls: PLs no formato de _pl_camara (alteradas no lugar)
+        concorrencia: Requisições simultâneas (None = limite do host)
+    
+    Returns:
+        A mesma lista de PLs
+    """
+    pls_por_id = {}
+    for pl in pls:
+        id_proposicao = _id_proposicao_camara(pl)
+        if id_proposicao:
+            pls_por_id.setdefault(id_proposicao, []).append(pl)
+    if not pls_por_id:
+        return pls
+    
+    if concorrencia is None:
+        concorrencia = http_radar.limite_conexoes(API_CAMARA)
+    
+    inicio = time.time()
+    with ThreadPoolExecutor(max_workers=max(1, concorrencia)) as executor:
+        detalhes = {i: executor.submit(obter_detalhes_camara, i) for i in pls_por_id}
+        autores = {i: executor.submit(obter_autores_camara, i) for i in pls_por_id}
+        
+        enriquecidas = 0
+        for id_proposicao, pls_id in pls_por_id.items():
+            dados = detalhes[id_proposicao].result() or {}
+            lista_autores = autores[id_proposicao].result()
+            status = dados.get('statusProposicao') or {}
+            situacao = status.get('descricaoSituacao') or status.get('descricaoTramitacao')
+            for pl in pls_id:
+                if lista_autores:
+                    pl['Autores'] = _formatar_autores_camara(lista_autores)
+                if situacao:
+                    pl['Status'] = situacao
+            enriquecidas += bool(dados or lista_autores)
+    
+    print(f"   🧾 Detalhes de {enriquecidas}/{len(pls_por_id)} proposições da Câmara ({time.time() - inicio:.1f}s)")
+    return pls
+
+
 def buscar_senado_federal(
     termos: List[str] = None,
     data_inicio: Optional[str] = None,
     data_fim: Optional[str] = None,
     limite: int = 50,
     ano_inicio_manual: Optional[int] = None,
-    ano_fim_manual: Optional[int] = None
+    ano_fim_manual: Optional[int] = None,
+    erros: Optional[List[str]] = None
 ) -> List[Dict]:
     """
     Busca PLs no Senado Federal
@@ -280,6 +671,8 @@ def buscar_senado_federal(
     
     ✅ Este endpoint permite buscar matérias por ano de apresentação, resolvendo 
     o problema de lacunas em dados históricos.
+    
+    Anos cuja consulta falhou são pulados; com `erros`, cada falha é acumulada na lista.
     """
     if termos is None:
         termos = TERMOS_BUSCA
@@ -294,7 +687,7 @@ def buscar_senado_federal(
     pls_encontradas = []
     
     # API do Senado Federal - endpoint /materia/pesquisa/lista
-    url_base = "https://legis.senado.leg.br/dadosabertos/materia/pesquisa/lista"
+    url_base = f"{API_SENADO}/materia/pesquisa/lista"
     
     print(f"   📥 Buscando no Senado (anos {min(anos_para_buscar)}-{max(anos_para_buscar)})...")
     
@@ -307,13 +700,16 @@ def buscar_senado_federal(
                 # Buscar todas as matérias apresentadas no ano especificado
                 params = {'ano': str(ano)}
                 
-                response = requests.get(url_base, params=params, headers={'Accept': 'application/json'}, timeout=30)
+                response = http_radar.get(
+                    url_base, params=params, headers={'Accept': 'application/json'}, timeout=30,
+                    cache_ttl=http_radar.ttl_para_ano(url_base, ano)
+                )
                 response.raise_for_status()
                 
                 data = response.json()
                 
                 if 'PesquisaBasicaMateria' not in data:
-                    print(f"   ℹ️ Resposta inesperada do Senado em {ano}")
+                    _registrar_erro(erros, f"Resposta inesperada do Senado em {ano}")
                     continue
                 
                 materias_data = data['PesquisaBasicaMateria'].get('Materias', {})
@@ -355,47 +751,20 @@ def buscar_senado_federal(
                         if not ementa or len(ementa) < 10:
                             continue
                         
-                        ementa_lower = ementa.lower()
-                        
-                        # Filtrar por termos LGBTQIA+ (mesma lógica das outras fontes)
-                        tem_termo_especifico = False
-                        for termo in TERMOS_BUSCA_ESPECIFICOS:
-                            if termo == 'trans' and 'trans' in ementa_lower:
-                                if re.search(r'\btrans\b', ementa_lower) and (
-                                    any(p in ementa_lower for p in ['gênero', 'sexual', 'identidade', 'lgbt', 'transfobia', 'transexual', 'transgênero']) or
-                                    any(p in ementa_lower for p in ['proíbe', 'veda', 'restringe', 'garante', 'reconhece', 'criminaliza', 'direito', 'direitos'])
-                                ):
-                                    tem_termo_especifico = True
-                                    break
-                            elif termo.lower() in ementa_lower:
-                                tem_termo_especifico = True
-                                break
-                        
-                        palavras_legislativas = ['proíbe', 'veda', 'restringe', 'garante', 'reconhece', 'criminaliza', 
-                                                'orientação', 'identidade', 'gênero', 'sexual', 'direito', 'direitos',
-                                                'dispõe', 'altera', 'estabelece', 'define']
-                        tem_termo_contextual = any(
-                            termo.lower() in ementa_lower 
-                            for termo in TERMOS_BUSCA_CONTEXTUAIS[:8]
-                        ) and any(
-                            palavra in ementa_lower for palavra in palavras_legislativas
-                        )
-                        
-                        if tem_termo_especifico or tem_termo_contextual:
+                        # Filtrar por termos LGBTQIA+ (matcher compartilhado por todas as fontes)
+                        if ementa_relevante(ementa):
                             # Construir link para matéria
-                            link = f"https://www25.senado.leg.br/web/atividade/materias/-/materia/{codigo}" if codigo else "https://www25.senado.leg.br/web/atividade/materias"
-                            
-                            pls_encontradas.append({
-                                'Nº': f"{sigla} {numero}/{ano_materia}",
-                                'Ano': str(ano_materia),
-                                'Casa': 'Senado',
-                                'Ementa': ementa,
-                                'Autores': autor,
-                                'Data': data[:10] if isinstance(data, str) and len(data) >= 10 else str(data),
-                                'Link': link,
-                                'Status': materia.get('DescricaoIdentificacao', 'N/A'),
-                                'Fonte': 'Senado Federal'
-                            })
+                            pls_encontradas.append(RegistroPL(
+                                numero=f"{sigla} {numero}/{ano_materia}",
+                                ano=ano_materia,
+                                casa='Senado',
+                                ementa=ementa,
+                                autores=autor,
+                                data=data[:10] if isinstance(data, str) and len(data) >= 10 else str(data),
+                                status=materia.get('DescricaoIdentificacao', 'N/A'),
+                                fonte='Senado Federal',
+                                id_origem=codigo or None
+                            ))
                             
                             materias_ano += 1
                     
@@ -407,24 +776,98 @@ def buscar_senado_federal(
                     print(f"   ✅ Senado {ano}: {materias_ano} PLs relevantes")
                 
             except requests.exceptions.HTTPError as e:
-                print(f"   ⚠️ Erro HTTP no Senado ({ano}): {e.response.status_code}")
+                _registrar_erro(erros, f"Erro HTTP no Senado ({ano}): {e.response.status_code}")
                 continue
             except Exception as e:
-                print(f"   ⚠️ Erro no Senado ({ano}): {str(e)[:80]}")
+                _registrar_erro(erros, f"Erro no Senado ({ano}): {str(e)[:80]}")
                 continue
         
         print(f"   📊 Total Senado: {len(pls_encontradas)} PLs")
         return pls_encontradas[:limite]
         
     except Exception as e:
-        print(f"   ⚠️ Erro geral ao buscar no Senado: {str(e)[:100]}")
+        _registrar_erro(erros, f"Erro geral ao buscar no Senado: {str(e)[:100]}")
         return []
 
+
+def _iterar_array_json(blocos: Iterable[bytes]) -> Iterator:
+    """
+    Decodifica incrementalmente um array JSON, item a item
+
+    Recebe o corpo em blocos de bytes (UTF-8) e devolve cada elemento do array
+    assim que ele termina de chegar, sem montar a lista inteira. Se o corpo não
+    for um array, decodifica tudo e devolve os itens caso seja uma lista.
+    """
+    decodificador_utf8 = codecs.getincrementaldecoder('utf-8-sig')()
+    decodificador_json = json.JSONDecoder()
+    blocos = iter(blocos)
+    buffer = ''
+    pos = 0
+    fim = False
+    
+    def ler_mais():
+        nonlocal buffer, pos, fim
+        try:
+            texto = decodificador_utf8.decode(next(blocos))
+        except StopIteration:
+            texto = decodificador_utf8.decode(b'', final=True)
+            fim = True
+        buffer = buffer[pos:] + texto
+        pos = 0
+    
+    # Localizar o início do valor
+    while True:
+        while pos < len(buffer) and buffer[pos].isspace():
+            pos += 1
+        if pos < len(buffer):
+            break
+        if fim:
+            return
+        ler_mais()
+    
+    if buffer[pos] != '[':
+        while not fim:
+            ler_mais()
+        valor = json.loads(buffer[pos:])
+        if not isinstance(valor, list):
+            raise ValueError(f"Resposta não é lista: {type(valor)}")
+        yield from valor
+        return
+    
+    pos += 1
+    while True:
+        while pos < len(buffer) and (buffer[pos].isspace() or buffer[pos] == ','):
+            pos += 1
+        if pos >= len(buffer):
+            if fim:
+                raise ValueError("JSON truncado: array não terminado")
+            ler_mais()
+            continue
+        if buffer[pos] == ']':
+            # Consumir o restante (espaços finais) para o produtor saber que o corpo terminou
+            for _ in blocos:
+                pass
+            return
+        try:
+            item, fim_item = decodificador_json.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if fim:
+                raise
+            ler_mais()  # Item incompleto: esperar o próximo bloco
+            continue
+        if fim_item == len(buffer) and not fim and not isinstance(item, (dict, list, str)):
+            ler_mais()  # Número/literal pode continuar no próximo bloco
+            continue
+        pos = fim_item
+        yield item
+
+
 def buscar_camara_sao_paulo(
     termos: List[str] = None,
     ano_inicio_manual: Optional[int] = None,
     ano_fim_manual: Optional[int] = None,
-    limite: int = 50
+    limite: int = 50,
+    erros: Optional[List[str]] = None
 ) -> List[Dict]:
     """
     Busca PLs na Câmara Municipal de São Paulo
@@ -432,6 +875,10 @@ def buscar_camara_sao_paulo(
     Web Service: https://splegisws.saopaulo.sp.leg.br/ws/ws2.asmx
     Método: ProjetosPorAnoJSON
     Portal de Dados Abertos: https://www.saopaulo.sp.leg.br/transparencia/dados-abertos/dados-disponibilizados-em-formato-aberto/
+    
+    O JSON do ano (20k+ projetos) é decodificado em streaming: cada projeto é
+    filtrado assim que chega e descartado se não for relevante. Com `erros`,
+    cada ano cuja leitura falhou é acumulado na lista.
     """
     if termos is None:
         termos = TERMOS_BUSCA
@@ -439,7 +886,7 @@ def buscar_camara_sao_paulo(
     print(f"📥 Buscando projetos na Câmara Municipal de SP...")
     
     # URL do web service
-    base_url = "https://splegisws.saopaulo.sp.leg.br/ws/ws2.asmx/ProjetosPorAnoJSON"
+    base_url = f"{WS_CAMARA_SP}/ProjetosPorAnoJSON"
     
     pls_encontradas = []
     
@@ -462,83 +909,58 @@ def buscar_camara_sao_paulo(
             
             try:
                 # Chamar web service
+                # Projetos são decodificados e filtrados à medida que chegam;
+                # ao atingir o limite a conexão é encerrada sem baixar o resto
                 params = {'Ano': ano}
-                response = requests.get(base_url, params=params, timeout=30)
-                response.raise_for_status()
-                
-                projetos = response.json()
-                if not isinstance(projetos, list):
-                    print(f"   ⚠️ Resposta não é lista: {type(projetos)}")
-                    continue
-                
-                print(f"   📊 {len(projetos)} projetos encontrados em {ano} (antes do filtro)")
+                blocos = http_radar.iterar_corpo(
+                    base_url, params=params, timeout=30,
+                    cache_ttl=http_radar.ttl_para_ano(base_url, ano)
+                )
+                projetos = _iterar_array_json(blocos)
                 
-                # Filtrar por termos LGBTQIA+
-                for projeto in projetos:
-                    if len(pls_encontradas) >= limite:
-                        break
-                    
-                    ementa = projeto.get('ementa', '')
-                    if not ementa or len(ementa) < 10:
-                        continue
-                    
-                    ementa_lower = ementa.lower()
-                    
-                    # Filtrar por termos específicos primeiro
-                    tem_termo_especifico = False
-                    for termo in TERMOS_BUSCA_ESPECIFICOS:
-                        if termo == 'trans' and 'trans' in ementa_lower:
-                            if re.search(r'\btrans\b', ementa_lower) and (
-                                any(palavra in ementa_lower for palavra in ['gênero', 'sexual', 'identidade', 'lgbt', 'transfobia', 'transexual', 'transgênero']) or
-                                any(palavra in ementa_lower for palavra in ['proíbe', 'veda', 'restringe', 'garante', 'reconhece', 'criminaliza', 'direito', 'direitos'])
-                            ):
-                                tem_termo_especifico = True
-                                break
-                        elif termo.lower() in ementa_lower:
-                            tem_termo_especifico = True
+                # closing: a conexão é encerrada também se algo falhar no meio da leitura
+                with closing(blocos), closing(projetos):
+                    # Filtrar por termos LGBTQIA+
+                    projetos_lidos = 0
+                    for projeto in projetos:
+                        if len(pls_encontradas) >= limite:
                             break
-                    
-                    # Verificar termos contextuais
-                    palavras_legislativas = ['proíbe', 'veda', 'restringe', 'garante', 'reconhece', 'criminaliza', 
-                                            'orientação', 'identidade', 'gênero', 'sexual', 'direito', 'direitos',
-                                            'dispõe', 'altera', 'estabelece', 'define']
-                    tem_termo_contextual = any(
-                        termo.lower() in ementa_lower 
-                        for termo in TERMOS_BUSCA_CONTEXTUAIS[:8]
-                    ) and any(
-                        palavra in ementa_lower for palavra in palavras_legislativas
-                    )
-                    
-                    if tem_termo_especifico or tem_termo_contextual:
-                        tipo = projeto.get('tipo', 'PL')
-                        numero = projeto.get('numero', 'N/A')
-                        ano_projeto = projeto.get('ano', 'N/A')
-                        data_projeto = projeto.get('data', 'N/A')
-                        chave = projeto.get('chave', '')
+                        projetos_lidos += 1
                         
-                        # Construir link (baseado na estrutura comum da Câmara SP)
-                        link = f"https://www.saopaulo.sp.leg.br/vereadores/projetos-de-lei/?projeto={chave}" if chave else f"https://www.saopaulo.sp.leg.br/"
+                        ementa = projeto.get('ementa', '')
+                        if not ementa or len(ementa) < 10:
+                            continue
                         
-                        pls_encontradas.append({
-                            'Nº': f"{tipo} {numero}/{ano_projeto}",
-                            'Ano': str(ano_projeto),
-                            'Casa': 'Câmara Municipal SP',
-                            'Ementa': ementa,
-                            'Autores': 'N/A',  # Pode obter via ProjetosAutoresJSON se necessário
-                            'Data': data_projeto[:10] if isinstance(data_projeto, str) and len(data_projeto) >= 10 else str(data_projeto),
-                            'Link': link,
-                            'Status': 'N/A',
-                            'Fonte': 'Câmara Municipal de São Paulo'
-                        })
+                        # Filtrar por termos LGBTQIA+ (matcher compartilhado por todas as fontes)
+                        if ementa_relevante(ementa):
+                            tipo = projeto.get('tipo', 'PL')
+                            numero = projeto.get('numero', 'N/A')
+                            ano_projeto = projeto.get('ano', 'N/A')
+                            data_projeto = projeto.get('data', 'N/A')
+                            chave = projeto.get('chave', '')
+                            
+                            # Construir link (baseado na estrutura comum da Câmara SP)
+                            pls_encontradas.append(RegistroPL(
+                                numero=f"{tipo} {numero}/{ano_projeto}",
+                                ano=ano_projeto,
+                                casa='Câmara Municipal SP',
+                                ementa=ementa,
+                                autores='N/A',  # Pode obter via ProjetosAutoresJSON se necessário
+                                data=data_projeto[:10] if isinstance(data_projeto, str) and len(data_projeto) >= 10 else str(data_projeto),
+                                status='N/A',
+                                fonte='Câmara Municipal de São Paulo',
+                                id_origem=chave or None
+                            ))
                 
+                print(f"   📊 {projetos_lidos} projetos lidos em {ano}")
                 if pls_encontradas:
                     print(f"   ✅ {len(pls_encontradas)} projetos relevantes encontrados em {ano}")
                     
             except requests.exceptions.HTTPError as e:
-                print(f"   ⚠️ Erro HTTP ao buscar projetos de {ano}: {e.response.status_code}")
+                _registrar_erro(erros, f"Erro HTTP ao buscar projetos de {ano}: {e.response.status_code}")
                 continue
             except Exception as e:
-                print(f"   ⚠️ Erro ao buscar projetos de {ano}: {str(e)[:100]}")
+                _registrar_erro(erros, f"Erro ao buscar projetos de {ano}: {str(e)[:100]}")
                 continue
         
         print(f"   ✅ Total: {len(pls_encontradas)} projetos relevantes encontrados na Câmara Municipal SP")
@@ -546,14 +968,308 @@ def buscar_camara_sao_paulo(
         return pls_encontradas[:limite]
         
     except Exception as e:
-        print(f"   ⚠️ Erro geral ao buscar na Câmara Municipal SP: {str(e)[:150]}")
+        _registrar_erro(erros, f"Erro geral ao buscar na Câmara Municipal SP: {str(e)[:150]}")
         return []
 
+# ---------------------------------------------------------------------------
+# Cache do proposituras.zip da ALESP
+# ---------------------------------------------------------------------------
+# O ZIP tem ~16MB e o XML interno precisa ser parseado inteiro. Em vez de baixar
+# e parsear a cada busca, guardamos em disco um índice compacto (JSON Lines
+# comprimido) e revalidamos o arquivo no portal com ETag/If-Modified-Since.
+# O filtro de termos roda uma vez, ao montar o índice: ele só guarda as
+# proposituras relevantes, e cada busca apenas filtra por ano.
+
+PropositurAlesp = namedtuple(
+    "PropositurAlesp",
+    ["ano", "numero", "ementa", "id_documento", "autor", "natureza", "sigla", "data"]
+)
+
+_ARQUIVO_INDICE_ALESP = "alesp_indice.jsonl.gz"
+_ARQUIVO_META_ALESP = "alesp_meta.json"
+
+# Formato do índice (mudar invalida índices antigos)
+VERSAO_INDICE_ALESP = 2
+
+_lock_alesp = threading.Lock()
+_indice_alesp_memoria = {"mtime": None, "registros": []}
+
+
+def _assinatura_filtro_alesp() -> str:
+    """Identifica o filtro aplicado ao montar o índice (termos mudaram -> reconstruir)"""
+    conteudo = json.dumps([
+        VERSAO_INDICE_ALESP, TERMOS_BUSCA, PALAVRAS_LEGISLATIVAS, PALAVRAS_CONTEXTO_TRANS, PALAVRAS_ACAO_TRANS
+    ], ensure_ascii=False)
+    return hashlib.sha1(conteudo.encode('utf-8')).hexdigest()
+
+
+def _caminho_cache(nome: str) -> str:
+    """Retorna o caminho de um arquivo dentro do diretório de cache (criando o diretório)"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    return os.path.join(CACHE_DIR, nome)
+
+
+def _carregar_meta_alesp() -> Dict:
+    try:
+        with open(_caminho_cache(_ARQUIVO_META_ALESP), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _salvar_meta_alesp(meta: Dict):
+    caminho = _caminho_cache(_ARQUIVO_META_ALESP)
+    tmp = caminho + ".tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+    os.replace(tmp, caminho)
+
+
+def _extrair_propositura_alesp(elemento) -> PropositurAlesp:
+    """Converte um elemento <propositura> do XML em registro compacto"""
+    data_entrada = elemento.findtext('DtEntradaSistema', '') or ''
+    return PropositurAlesp(
+        ano=elemento.findtext('AnoLegislativo', '') or '',
+        numero=elemento.findtext('NroLegislativo', '') or '',
+        ementa=elemento.findtext('Ementa', '') or '',
+        id_documento=elemento.findtext('IdDocumento', '') or '',
+        autor=elemento.findtext('Autor', 'N/A'),
+        natureza=elemento.findtext('IdNatureza', '') or '',
+        sigla=(elemento.findtext('Sigla', '') or elemento.findtext('Tipo', '') or '').upper(),
+        data=data_entrada[:10]
+    )
+
+
+def _baixar_para_arquivo(response, sufixo: str = "") -> str:
+    """
+    Grava o corpo de uma resposta (stream=True) em arquivo temporário no CACHE_DIR
+
+    Escreve em blocos de 1MB para que a memória não cresça com o tamanho do download.
+    A resposta é sempre fechada (devolvendo a vaga do host), inclusive quando o
+    status é de erro (HTTPError). Quem chama é responsável por remover o arquivo.
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    fd, caminho = tempfile.mkstemp(suffix=sufixo, dir=CACHE_DIR)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            response.raise_for_status()
+            for bloco in response.iter_content(chunk_size=1024 * 1024):
+                if bloco:
+                    f.write(bloco)
+    except Exception:
+        os.remove(caminho)
+        raise
+    finally:
+        response.close()
+    return caminho
+
+
+def _iterar_proposituras_alesp(caminho_zip: str) -> Iterator[PropositurAlesp]:
+    """
+    Itera as proposituras do ZIP da ALESP com parsing incremental
+
+    Lê o XML direto do membro do ZIP (sem extrair para memória) e descarta cada
+    <propositura> após convertê-la, removendo-a do elemento pai (seja a raiz ou
+    um elemento intermediário), para que o uso de memória fique constante.
+    """
+    with zipfile.ZipFile(caminho_zip, 'r') as zip_ref:
+        files = zip_ref.namelist()
+        if not files:
+            raise ValueError("ZIP da ALESP vazio")
+        
+        xml_file = files[0]
+        tamanho = zip_ref.getinfo(xml_file).file_size
+        print(f"   📄 Lendo {xml_file} ({tamanho/1024/1024:.1f}MB) em modo streaming...")
+        
+        with zip_ref.open(xml_file) as stream:
+            # Elementos abertos (da raiz até o atual), para saber o pai de cada propositura
+            abertos = []
+            for evento, elemento in ET.iterparse(stream, events=('start', 'end')):
+                if evento == 'start':
+                    abertos.append(elemento)
+                    continue
+                abertos.pop()
+                if elemento.tag == 'propositura':
+                    yield _extrair_propositura_alesp(elemento)
+                    # Libera o elemento e o desliga do pai (que continua aberto no parser)
+                    elemento.clear()
+                    if abertos:
+                        abertos[-1].remove(elemento)
+
+
+def _construir_indice_alesp(caminho_zip: str) -> int:
+    """
+    Parseia o proposituras.zip e grava o índice compacto em disco
+
+    Só entram proposituras com ementa relevante (matcher compartilhado), então
+    as buscas não precisam reaplicar o filtro de termos.
+
+    Returns:
+        Número de proposituras indexadas
+    """
+    caminho = _caminho_cache(_ARQUIVO_INDICE_ALESP)
+    tmp = caminho + ".tmp"
+    total = 0
+    with gzip.open(tmp, 'wt', encoding='utf-8') as f:
+        for registro in _iterar_proposituras_alesp(caminho_zip):
+            if len(registro.ementa) < 10 or not ementa_relevante(registro.ementa):
+                continue
+            f.write(json.dumps(list(registro), ensure_ascii=False))
+            f.write("\n")
+            total += 1
+    os.replace(tmp, caminho)
+    return total
+
+
+def _atualizar_cache_alesp(forcar: bool = False, erros: Optional[List[str]] = None) -> bool:
+    """
+    Garante que o índice local da ALESP está atualizado
+
+    Revalida no portal no máximo a cada ALESP_TTL_SEGUNDOS usando ETag e
+    Last-Modified; só baixa e reprocessa o ZIP quando o portal responde com
+    um arquivo novo (HTTP 200). Em caso de falha de rede, mantém o índice antigo.
+
+    Returns:
+        True se há um índice utilizável em disco
+    """
+    with _lock_alesp:
+        caminho_indice = _caminho_cache(_ARQUIVO_INDICE_ALESP)
+        tem_indice = os.path.exists(caminho_indice)
+        meta = _carregar_meta_alesp() if tem_indice else {}
+        if tem_indice and meta.get('filtro') != _assinatura_filtro_alesp():
+            # Índice montado com outros termos (ou formato antigo): baixar e refazer
+            print(f"   🔄 Termos de busca mudaram - o índice da ALESP será reconstruído")
+            tem_indice = False
+            meta = {}
+        
+        if tem_indice and not forcar:
+            idade = time.time() - meta.get('verificado_em', 0)
+            if idade < ALESP_TTL_SEGUNDOS:
+                print(f"   💾 Usando índice local da ALESP (verificado há {idade/60:.0f} min)")
+                return True
+        
+        headers = {}
+        if tem_indice and not forcar:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+        
+        try:
+            print(f"   🔄 Verificando atualização do proposituras.zip no portal da ALESP...")
+            response = http_radar.get(URL_ALESP_ZIP, headers=headers, timeout=120, stream=True)
+            
+            if response.status_code == 304:
+                response.close()
+                print(f"   💾 proposituras.zip não mudou desde a última busca - usando índice local")
+                meta['verificado_em'] = time.time()
+                _salvar_meta_alesp(meta)
+                return True
+            
+            print(f"   📦 Baixando proposituras.zip atualizado (pode levar 10-20 segundos)...")
+            caminho_zip = _baixar_para_arquivo(response, sufixo=".zip")
+            try:
+                total = _construir_indice_alesp(caminho_zip)
+            finally:
+                os.remove(caminho_zip)
+            print(f"   📋 Índice da ALESP atualizado: {total} proposituras relevantes")
+            
+            _salvar_meta_alesp({
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'verificado_em': time.time(),
+                'total': total,
+                'filtro': _assinatura_filtro_alesp()
+            })
+            return True
+        
+        except Exception as e:
+            if tem_indice:
+                _registrar_erro(erros, f"Falha ao revalidar ALESP ({str(e)[:80]}) - usando índice local")
+                return True
+            raise
+
+
+def _carregar_indice_alesp() -> List[PropositurAlesp]:
+    """Carrega o índice da ALESP (só relevantes) em memória, reaproveitado enquanto o arquivo não mudar"""
+    caminho = _caminho_cache(_ARQUIVO_INDICE_ALESP)
+    mtime = os.path.getmtime(caminho)
+    
+    with _lock_alesp:
+        if _indice_alesp_memoria["mtime"] != mtime:
+            with gzip.open(caminho, 'rt', encoding='utf-8') as f:
+                registros = [PropositurAlesp(*json.loads(linha)) for linha in f]
+            _indice_alesp_memoria["registros"] = registros
+            _indice_alesp_memoria["mtime"] = mtime
+        return _indice_alesp_memoria["registros"]
+
+
+def _filtrar_proposituras_alesp(
+    proposituras: Iterable[PropositurAlesp],
+    ano_inicio_manual: Optional[int],
+    ano_fim_manual: Optional[int],
+    limite: int,
+    verificar_termos: bool = True
+) -> List[Dict]:
+    """
+    Aplica filtro de ano e termos LGBTQIA+ às proposituras da ALESP
+
+    Consome o iterável sob demanda e para assim que `limite` é atingido, então
+    com um iterador de streaming o restante do XML nem chega a ser lido.
+    Com verificar_termos=False (índice local, já filtrado), só o ano é checado.
+    """
+    pls_encontradas = []
+    
+    for propositura in proposituras:
+        if len(pls_encontradas) >= limite:
+            break
+        
+        ano_text = propositura.ano
+        numero_text = propositura.numero
+        ementa = propositura.ementa
+        id_doc = propositura.id_documento
+        
+        if not ementa or len(ementa) < 10:
+            continue
+        
+        # Filtrar por ano se especificado
+        if ano_inicio_manual is not None and ano_fim_manual is not None:
+            try:
+                ano_int = int(ano_text) if ano_text else 0
+                if not (ano_inicio_manual <= ano_int <= ano_fim_manual):
+                    continue
+            except:
+                continue
+        
+        # Filtrar por termos LGBTQIA+ (matcher compartilhado por todas as fontes)
+        if not verificar_termos or ementa_relevante(ementa):
+            # Sigla do tipo (pode estar em outros campos); padrão PL
+            sigla = propositura.sigla or 'PL'
+            
+            # Link para propositura (formato comum da ALESP)
+            pls_encontradas.append(RegistroPL(
+                numero=f"{sigla} {numero_text}/{ano_text}" if numero_text and ano_text else f"Nº {id_doc}",
+                ano=ano_text or 'N/A',
+                casa='ALESP',
+                ementa=ementa,
+                autores=propositura.autor,
+                data=propositura.data or 'N/A',  # Apenas data, sem hora
+                status='N/A',
+                fonte='ALESP',
+                id_origem=id_doc or None
+            ))
+    
+    return pls_encontradas
+
+
 def buscar_alesp(
     termos: List[str] = None,
     ano_inicio_manual: Optional[int] = None,
     ano_fim_manual: Optional[int] = None,
-    limite: int = 50
+    limite: int = 50,
+    forcar_atualizacao: bool = False,
+    usar_cache: bool = True,
+    erros: Optional[List[str]] = None
 ) -> List[Dict]:
     """
     Busca PLs na ALESP (Assembleia Legislativa de São Paulo)
@@ -564,147 +1280,235 @@ def buscar_alesp(
     
     Frequência de atualização: Diária
     Portal de dados abertos: https://www.al.sp.gov.br/dados-abertos/recurso/56
+    
+    O ZIP só é baixado quando o portal publica uma versão nova (ETag/Last-Modified);
+    as buscas consultam o índice local em CACHE_DIR.
+    
+    Args:
+        forcar_atualizacao: Ignora o TTL e baixa o ZIP novamente
+        usar_cache: Se False, baixa o ZIP e filtra em streaming (sem índice local),
+            parando a leitura do XML assim que `limite` é atingido
+        erros: Lista que recebe as falhas (inclusive revalidação que caiu no índice antigo)
     """
     if termos is None:
         termos = TERMOS_BUSCA
     
     print(f"   📥 Buscando proposituras na ALESP...")
-    # NOTA: O arquivo proposituras.zip é atualizado DIARIAMENTE no portal da ALESP.
-    # Para garantir dados atualizados, baixamos o arquivo toda vez que uma busca é feita.
-    # Isso garante que mesmo no Hugging Face Space, sempre teremos os dados mais recentes.
-    
-    # URL do arquivo ZIP
-    url_zip = "https://www.al.sp.gov.br/repositorioDados/processo_legislativo/proposituras.zip"
-    
-    pls_encontradas = []
     
     try:
-        # Baixar arquivo ZIP (sob demanda - sempre busca a versão mais recente)
-        print(f"   📦 Baixando arquivo proposituras.zip atualizado (última atualização do portal)...")
-        print(f"   ⏱️ Isso garante dados atualizados diariamente (pode levar 10-20 segundos)")
-        response = requests.get(url_zip, timeout=120, stream=True)
-        response.raise_for_status()
-        
-        zip_data = BytesIO(response.content)
-        
-        with zipfile.ZipFile(zip_data, 'r') as zip_ref:
-            files = zip_ref.namelist()
-            if not files:
-                print(f"   ⚠️ ZIP vazio")
-                return []
-            
-            xml_file = files[0]
-            print(f"   📄 Extraindo {xml_file}...")
-            
-            # Ler XML (pode ser grande, mas preciso parsear)
-            xml_content = zip_ref.read(xml_file)
-            print(f"   📊 XML extraído: {len(xml_content)/1024/1024:.1f}MB")
-            
-            # Parsear XML
-            root = ET.fromstring(xml_content)
-            
-            # Buscar todas as proposituras
-            proposituras = root.findall('.//propositura')
-            total_props = len(proposituras)
-            print(f"   📋 Total de proposituras no arquivo: {total_props}")
-            
-            # Filtrar proposituras
-            for propositura in proposituras:
-                if len(pls_encontradas) >= limite:
-                    break
-                
-                # Extrair campos do XML
-                ano_text = propositura.findtext('AnoLegislativo', '')
-                numero_text = propositura.findtext('NroLegislativo', '')
-                ementa = propositura.findtext('Ementa', '')
-                id_doc = propositura.findtext('IdDocumento', '')
-                data_entrada = propositura.findtext('DtEntradaSistema', '')
-                natureza_id = propositura.findtext('IdNatureza', '')
-                
-                if not ementa or len(ementa) < 10:
-                    continue
-                
-                # Filtrar por ano se especificado
-                if ano_inicio_manual is not None and ano_fim_manual is not None:
-                    try:
-                        ano_int = int(ano_text) if ano_text else 0
-                        if not (ano_inicio_manual <= ano_int <= ano_fim_manual):
-                            continue
-                    except:
-                        continue
-                
-                # Filtrar por termos LGBTQIA+
-                ementa_lower = ementa.lower()
-                
-                tem_termo_especifico = False
-                for termo in TERMOS_BUSCA_ESPECIFICOS:
-                    if termo == 'trans' and 'trans' in ementa_lower:
-                        if re.search(r'\btrans\b', ementa_lower) and (
-                            any(palavra in ementa_lower for palavra in ['gênero', 'sexual', 'identidade', 'lgbt', 'transfobia', 'transexual', 'transgênero']) or
-                            any(palavra in ementa_lower for palavra in ['proíbe', 'veda', 'restringe', 'garante', 'reconhece', 'criminaliza', 'direito', 'direitos'])
-                        ):
-                            tem_termo_especifico = True
-                            break
-                    elif termo.lower() in ementa_lower:
-                        tem_termo_especifico = True
-                        break
-                
-                palavras_legislativas = ['proíbe', 'veda', 'restringe', 'garante', 'reconhece', 'criminaliza', 
-                                        'orientação', 'identidade', 'gênero', 'sexual', 'direito', 'direitos',
-                                        'dispõe', 'altera', 'estabelece', 'define']
-                tem_termo_contextual = any(
-                    termo.lower() in ementa_lower 
-                    for termo in TERMOS_BUSCA_CONTEXTUAIS[:8]
-                ) and any(
-                    palavra in ementa_lower for palavra in palavras_legislativas
+        if usar_cache:
+            _atualizar_cache_alesp(forcar=forcar_atualizacao, erros=erros)
+            proposituras = _carregar_indice_alesp()
+            print(f"   📋 Proposituras relevantes no índice: {len(proposituras)}")
+            pls_encontradas = _filtrar_proposituras_alesp(
+                proposituras, ano_inicio_manual, ano_fim_manual, limite, verificar_termos=False
+            )
+        else:
+            print(f"   📦 Baixando proposituras.zip (pode levar 10-20 segundos)...")
+            response = http_radar.get(URL_ALESP_ZIP, timeout=120, stream=True)
+            caminho_zip = _baixar_para_arquivo(response, sufixo=".zip")
+            try:
+                pls_encontradas = _filtrar_proposituras_alesp(
+                    _iterar_proposituras_alesp(caminho_zip), ano_inicio_manual, ano_fim_manual, limite
                 )
-                
-                if tem_termo_especifico or tem_termo_contextual:
-                    # Determinar sigla do tipo (pode estar em outros campos)
-                    sigla = 'PL'  # Padrão
-                    tipo_text = propositura.findtext('Sigla', '') or propositura.findtext('Tipo', '')
-                    if tipo_text:
-                        sigla = tipo_text.upper()
-                    
-                    # Link para propositura (formato comum da ALESP)
-                    link = f"https://www.al.sp.gov.br/propositura/?id={id_doc}" if id_doc else "https://www.al.sp.gov.br/"
-                    
-                    pls_encontradas.append({
-                        'Nº': f"{sigla} {numero_text}/{ano_text}" if numero_text and ano_text else f"Nº {id_doc}",
-                        'Ano': ano_text or 'N/A',
-                        'Casa': 'ALESP',
-                        'Ementa': ementa,
-                        'Autores': propositura.findtext('Autor', 'N/A'),
-                        'Data': data_entrada[:10] if data_entrada else 'N/A',  # Apenas data, sem hora
-                        'Link': link,
-                        'Status': 'N/A',
-                        'Fonte': 'ALESP'
-                    })
+            finally:
+                os.remove(caminho_zip)
         
         print(f"   ✅ {len(pls_encontradas)} proposituras relevantes encontradas na ALESP")
         
         return pls_encontradas[:limite]
         
     except requests.exceptions.HTTPError as e:
-        print(f"   ⚠️ Erro HTTP ao buscar na ALESP: {e.response.status_code}")
+        _registrar_erro(erros, f"Erro HTTP ao buscar na ALESP: {e.response.status_code}")
         return []
     except Exception as e:
-        print(f"   ⚠️ Erro ao buscar na ALESP: {str(e)[:150]}")
+        _registrar_erro(erros, f"Erro ao buscar na ALESP: {str(e)[:150]}")
         import traceback
         print(f"   Detalhes: {traceback.format_exc()[:200]}")
         return []
 
+# Fontes conhecidas pelo orquestrador: identificador -> nome exibido
+NOMES_FONTES = {
+    'camara': 'Câmara dos Deputados',
+    'senado': 'Senado Federal',
+    'alesp': 'ALESP',
+    'camara_sp': 'Câmara Municipal SP',
+}
+
+# Tempo máximo (segundos) de cada fonte numa busca paralela; quem passar disso
+# fica de fora do resultado (a thread termina em segundo plano e aquece os caches)
+TIMEOUT_POR_FONTE = {
+    'camara': 60,
+    'senado': 60,
+    'alesp': 90,  # primeiro download do ZIP + índice
+    'camara_sp': 90,  # JSON do ano inteiro (20k+ projetos)
+}
+
+# Prazo global da busca paralela (segundos)
+PRAZO_TOTAL_BUSCA = 120
+
+ResultadoBusca = namedtuple('ResultadoBusca', ['pls', 'status', 'por_fonte'])
+
+
+def executar_em_paralelo(
+    tarefas: Dict[str, Callable[[], Any]],
+    timeout_por_fonte: Optional[Dict[str, float]] = None,
+    prazo_total: Optional[float] = None
+) -> Tuple[Dict[str, Any], Dict[str, Dict]]:
+    """
+    Executa uma tarefa por fonte em paralelo, com timeout por fonte e prazo global
+    
+    Tarefas que estouram o tempo não são interrompidas (threads não podem ser
+    mortas), apenas deixam de ser esperadas.
+    
+    Args:
+        tarefas: {fonte: função sem argumentos}
+        timeout_por_fonte: {fonte: segundos} (fonte ausente = só o prazo global)
+        prazo_total: Segundos para todas as fontes (None = sem prazo global)
+    
+    Returns:
+        (resultados, status) - resultados só das fontes que terminaram bem;
+        status[fonte] = {'status': 'ok'|'timeout'|'erro', 'tempo', 'erro'}
+    """
+    timeout_por_fonte = timeout_por_fonte or {}
+    resultados = {}
+    status = {}
+    if not tarefas:
+        return resultados, status
+    
+    def cronometrar(tarefa):
+        inicio_tarefa = time.time()
+        return tarefa(), time.time() - inicio_tarefa
+    
+    inicio = time.time()
+    executor = ThreadPoolExecutor(max_workers=len(tarefas), thread_name_prefix="fonte")
+    futuros = {executor.submit(cronometrar, tarefa): fonte for fonte, tarefa in tarefas.items()}
+    
+    prazos = {}
+    for futuro, fonte in futuros.items():
+        limites = [inicio + t for t in (timeout_por_fonte.get(fonte), prazo_total) if t is not None]
+        prazos[futuro] = min(limites) if limites else None
+    
+    pendentes = set(futuros)
+    try:
+        while pendentes:
+            agora = time.time()
+            for futuro in [f for f in pendentes if prazos[f] is not None and prazos[f] <= agora]:
+                pendentes.discard(futuro)
+                futuro.cancel()
+                status[futuros[futuro]] = {'status': 'timeout', 'tempo': agora - inicio, 'erro': None}
+            if not pendentes:
+                break
+            
+            proximo = min((prazos[f] for f in pendentes if prazos[f] is not None), default=None)
+            espera = None if proximo is None else max(0.0, proximo - agora)
+            concluidos, _ = wait(pendentes, timeout=espera, return_when=FIRST_COMPLETED)
+            
+            for futuro in concluidos:
+                pendentes.discard(futuro)
+                fonte = futuros[futuro]
+                try:
+                    resultados[fonte], tempo = futuro.result()
+                    status[fonte] = {'status': 'ok', 'tempo': tempo, 'erro': None}
+                except Exception as e:
+                    status[fonte] = {'status': 'erro', 'tempo': time.time() - inicio, 'erro': str(e)[:200]}
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    return resultados, status
+
+
+def formatar_status_fontes(status: Dict[str, Dict]) -> str:
+    """Resumo de uma linha do status de cada fonte (para logs e relatórios)"""
+    icones = {'ok': '✅', 'timeout': '⏱️', 'erro': '❌'}
+    partes = []
+    for fonte, info in status.items():
+        nome = NOMES_FONTES.get(fonte, fonte)
+        detalhe = f"{info['itens']} PLs" if info['status'] == 'ok' and 'itens' in info else info['status']
+        partes.append(f"{icones.get(info['status'], '•')} {nome}: {detalhe} ({info['tempo']:.1f}s)")
+    return " | ".join(partes)
+
+
+def buscar_fontes(
+    fontes: Optional[List[str]] = None,
+    ano_inicio: Optional[int] = None,
+    ano_fim: Optional[int] = None,
+    limite_por_fonte: int = 20,
+    termos: List[str] = None,
+    timeout_por_fonte: Optional[Dict[str, float]] = None,
+    prazo_total: Optional[float] = PRAZO_TOTAL_BUSCA
+) -> ResultadoBusca:
+    """
+    Busca PLs em várias fontes ao mesmo tempo
+    
+    Cada fonte roda na sua própria thread; a latência total é a da fonte mais lenta
+    (limitada por TIMEOUT_POR_FONTE e pelo prazo global), não a soma de todas.
+    
+    Args:
+        fontes: Identificadores de NOMES_FONTES (None = todas)
+        ano_inicio: Ano inicial (None = ano_fim)
+        ano_fim: Ano final (None = ano atual)
+        limite_por_fonte: Limite de PLs por fonte
+        termos: Termos para buscar (None = usar TERMOS_BUSCA padrão)
+        timeout_por_fonte: {fonte: segundos} (None = TIMEOUT_POR_FONTE)
+        prazo_total: Prazo global em segundos (None = sem prazo global)
+    
+    Returns:
+        ResultadoBusca(pls, status, por_fonte) - PLs das fontes que terminaram, na
+        ordem de `fontes`, status[fonte] = {'status', 'tempo', 'itens', 'erro'} e
+        por_fonte[fonte] = PLs daquela fonte
+    """
+    fontes = list(fontes) if fontes else list(NOMES_FONTES)
+    ano_fim = int(ano_fim or datetime.now().year)
+    ano_inicio = int(ano_inicio or ano_fim)
+    if timeout_por_fonte is None:
+        timeout_por_fonte = TIMEOUT_POR_FONTE
+    
+    buscadores = {
+        'camara': lambda: buscar_camara_deputados(
+            termos=termos, sigla_tipo="PL", limite=limite_por_fonte,
+            ano_inicio_manual=ano_inicio, ano_fim_manual=ano_fim, modo="palavras_chave"
+        ),
+        'senado': lambda: buscar_senado_federal(
+            termos=termos, limite=limite_por_fonte, ano_inicio_manual=ano_inicio, ano_fim_manual=ano_fim
+        ),
+        'alesp': lambda: buscar_alesp(
+            termos=termos, limite=limite_por_fonte, ano_inicio_manual=ano_inicio, ano_fim_manual=ano_fim
+        ),
+        'camara_sp': lambda: buscar_camara_sao_paulo(
+            termos=termos, limite=limite_por_fonte, ano_inicio_manual=ano_inicio, ano_fim_manual=ano_fim
+        ),
+    }
+    
+    print(f"🔍 Buscando em paralelo: {', '.join(NOMES_FONTES.get(f, f) for f in fontes)} ({ano_inicio}-{ano_fim})")
+    resultados, status = executar_em_paralelo(
+        {fonte: buscadores[fonte] for fonte in fontes},
+        timeout_por_fonte=timeout_por_fonte,
+        prazo_total=prazo_total
+    )
+    
+    pls = []
+    por_fonte = {}
+    for fonte in fontes:
+        por_fonte[fonte] = resultados.get(fonte, [])
+        status[fonte]['itens'] = len(por_fonte[fonte])
+        pls.extend(por_fonte[fonte])
+    
+    print(f"   {formatar_status_fontes({fonte: status[fonte] for fonte in fontes})}")
+    return ResultadoBusca(pls, {fonte: status[fonte] for fonte in fontes}, por_fonte)
+
+
 def buscar_todas_fontes(
     termos: List[str] = None,
     dias_atras: int = 90,
     limite_por_fonte: int = 20
 ) -> List[Dict]:
     """
-    Busca PLs em todas as fontes disponíveis
+    Busca PLs em todas as fontes disponíveis (em paralelo, ver buscar_fontes)
     
     Args:
         termos: Termos para buscar (None = usar TERMOS_BUSCA padrão)
-        dias_atras: Quantos dias atrás buscar
+        dias_atras: Quantos dias atrás buscar (define os anos consultados)
         limite_por_fonte: Limite por fonte
     
     Returns:
@@ -712,33 +1516,18 @@ def buscar_todas_fontes(
     """
     print(f"🔍 Iniciando busca em todas as fontes (últimos {dias_atras} dias)...")
     
-    todas_pls = []
-    
-    # 1. Câmara dos Deputados
-    print("📥 Buscando na Câmara dos Deputados...")
-    pls_camara = buscar_camara_deputados(
-        termos=termos,
-        dias_atras=dias_atras,  # Passar dias_atras para buscar múltiplos anos
-        limite=limite_por_fonte
+    ano_inicio = (datetime.now() - timedelta(days=dias_atras)).year
+    resultado = buscar_fontes(
+        ano_inicio=ano_inicio,
+        ano_fim=datetime.now().year,
+        limite_por_fonte=limite_por_fonte,
+        termos=termos
     )
-    todas_pls.extend(pls_camara)
-    print(f"   ✅ Encontradas {len(pls_camara)} PLs relevantes na Câmara")
     
-    # 2. Senado (quando implementado)
-    # pls_senado = buscar_senado(termos=termos, limite=limite_por_fonte)
-    # todas_pls.extend(pls_senado)
+    print(f"\n✅ Total encontrado: {len(resultado.pls)} PLs")
     
-    # 3. Câmara Municipal SP (quando implementado)
-    # pls_camara_sp = buscar_camara_sao_paulo(termos=termos, limite=limite_por_fonte)
-    # todas_pls.extend(pls_camara_sp)
-    
-    # 4. ALESP (quando implementado)
-    # pls_alesp = buscar_alesp(termos=termos, limite=limite_por_fonte)
-    # todas_pls.extend(pls_alesp)
-    
-    print(f"\n✅ Total encontrado: {len(todas_pls)} PLs")
-    
-    return todas_pls
+    return resultado.pls
+
 
 def filtrar_pls_relevantes(pls: List[Dict], termos_minimos: int = 1) -> List[Dict]:
     """
@@ -747,10 +1536,9 @@ def filtrar_pls_relevantes(pls: List[Dict], termos_minimos: int = 1) -> List[Dic
     pls_filtradas = []
     
     for pl in pls:
-        ementa_lower = pl.get('Ementa', '').lower()
-        
-        # Contar quantos termos estão presentes
-        termos_encontrados = sum(1 for termo in TERMOS_BUSCA if termo.lower() in ementa_lower)
+        # Contar quantos termos estão presentes (uma única varredura da ementa)
+        presentes = termos_na_ementa(pl.get('Ementa', ''))
+        termos_encontrados = sum(1 for termo in TERMOS_BUSCA if termo.lower() in presentes)
         
         if termos_encontrados >= termos_minimos:
             pl['Termos_Encontrados'] = termos_encontrados
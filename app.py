@@ -7,8 +7,13 @@ import gradio as gr
 import pandas as pd
 import re
 from datetime import datetime
-from ensemble_híbrido import classificar_ensemble, carregar_modelos
-from api_radar import buscar_camara_deputados, buscar_senado_federal, buscar_alesp, buscar_camara_sao_paulo, filtrar_pls_relevantes
+from ensemble_híbrido import carregar_modelos
+from api_radar import buscar_fontes, formatar_status_fontes, NOMES_FONTES, TIMEOUT_POR_FONTE, PRAZO_TOTAL_BUSCA
+from sincronizacao_radar import sincronizar
+from armazenamento_radar import consultar_pls, salvar_pls
+from http_radar import estatisticas_cache
+from cache_classificacao import estatisticas_classificacao
+from pipeline_radar import filtrar, agrupar_duplicatas, classificar
 
 # Import para ZeroGPU (disponível apenas no Hugging Face Spaces)
 try:
@@ -130,9 +135,21 @@ with gr.Blocks(
             )
             checkbox_camara_sp = gr.Checkbox(label="Câmara Municipal SP", value=False)
         
+        with gr.Row():
+            checkbox_incremental = gr.Checkbox(
+                label="Usar base local (sincronização incremental)",
+                value=True,
+                info="Anos já buscados vêm da base local; só o ano corrente é atualizado (1x por dia)"
+            )
+            texto_termos = gr.Textbox(
+                label="Filtrar por termos (opcional)",
+                placeholder="ex.: nome social, banheiro",
+                info="Separados por vírgula; sem distinção de maiúsculas e acentos na base local"
+            )
+        
         output_busca = gr.Markdown(label="📊 PLs Encontradas e Analisadas")
         
-        def buscar_e_analisar(ano_inicio, ano_fim, limite, checkbox_camara, checkbox_senado, checkbox_alesp, checkbox_camara_sp):
+        def buscar_e_analisar(ano_inicio, ano_fim, limite, checkbox_camara, checkbox_senado, checkbox_alesp, checkbox_camara_sp, checkbox_incremental=True, texto_termos=""):
             """Busca PLs e analisa automaticamente"""
             import sys
             from io import StringIO
@@ -156,18 +173,21 @@ with gr.Blocks(
             
             try:
                 pls_encontradas = []
+                cache_antes = estatisticas_cache()
                 anos_para_buscar = list(range(int(ano_inicio), int(ano_fim) + 1))
                 
-                # Contar quantas fontes foram selecionadas para distribuir o limite
-                fontes_selecionadas = []
+                # Fontes selecionadas (identificadores de api_radar.NOMES_FONTES)
+                fontes_ids = []
                 if checkbox_camara:
-                    fontes_selecionadas.append("Câmara")
+                    fontes_ids.append("camara")
                 if checkbox_senado:
-                    fontes_selecionadas.append("Senado")
+                    fontes_ids.append("senado")
                 if checkbox_alesp:
-                    fontes_selecionadas.append("ALESP")
+                    fontes_ids.append("alesp")
                 if checkbox_camara_sp:
-                    fontes_selecionadas.append("Câmara Municipal SP")
+                    fontes_ids.append("camara_sp")
+                fontes_selecionadas = [NOMES_FONTES[fonte] for fonte in fontes_ids]
+                termos_filtro = [t.strip() for t in (texto_termos or "").split(",") if t.strip()]
                 
                 num_fontes = len(fontes_selecionadas)
                 
@@ -179,83 +199,59 @@ with gr.Blocks(
                 print(f"📅 Período: {ano_inicio} a {ano_fim} ({len(anos_para_buscar)} anos)")
                 print(f"📊 Fontes selecionadas: {', '.join(fontes_selecionadas)} ({num_fontes} fontes)")
                 print(f"📋 Distribuindo limite: até ~{limite_por_fonte} PLs por fonte (total máximo: {limite})")
+                if termos_filtro:
+                    print(f"🔎 Filtrando por termos: {', '.join(termos_filtro)}")
                 
-                # 1. Câmara dos Deputados
-                if checkbox_camara:
-                    print(f"\n📥 Buscando na Câmara dos Deputados (limite: ~{limite_por_fonte})...")
-                    pls_camara = []
-                    for ano in reversed(anos_para_buscar):
-                        if len(pls_camara) >= limite_por_fonte:
-                            break
-                        
-                        limite_restante = limite_por_fonte - len(pls_camara)
-                        if limite_restante <= 0:
-                            break
-                        
-                        pls_ano = buscar_camara_deputados(
-                            sigla_tipo="PL",
-                            limite=limite_restante,
-                            ano_inicio_manual=ano,
-                            ano_fim_manual=ano
-                        )
-                        pls_camara.extend(pls_ano)
-                        if pls_ano:
-                            print(f"   ✅ {len(pls_ano)} PLs encontradas na Câmara em {ano}")
+                if checkbox_incremental:
+                    # Sincroniza só o que falta (anos novos / ano corrente), em paralelo, e consulta a base local
+                    print(f"\n💾 Sincronizando base local...")
+                    estatisticas_sync = sincronizar(
+                        fontes_ids, int(ano_inicio), int(ano_fim),
+                        timeout_por_fonte=TIMEOUT_POR_FONTE, prazo_total=PRAZO_TOTAL_BUSCA
+                    )
                     
-                    pls_encontradas.extend(pls_camara)
-                    print(f"   📊 Total Câmara: {len(pls_camara)} PLs")
-                
-                # 2. Senado Federal
-                if checkbox_senado:
-                    print(f"\n📥 Buscando no Senado Federal (limite: ~{limite_por_fonte})...")
-                    pls_senado = []
-                    for ano in reversed(anos_para_buscar):
-                        if len(pls_senado) >= limite_por_fonte:
-                            break
-                        
-                        limite_restante = limite_por_fonte - len(pls_senado)
-                        if limite_restante <= 0:
-                            break
-                        
-                        pls_ano = buscar_senado_federal(
-                            limite=limite_restante,
-                            ano_inicio_manual=ano,
-                            ano_fim_manual=ano
+                    status_fontes = {}
+                    for fonte in fontes_ids:
+                        pls_fonte = consultar_pls(
+                            [fonte], int(ano_inicio), int(ano_fim),
+                            limite=limite_por_fonte, termos=termos_filtro or None
                         )
-                        pls_senado.extend(pls_ano)
-                        if pls_ano:
-                            print(f"   ✅ {len(pls_ano)} PLs encontradas no Senado em {ano}")
+                        pls_encontradas.extend(pls_fonte)
+                        status_fontes[fonte] = {**estatisticas_sync[fonte], 'itens': len(pls_fonte)}
+                        print(f"   📊 Total {NOMES_FONTES[fonte]}: {len(pls_fonte)} PLs")
+                else:
+                    # Todas as fontes ao mesmo tempo, com timeout por fonte e prazo global
+                    print()
+                    resultado_busca = buscar_fontes(
+                        fontes_ids,
+                        ano_inicio=int(ano_inicio),
+                        ano_fim=int(ano_fim),
+                        limite_por_fonte=limite_por_fonte
+                    )
+                    status_fontes = resultado_busca.status
                     
-                    pls_encontradas.extend(pls_senado)
-                    print(f"   📊 Total Senado: {len(pls_senado)} PLs")
+                    # Tudo o que veio da rede também alimenta a base local
+                    for fonte, pls_fonte in resultado_busca.por_fonte.items():
+                        salvar_pls(fonte, pls_fonte)
+                        if termos_filtro:
+                            pls_fonte = [
+                                pl for pl in pls_fonte
+                                if any(t.lower() in str(pl.get('Ementa', '')).lower() for t in termos_filtro)
+                            ]
+                            status_fontes[fonte]['itens'] = len(pls_fonte)
+                        pls_encontradas.extend(pls_fonte)
                 
-                # 3. ALESP (Assembleia Legislativa de São Paulo)
-                if checkbox_alesp:
-                    print(f"\n📥 Buscando na ALESP (limite: ~{limite_por_fonte})...")
-                    pls_alesp = buscar_alesp(
-                        limite=limite_por_fonte,
-                        ano_inicio_manual=int(ano_inicio),
-                        ano_fim_manual=int(ano_fim)
-                    )
-                    pls_encontradas.extend(pls_alesp)
-                    if pls_alesp:
-                        print(f"   ✅ {len(pls_alesp)} PLs encontradas na ALESP")
-                    else:
-                        print(f"   ℹ️ Nenhuma PL relevante encontrada na ALESP")
+                fontes_fora = [NOMES_FONTES[f] for f, info in status_fontes.items() if info['status'] != 'ok']
+                if fontes_fora:
+                    print(f"   ⚠️ Resultados parciais: sem resposta a tempo de {', '.join(fontes_fora)}")
                 
-                # 4. Câmara Municipal de São Paulo
-                if checkbox_camara_sp:
-                    print(f"\n📥 Buscando na Câmara Municipal de SP (limite: ~{limite_por_fonte})...")
-                    pls_camara_sp = buscar_camara_sao_paulo(
-                        limite=limite_por_fonte,
-                        ano_inicio_manual=int(ano_inicio),
-                        ano_fim_manual=int(ano_fim)
-                    )
-                    pls_encontradas.extend(pls_camara_sp)
-                    if pls_camara_sp:
-                        print(f"   ✅ {len(pls_camara_sp)} PLs encontradas na Câmara Municipal SP")
-                    else:
-                        print(f"   ℹ️ Nenhuma PL relevante encontrada na Câmara Municipal SP")
+                # Uso do cache HTTP nesta busca
+                cache_depois = estatisticas_cache()
+                acertos = sum(cache_depois[k] - cache_antes[k] for k in ('hits_memoria', 'hits_disco'))
+                downloads = cache_depois['misses'] - cache_antes['misses']
+                if acertos or downloads:
+                    print(f"\n💾 Cache HTTP: {acertos} respostas reaproveitadas, {downloads} baixadas "
+                          f"({acertos / (acertos + downloads):.0%} de acerto)")
                 
                 # Limitar o total final ao limite solicitado (caso tenha ultrapassado)
                 if len(pls_encontradas) > int(limite):
@@ -293,16 +289,12 @@ with gr.Blocks(
 
 **Dica:** Buscar em períodos maiores (ex: 2010-2025) aumenta as chances de encontrar resultados."""
                 
-                # Remover duplicatas
-                pls_unicas = []
-                ids_vistos = set()
-                for pl in pls_encontradas:
-                    pl_id = f"{pl['Nº']}_{pl['Ano']}"
-                    if pl_id not in ids_vistos:
-                        ids_vistos.add(pl_id)
-                        pls_unicas.append(pl)
-                
-                pls_relevantes = filtrar_pls_relevantes(pls_unicas)
+                # Filtrar e juntar a mesma proposição vinda de várias Casas/anos
+                # (etapas do pipeline_radar) - cada grupo é classificado uma vez
+                pls_relevantes = list(agrupar_duplicatas(filtrar(pls_encontradas)))
+                agrupadas = sum(len(pl['Duplicatas']) for pl in pls_relevantes)
+                if agrupadas:
+                    print(f"🔗 {agrupadas} registros duplicados agrupados ({len(pls_relevantes)} proposições únicas)")
                 
                 if not pls_relevantes:
                     return f"""⚠️ Encontradas {len(pls_encontradas)} PLs, mas nenhuma passou pelo filtro de relevância.
@@ -320,29 +312,37 @@ with gr.Blocks(
                 
                 # Analisar cada PL encontrado
                 resultados = []
+                classificacao_antes = estatisticas_classificacao()
                 print(f"\n🔍 Analisando {len(pls_relevantes)} PLs encontradas...")
                 
-                for i, pl in enumerate(pls_relevantes, 1):
-                    ementa = pl.get('Ementa', '')
-                    if not ementa:
-                        continue
-                    
-                    resultado = classificar_ensemble(ementa, radar_model, azmina_model)
+                for i, pl in enumerate(classificar(pls_relevantes, radar_model, azmina_model), 1):
+                    ementa = pl['Ementa']
+                    resultado = pl['Resultado']
                     
                     resultados.append({
                         'Nº': pl.get('Nº', 'N/A'),
                         'Ano': pl.get('Ano', 'N/A'),
-                        'Casa': pl.get('Casa', 'N/A'),
+                        'Casa': ", ".join(pl.get('Casas') or [pl.get('Casa', 'N/A')]),
                         'Fonte': pl.get('Fonte', 'N/A'),
                         'Classificação': resultado['classificacao'],
                         'Score': f"{resultado['score_final']:.1%}",
                         'Ementa': ementa[:100] + '...' if len(ementa) > 100 else ementa,
-                        'Link': pl.get('Link', 'N/A')
+                        'Link': pl.get('Link', 'N/A'),
+                        'Links': pl.get('Links') or [pl.get('Link', 'N/A')]
                     })
                     
                     if i % 5 == 0:
                         print(f"   📊 {i}/{len(pls_relevantes)} PLs analisadas...")
                 
+                # Uso do cache de classificações nesta busca
+                classificacao_depois = estatisticas_classificacao()
+                reaproveitadas = classificacao_depois['hits'] - classificacao_antes['hits']
+                classificadas = classificacao_depois['misses'] - classificacao_antes['misses']
+                if reaproveitadas or classificadas:
+                    print(f"💾 Cache de classificação: {reaproveitadas} reaproveitadas, {classificadas} classificadas "
+                          f"({reaproveitadas / (reaproveitadas + classificadas):.0%} de acerto, "
+                          f"{classificacao_depois['entradas']} guardadas)")
+                
                 df_resultados = pd.DataFrame(resultados)
                 
                 # Estatísticas
@@ -364,7 +364,8 @@ with gr.Blocks(
                 relatorio = f"""## 🔍 Radar de PLs LGBTQIA+ - Resultados
 
 **Total de PLs encontradas e analisadas:** {total}  
-**Fontes consultadas:** {", ".join(fontes_usadas) if fontes_usadas else "Nenhuma"}
+**Fontes consultadas:** {", ".join(fontes_usadas) if fontes_usadas else "Nenhuma"}  
+**Status das fontes:** {formatar_status_fontes(status_fontes)}
 
 ### 📈 Distribuição:
 - **✅ FAVORÁVEL:** {favoraveis} ({favoraveis/total*100:.1f}%)
@@ -382,7 +383,8 @@ with gr.Blocks(
                 desfav_links = [r for r in resultados if r['Classificação'] == 'DESFAVORÁVEL']
                 if desfav_links:
                     for r in desfav_links[:10]:  # Primeiros 10
-                        relatorio += f"\n- [{r['Nº']}]({r['Link']}) - {r['Score']}"
+                        outros = " ".join(f"[{i}]({link})" for i, link in enumerate(r['Links'][1:], 2))
+                        relatorio += f"\n- [{r['Nº']}]({r['Link']}) {outros} - {r['Score']}"
                 
                 relatorio += f"\n\n---\n\n**Logs da busca:**\n```\n{logs}\n```\n\n**Última busca:** {datetime.now().strftime('%d/%m/%Y %H:%M')}"
                 
@@ -404,7 +406,7 @@ with gr.Blocks(
         
         btn_buscar.click(
             fn=buscar_e_analisar,
-            inputs=[ano_inicio, ano_fim, limite_resultados, checkbox_camara, checkbox_senado, checkbox_alesp, checkbox_camara_sp],
+            inputs=[ano_inicio, ano_fim, limite_resultados, checkbox_camara, checkbox_senado, checkbox_alesp, checkbox_camara_sp, checkbox_incremental, texto_termos],
             outputs=output_busca
         )
         
@@ -431,7 +433,7 @@ with gr.Blocks(
                 - A busca pode levar alguns segundos (até minutos para períodos longos)
                 - **Câmara dos Deputados**: API permite até 100 itens por página (buscamos múltiplas páginas)
                 - **Senado Federal**: Busca todas as matérias apresentadas no ano via `/materia/pesquisa/lista` ✅
-                - **ALESP**: Baixa arquivo ZIP completo (~16MB) toda vez, garantindo dados atualizados. Pode levar 10-20 segundos. Atualizado diariamente.
+                - **ALESP**: Baixa o arquivo ZIP (~16MB) só quando o portal publica uma versão nova (atualizado diariamente); as demais buscas usam um índice local e são quase instantâneas.
                 - **Câmara Municipal SP**: Busca todos os projetos do ano (pode ter 20k+), filtra localmente
                 - Depende da disponibilidade das APIs públicas
         """)
@@ -0,0 +1,287 @@
+"""
+Armazenamento local das PLs coletadas pelo radar (SQLite)
+Guarda as PLs relevantes de cada fonte e o estado de sincronização por fonte/ano,
+com índice de texto completo (FTS5) sobre a ementa para consultas por termo
+"""
+
+import os
+import re
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from api_radar import CACHE_DIR
+
+CAMINHO_BANCO = os.path.join(CACHE_DIR, "radar.sqlite3")
+
+# Colunas do banco <-> chaves do dicionário de PL usado no resto do sistema
+_COLUNAS = [
+    ('numero', 'Nº'),
+    ('ano', 'Ano'),
+    ('casa', 'Casa'),
+    ('ementa', 'Ementa'),
+    ('autores', 'Autores'),
+    ('data', 'Data'),
+    ('link', 'Link'),
+    ('status', 'Status'),
+    ('fonte_nome', 'Fonte'),
+]
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS proposicoes (
+    fonte TEXT NOT NULL,
+    numero TEXT NOT NULL,
+    ano TEXT,
+    casa TEXT,
+    ementa TEXT,
+    autores TEXT,
+    data TEXT,
+    link TEXT,
+    status TEXT,
+    fonte_nome TEXT,
+    atualizado_em REAL,
+    PRIMARY KEY (fonte, numero)
+);
+
+CREATE INDEX IF NOT EXISTS idx_proposicoes_casa ON proposicoes (casa);
+CREATE INDEX IF NOT EXISTS idx_proposicoes_ano ON proposicoes (CAST(ano AS INTEGER));
+CREATE INDEX IF NOT EXISTS idx_proposicoes_data ON proposicoes (data);
+
+CREATE TABLE IF NOT EXISTS sincronizacao (
+    fonte TEXT NOT NULL,
+    ano INTEGER NOT NULL,
+    sincronizado_em REAL NOT NULL,
+    marca_dagua TEXT,
+    completo INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (fonte, ano)
+);
+"""
+
+# Índice FTS5 espelhando proposicoes.ementa (external content, mantido por triggers)
+_ESQUEMA_FTS = """
+CREATE VIRTUAL TABLE IF NOT EXISTS proposicoes_fts USING fts5(
+    ementa,
+    content='proposicoes',
+    content_rowid='rowid',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS proposicoes_fts_insert AFTER INSERT ON proposicoes BEGIN
+    INSERT INTO proposicoes_fts (rowid, ementa) VALUES (new.rowid, new.ementa);
+END;
+
+CREATE TRIGGER IF NOT EXISTS proposicoes_fts_delete AFTER DELETE ON proposicoes BEGIN
+    INSERT INTO proposicoes_fts (proposicoes_fts, rowid, ementa) VALUES ('delete', old.rowid, old.ementa);
+END;
+
+CREATE TRIGGER IF NOT EXISTS proposicoes_fts_update AFTER UPDATE OF ementa ON proposicoes BEGIN
+    INSERT INTO proposicoes_fts (proposicoes_fts, rowid, ementa) VALUES ('delete', old.rowid, old.ementa);
+    INSERT INTO proposicoes_fts (rowid, ementa) VALUES (new.rowid, new.ementa);
+END;
+"""
+
+_RE_DATA_ISO = re.compile(r'^\d{4}-\d{2}-\d{2}')
+
+# Caminhos de banco já verificados nesta execução -> FTS5 disponível?
+_FTS_POR_BANCO: Dict[str, bool] = {}
+
+
+def _preparar_fts(conexao: sqlite3.Connection) -> bool:
+    """
+    Cria o índice FTS5 (e o popula a partir de bancos criados antes dele)
+
+    Returns:
+        False se o SQLite local foi compilado sem FTS5 (consultas caem para LIKE)
+    """
+    existia = conexao.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'proposicoes_fts'"
+    ).fetchone() is not None
+    try:
+        conexao.executescript(_ESQUEMA_FTS)
+    except sqlite3.OperationalError as e:
+        print(f"   ⚠️ SQLite sem FTS5 ({e}); consultas por termo usarão LIKE")
+        return False
+    if not existia:
+        conexao.execute("INSERT INTO proposicoes_fts (proposicoes_fts) VALUES ('rebuild')")
+        conexao.commit()
+    return True
+
+
+def conectar(caminho: Optional[str] = None) -> sqlite3.Connection:
+    """
+    Abre conexão com o banco local (criando tabelas se necessário)
+
+    Usa WAL para que vários workers do Gradio possam ler enquanto outro grava.
+    """
+    caminho = caminho or CAMINHO_BANCO
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    conexao = sqlite3.connect(caminho, timeout=30)
+    conexao.row_factory = sqlite3.Row
+    conexao.execute("PRAGMA journal_mode=WAL")
+    conexao.executescript(_ESQUEMA)
+    if caminho not in _FTS_POR_BANCO:
+        _FTS_POR_BANCO[caminho] = _preparar_fts(conexao)
+    return conexao
+
+
+@contextmanager
+def _transacao(caminho: Optional[str] = None):
+    """Conexão com commit ao final (rollback em erro) e fechamento garantido"""
+    conexao = conectar(caminho)
+    try:
+        with conexao:
+            yield conexao
+    finally:
+        conexao.close()
+
+
+def salvar_pls(fonte: str, pls: List[Dict], caminho: Optional[str] = None) -> int:
+    """
+    Insere ou atualiza PLs de uma fonte (chave: fonte + Nº)
+
+    Returns:
+        Quantas PLs ainda não existiam no banco
+    """
+    if not pls:
+        return 0
+
+    agora = time.time()
+    colunas = [c for c, _ in _COLUNAS]
+    sql = (
+        f"INSERT INTO proposicoes (fonte, {', '.join(colunas)}, atualizado_em) "
+        f"VALUES (?, {', '.join('?' for _ in colunas)}, ?) "
+        f"ON CONFLICT(fonte, numero) DO UPDATE SET "
+        + ", ".join(f"{c} = excluded.{c}" for c in colunas[1:])
+        + ", atualizado_em = excluded.atualizado_em"
+    )
+
+    with _transacao(caminho) as conexao:
+        antes = conexao.execute("SELECT COUNT(*) FROM proposicoes WHERE fonte = ?", (fonte,)).fetchone()[0]
+        conexao.executemany(sql, [
+            (fonte, *[str(pl.get(chave, 'N/A')) for _, chave in _COLUNAS], agora)
+            for pl in pls
+        ])
+        depois = conexao.execute("SELECT COUNT(*) FROM proposicoes WHERE fonte = ?", (fonte,)).fetchone()[0]
+    return depois - antes
+
+
+def marca_dagua(fonte: str, ano: int, caminho: Optional[str] = None) -> Optional[str]:
+    """Data de apresentação (YYYY-MM-DD) mais recente já armazenada para a fonte/ano"""
+    with _transacao(caminho) as conexao:
+        datas = conexao.execute(
+            "SELECT data FROM proposicoes WHERE fonte = ? AND ano = ?", (fonte, str(ano))
+        ).fetchall()
+    validas = [d['data'][:10] for d in datas if d['data'] and _RE_DATA_ISO.match(d['data'])]
+    return max(validas) if validas else None
+
+
+def registrar_sincronizacao(
+    fonte: str,
+    ano: int,
+    completo: bool,
+    caminho: Optional[str] = None,
+    com_falhas: bool = False
+):
+    """
+    Registra que a fonte/ano foi sincronizada agora, com a marca d'água atual
+
+    Com com_falhas=True (alguma requisição da busca falhou) a marca d'água não
+    avança: a próxima sincronização recomeça da marca anterior, ou do ano
+    inteiro se ainda não havia uma, em vez de pular o que não chegou.
+    """
+    marca = None if com_falhas else marca_dagua(fonte, ano, caminho)
+    with _transacao(caminho) as conexao:
+        if com_falhas:
+            anterior = conexao.execute(
+                "SELECT marca_dagua FROM sincronizacao WHERE fonte = ? AND ano = ?", (fonte, ano)
+            ).fetchone()
+            marca = anterior['marca_dagua'] if anterior else None
+        conexao.execute(
+            "INSERT OR REPLACE INTO sincronizacao (fonte, ano, sincronizado_em, marca_dagua, completo) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (fonte, ano, time.time(), marca, int(completo))
+        )
+
+
+def estado_sincronizacao(fonte: str, caminho: Optional[str] = None) -> Dict[int, Dict]:
+    """Estado de sincronização por ano: {ano: {'sincronizado_em', 'marca_dagua', 'completo'}}"""
+    with _transacao(caminho) as conexao:
+        linhas = conexao.execute(
+            "SELECT ano, sincronizado_em, marca_dagua, completo FROM sincronizacao WHERE fonte = ?", (fonte,)
+        ).fetchall()
+    return {
+        linha['ano']: {
+            'sincronizado_em': linha['sincronizado_em'],
+            'marca_dagua': linha['marca_dagua'],
+            'completo': bool(linha['completo'])
+        }
+        for linha in linhas
+    }
+
+
+def _consulta_fts(termos: List[str]) -> str:
+    """
+    Termos -> expressão MATCH do FTS5: cada termo vira uma frase com prefixo
+    no último token ("nome social"* casa com "nome social", "lgbt"* com "lgbtqia")
+    """
+    frases = []
+    for termo in termos:
+        termo = termo.replace('.*', ' ').replace('"', ' ').strip()
+        if termo:
+            frases.append(f'"{termo}"*')
+    return " OR ".join(frases)
+
+
+def consultar_pls(
+    fontes: List[str],
+    ano_inicio: int,
+    ano_fim: int,
+    limite: Optional[int] = None,
+    caminho: Optional[str] = None,
+    termos: Optional[List[str]] = None,
+    casa: Optional[str] = None
+) -> List[Dict]:
+    """
+    Lista PLs armazenadas das fontes no intervalo de anos (mais recentes primeiro)
+
+    Args:
+        termos: Só PLs cuja ementa contenha algum dos termos (índice FTS5,
+            sem distinção de maiúsculas/acentos)
+        casa: Só PLs desta Casa (ex.: "Senado Federal")
+
+    Returns:
+        Lista de PLs no mesmo formato dos buscar_* de api_radar
+    """
+    if not fontes:
+        return []
+
+    colunas = ", ".join(c for c, _ in _COLUNAS)
+    sql = (
+        f"SELECT {colunas} FROM proposicoes "
+        f"WHERE fonte IN ({', '.join('?' for _ in fontes)}) "
+        f"AND CAST(ano AS INTEGER) BETWEEN ? AND ? "
+    )
+    parametros = [*fontes, int(ano_inicio), int(ano_fim)]
+
+    if casa:
+        sql += "AND casa = ? "
+        parametros.append(casa)
+
+    consulta_termos = _consulta_fts(termos) if termos else ""
+    with _transacao(caminho) as conexao:
+        if consulta_termos and _FTS_POR_BANCO.get(caminho or CAMINHO_BANCO):
+            sql += "AND rowid IN (SELECT rowid FROM proposicoes_fts WHERE proposicoes_fts MATCH ?) "
+            parametros.append(consulta_termos)
+        elif consulta_termos:
+            termos_validos = [t.replace('.*', ' ').strip().lower() for t in termos if t.strip()]
+            sql += "AND (" + " OR ".join("LOWER(ementa) LIKE ?" for _ in termos_validos) + ") "
+            parametros.extend(f"%{t}%" for t in termos_validos)
+
+        sql += "ORDER BY CAST(ano AS INTEGER) DESC, data DESC"
+        if limite is not None:
+            sql += " LIMIT ?"
+            parametros.append(int(limite))
+
+        linhas = conexao.execute(sql, parametros).fetchall()
+    return [{chave: linha[coluna] for coluna, chave in _COLUNAS} for linha in linhas]
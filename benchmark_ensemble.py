@@ -0,0 +1,46 @@
+"""
+Benchmark da classificação: classificar_ensemble item a item vs. classificar_ensemble_batch
+Usa as ementas anotadas (resultados1.md), repetidas até o tamanho pedido, e
+confere que as duas versões chegam às mesmas classificações.
+
+Uso: python benchmark_ensemble.py [--pls 200] [--batch-size 16]
+"""
+
+import argparse
+import time
+
+from ensemble_híbrido import carregar_modelos, classificar_ensemble, classificar_ensemble_batch
+from processar_pls import processar_resultados_md
+
+# Diferença máxima aceita nos scores (inferência em lote muda só o arredondamento)
+TOLERANCIA_SCORE = 1e-4
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pls", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--arquivo", default="resultados1.md")
+    args = parser.parse_args()
+
+    ementas = [str(e) for e in processar_resultados_md(args.arquivo)['Ementa'] if str(e).strip()]
+    textos = (ementas * (args.pls // len(ementas) + 1))[:args.pls]
+    radar, azmina = carregar_modelos()
+    print(f"\n🧪 {len(textos)} ementas ({len(ementas)} distintas), batch_size={args.batch_size}\n")
+
+    inicio = time.perf_counter()
+    um_a_um = [classificar_ensemble(t, radar, azmina) for t in textos]
+    t_item = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    em_lote = classificar_ensemble_batch(textos, radar, azmina, batch_size=args.batch_size)
+    t_lote = time.perf_counter() - inicio
+
+    divergentes = sum(a['classificacao'] != b['classificacao'] for a, b in zip(um_a_um, em_lote))
+    diferenca = max(abs(a['score_final'] - b['score_final']) for a, b in zip(um_a_um, em_lote))
+
+    print(f"   item a item: {t_item:7.2f}s ({len(textos) / t_item:6.1f} PLs/s)")
+    print(f"   em lote:     {t_lote:7.2f}s ({len(textos) / t_lote:6.1f} PLs/s)")
+    print(f"\n🎉 Speedup: {t_item / t_lote:.1f}x")
+    print(f"{'✅' if not divergentes and diferenca <= TOLERANCIA_SCORE else '❌'} "
+          f"Classificações divergentes: {divergentes} | maior diferença de score: {diferenca:.2e}")
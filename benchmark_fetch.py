@@ -0,0 +1,179 @@
+"""
+Benchmark da camada de busca (Câmara, Senado, Câmara Municipal SP, ALESP)
+Roda cada fonte contra o servidor de respostas gravadas (servidor_replay.py) nos
+cenários padrão e mede tempo, requisições, bytes, pico de memória e PLs/segundo.
+
+Cada medição roda num processo separado, com cache vazio, para que o pico de
+RSS e o tempo sejam só daquela fonte/cenário.
+
+Uso:
+    python benchmark_fetch.py --gravar                    # 1ª vez: capturar respostas reais
+    python benchmark_fetch.py --saida bench.json          # medir (offline)
+    python benchmark_fetch.py --comparar bench_antigo.json
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+FONTES = ['camara', 'senado', 'camara_sp', 'alesp']
+
+# Cenário -> quantos anos até o ano final (None = desde 2010)
+CENARIOS = {
+    '1_ano': 1,
+    '5_anos': 5,
+    '2010_atual': None,
+}
+
+# Sem limite prático: queremos medir a busca completa do período
+LIMITE = 100000
+
+# Variação de tempo (fração) a partir da qual --comparar aponta regressão
+TOLERANCIA_REGRESSAO = 0.20
+
+
+def _executar_fonte(fonte: str, ano_inicio: int, ano_fim: int) -> dict:
+    """Roda uma busca (no processo filho, já apontado para o servidor local)"""
+    import api_radar
+
+    buscas = {
+        'camara': lambda: api_radar.buscar_camara_deputados(
+            sigla_tipo="PL", limite=LIMITE, ano_inicio_manual=ano_inicio, ano_fim_manual=ano_fim,
+            modo="palavras_chave"
+        ),
+        'senado': lambda: api_radar.buscar_senado_federal(
+            limite=LIMITE, ano_inicio_manual=ano_inicio, ano_fim_manual=ano_fim
+        ),
+        'camara_sp': lambda: api_radar.buscar_camara_sao_paulo(
+            limite=LIMITE, ano_inicio_manual=ano_inicio, ano_fim_manual=ano_fim
+        ),
+        'alesp': lambda: api_radar.buscar_alesp(
+            limite=LIMITE, ano_inicio_manual=ano_inicio, ano_fim_manual=ano_fim
+        ),
+    }
+
+    inicio = time.perf_counter()
+    pls = buscas[fonte]()
+    tempo = time.perf_counter() - inicio
+    pico_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # KB no Linux
+    return {'tempo_s': tempo, 'pls': len(pls), 'pico_rss_mb': pico_kb / 1024}
+
+
+def medir(fonte: str, ano_inicio: int, ano_fim: int, url_servidor: str, config) -> dict:
+    """Mede uma fonte/cenário num processo novo, com cache vazio"""
+    antes = dict(config.contadores)
+    with tempfile.TemporaryDirectory(prefix="bench_radar_") as cache:
+        ambiente = {**os.environ, "RADAR_REPLAY_URL": url_servidor, "RADAR_CACHE_DIR": cache}
+        processo = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--executar", fonte, str(ano_inicio), str(ano_fim)],
+            env=ambiente, capture_output=True, text=True
+        )
+    depois = config.contadores
+
+    resultado = {
+        'fonte': fonte,
+        'ano_inicio': ano_inicio,
+        'ano_fim': ano_fim,
+        'requisicoes': depois['requisicoes'] - antes['requisicoes'],
+        'bytes': depois['bytes'] - antes['bytes'],
+        'sem_gravacao': depois['ausentes'] - antes['ausentes'],
+    }
+    linhas = [l for l in processo.stdout.splitlines() if l.startswith('{')]
+    if processo.returncode != 0 or not linhas:
+        resultado['erro'] = (processo.stderr or processo.stdout)[-500:]
+        return resultado
+
+    resultado.update(json.loads(linhas[-1]))
+    resultado['pls_por_s'] = resultado['pls'] / resultado['tempo_s'] if resultado['tempo_s'] else 0.0
+    return resultado
+
+
+def comparar(atual: list, anterior_arquivo: str):
+    """Compara tempos com uma execução anterior e aponta regressões"""
+    with open(anterior_arquivo, 'r', encoding='utf-8') as f:
+        anterior = {(r['fonte'], r['cenario']): r for r in json.load(f)['resultados']}
+
+    print(f"\n📊 Comparação com {anterior_arquivo}:")
+    regressoes = 0
+    for r in atual:
+        antigo = anterior.get((r['fonte'], r['cenario']))
+        if not antigo or 'tempo_s' not in antigo or 'tempo_s' not in r:
+            continue
+        variacao = r['tempo_s'] / antigo['tempo_s'] - 1 if antigo['tempo_s'] else 0.0
+        marca = "❌" if variacao > TOLERANCIA_REGRESSAO else "✅"
+        regressoes += variacao > TOLERANCIA_REGRESSAO
+        print(f"   {marca} {r['fonte']:10} {r['cenario']:11} {antigo['tempo_s']:7.2f}s → {r['tempo_s']:7.2f}s "
+              f"({variacao:+.0%}) | requisições {antigo['requisicoes']} → {r['requisicoes']}")
+    return regressoes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fontes", nargs="+", default=FONTES, choices=FONTES)
+    parser.add_argument("--cenarios", nargs="+", default=list(CENARIOS), choices=list(CENARIOS))
+    parser.add_argument("--ano-final", type=int, default=datetime.now().year,
+                        help="ano de referência dos cenários (fixe-o para comparar gravações antigas)")
+    parser.add_argument("--gravacoes", default=None, help="diretório das gravações (padrão do servidor_replay)")
+    parser.add_argument("--gravar", action="store_true", help="capturar da API real o que ainda não foi gravado")
+    parser.add_argument("--latencia", type=float, default=0.0, help="latência simulada por requisição (s)")
+    parser.add_argument("--saida", default=None, help="arquivo JSON com os resultados")
+    parser.add_argument("--comparar", default=None, help="JSON de uma execução anterior")
+    parser.add_argument("--executar", nargs=3, metavar=("FONTE", "ANO_INICIO", "ANO_FIM"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.executar:
+        # Processo filho: só a busca, resultado numa linha JSON
+        fonte, ano_inicio, ano_fim = args.executar[0], int(args.executar[1]), int(args.executar[2])
+        print(json.dumps(_executar_fonte(fonte, ano_inicio, ano_fim)))
+        sys.exit(0)
+
+    import servidor_replay
+
+    servidor, config = servidor_replay.iniciar_servidor(
+        diretorio=args.gravacoes or servidor_replay.DIR_GRAVACOES,
+        gravar=args.gravar,
+        latencia=args.latencia
+    )
+    url_servidor = f"http://127.0.0.1:{servidor.server_port}"
+    print(f"🛰️ Servidor de respostas em {url_servidor} ({'gravando' if args.gravar else 'reproduzindo'})\n")
+
+    resultados = []
+    for cenario in args.cenarios:
+        anos = CENARIOS[cenario]
+        ano_inicio = 2010 if anos is None else args.ano_final - anos + 1
+        for fonte in args.fontes:
+            print(f"⏱️ {fonte} / {cenario} ({ano_inicio}-{args.ano_final})...", flush=True)
+            r = medir(fonte, ano_inicio, args.ano_final, url_servidor, config)
+            r['cenario'] = cenario
+            resultados.append(r)
+            if 'erro' in r:
+                print(f"   ❌ Falhou: {r['erro'][-200:]}")
+                continue
+            aviso = f" | ⚠️ {r['sem_gravacao']} sem gravação" if r['sem_gravacao'] else ""
+            print(f"   {r['tempo_s']:.2f}s | {r['requisicoes']} requisições | {r['bytes'] / 1e6:.1f} MB | "
+                  f"pico {r['pico_rss_mb']:.0f} MB | {r['pls']} PLs ({r['pls_por_s']:.1f}/s){aviso}")
+
+    servidor.shutdown()
+
+    relatorio = {
+        'gerado_em': datetime.now().isoformat(timespec='seconds'),
+        'ano_final': args.ano_final,
+        'latencia_simulada_s': args.latencia,
+        'python': sys.version.split()[0],
+        'resultados': resultados,
+    }
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(relatorio, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 Resultados salvos em {args.saida}")
+    else:
+        print("\n" + json.dumps(relatorio, ensure_ascii=False, indent=2))
+
+    if args.comparar and comparar(resultados, args.comparar):
+        sys.exit(1)
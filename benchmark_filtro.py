@@ -0,0 +1,131 @@
+"""
+Micro-benchmark do filtro de relevância (matcher compilado vs. implementação antiga)
+Gera um corpus sintético de 100k ementas, confere que os dois filtros concordam
+em todas elas e compara a vazão (ementas/segundo)
+
+Uso: python benchmark_filtro.py [--ementas 100000] [--seed 42]
+"""
+
+import argparse
+import random
+import re
+import time
+
+from api_radar import (
+    TERMOS_BUSCA,
+    TERMOS_BUSCA_ESPECIFICOS,
+    TERMOS_BUSCA_CONTEXTUAIS,
+    PALAVRAS_LEGISLATIVAS,
+    analisar_ementa,
+    termos_na_ementa,
+)
+
+
+def filtro_antigo(ementa: str):
+    """Cópia do filtro que era repetido em cada buscar_* + contagem de filtrar_pls_relevantes"""
+    ementa_lower = ementa.lower()
+
+    tem_termo_especifico = False
+    for termo in TERMOS_BUSCA_ESPECIFICOS:
+        if termo == 'trans' and 'trans' in ementa_lower:
+            if re.search(r'\btrans\b', ementa_lower) and (
+                any(p in ementa_lower for p in ['gênero', 'sexual', 'identidade', 'lgbt', 'transfobia', 'transexual', 'transgênero']) or
+                any(p in ementa_lower for p in ['proíbe', 'veda', 'restringe', 'garante', 'reconhece', 'criminaliza', 'direito', 'direitos'])
+            ):
+                tem_termo_especifico = True
+                break
+        elif termo.lower() in ementa_lower:
+            tem_termo_especifico = True
+            break
+
+    palavras_legislativas = ['proíbe', 'veda', 'restringe', 'garante', 'reconhece', 'criminaliza',
+                             'orientação', 'identidade', 'gênero', 'sexual', 'direito', 'direitos',
+                             'dispõe', 'altera', 'estabelece', 'define']
+    tem_termo_contextual = any(
+        termo.lower() in ementa_lower
+        for termo in TERMOS_BUSCA_CONTEXTUAIS[:8]
+    ) and any(
+        palavra in ementa_lower for palavra in palavras_legislativas
+    )
+
+    termos_encontrados = sum(1 for termo in TERMOS_BUSCA if termo.lower() in ementa_lower)
+    return tem_termo_especifico or tem_termo_contextual, termos_encontrados
+
+
+def filtro_novo(ementa: str):
+    analise = analisar_ementa(ementa)
+    termos_encontrados = sum(1 for termo in TERMOS_BUSCA if termo.lower() in analise.termos)
+    return analise.relevante, termos_encontrados
+
+
+def ementas_anotadas(arquivo_md: str = "resultados1.md"):
+    """Ementas do dataset anotado (tabela markdown), se o arquivo existir"""
+    try:
+        with open(arquivo_md, 'r', encoding='utf-8') as f:
+            linhas = [l for l in f if l.startswith('|') and not l.startswith('|--') and 'Ementa' not in l]
+    except OSError:
+        return []
+    return [l.split('|')[5].strip() for l in linhas if len(l.split('|')) > 6]
+
+
+def gerar_corpus(n: int, seed: int):
+    """Ementas sintéticas: maioria sem relação com o tema, ~2% com termos do radar"""
+    rnd = random.Random(seed)
+    palavras = (
+        "dispõe sobre a denominação de via pública altera a lei municipal institui o dia "
+        "estadual programa de saúde transporte coletivo transferência de recursos educação "
+        "escola servidores públicos concede título de cidadão autoriza o poder executivo "
+        "abrir crédito suplementar declara de utilidade pública associação tributos"
+    ).split()
+    vocabulario_radar = TERMOS_BUSCA + PALAVRAS_LEGISLATIVAS + ["trans", "transporte", "transexualidade"]
+    anotadas = ementas_anotadas()
+
+    corpus = []
+    for i in range(n):
+        ementa = " ".join(rnd.choice(palavras) for _ in range(rnd.randint(8, 40)))
+        sorteio = rnd.random()
+        if sorteio < 0.02:
+            ementa += " " + " ".join(rnd.choice(vocabulario_radar) for _ in range(rnd.randint(1, 3)))
+        elif sorteio < 0.025 and anotadas:
+            ementa = rnd.choice(anotadas)
+        corpus.append(ementa.capitalize())
+    return corpus
+
+
+def medir(funcao, corpus, repeticoes: int = 3) -> float:
+    """Melhor tempo (segundos) entre algumas repetições"""
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        for ementa in corpus:
+            funcao(ementa)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ementas", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"🧪 Gerando corpus de {args.ementas} ementas...")
+    corpus = gerar_corpus(args.ementas, args.seed)
+
+    print("1️⃣ Conferindo paridade entre os filtros...")
+    divergencias = [e for e in corpus if filtro_antigo(e) != filtro_novo(e)]
+    relevantes = sum(1 for e in corpus if filtro_novo(e)[0])
+    print(f"   Relevantes: {relevantes} | Divergências: {len(divergencias)}")
+    for ementa in divergencias[:5]:
+        print(f"   ❌ {ementa[:100]}")
+    if divergencias:
+        exit(1)
+
+    print("2️⃣ Medindo vazão...")
+    t_antigo = medir(filtro_antigo, corpus)
+    t_novo = medir(filtro_novo, corpus)
+    t_termos = medir(termos_na_ementa, corpus)
+    print(f"   Filtro antigo:  {t_antigo:.2f}s ({len(corpus)/t_antigo:,.0f} ementas/s)")
+    print(f"   Matcher novo:   {t_novo:.2f}s ({len(corpus)/t_novo:,.0f} ementas/s)")
+    print(f"   (só varredura): {t_termos:.2f}s ({len(corpus)/t_termos:,.0f} ementas/s)")
+    print(f"\n🎉 Ganho: {t_antigo / t_novo:.1f}x")
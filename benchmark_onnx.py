@@ -0,0 +1,167 @@
+"""
+Relatório de paridade e desempenho: backend PyTorch vs. ONNX Runtime int8
+Classifica as PLs anotadas (resultados1.md/resultados2.md) com cada backend,
+em processos separados (pico de memória isolado), e compara:
+    - diferença dos sinais radar/azmina e do score final por PL
+    - classificações que mudam (flips) e acerto contra a anotação
+    - tempo de carga, latência por PL e pico de RSS
+
+Com --radar/--azmina, compara outros checkpoints (id do Hub ou pasta local)
+no lugar de MODEL_RADAR/MODEL_AZMINA, ex.: quando o Hub não está acessível.
+
+Uso: python benchmark_onnx.py [--repeticoes 3] [--batch-size 16] [--saida onnx.json]
+                              [--radar MODELO] [--azmina MODELO]
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+ARQUIVOS_ANOTADOS = ["resultados1.md", "resultados2.md"]
+BACKENDS = ["pytorch", "onnx"]
+
+
+def _ementas_anotadas():
+    from processar_pls import processar_resultados_md
+
+    linhas = []
+    for arquivo in ARQUIVOS_ANOTADOS:
+        if os.path.exists(arquivo):
+            df = processar_resultados_md(arquivo)
+            linhas += [(str(r.get('Nº', '')), str(r.get('Ementa', '')), str(r.get('Posição', '')))
+                       for _, r in df.iterrows() if str(r.get('Ementa', '')).strip()]
+    return linhas
+
+
+def _usar_modelos(radar: str = None, azmina: str = None) -> dict:
+    """Troca os modelos do ensemble (azmina passa a usar o próprio tokenizer); devolve os ids em uso"""
+    import ensemble_híbrido
+
+    if radar:
+        ensemble_híbrido.MODEL_RADAR = radar
+    if azmina:
+        ensemble_híbrido.MODEL_AZMINA = ensemble_híbrido.TOKENIZER_AZMINA = azmina
+    return {'radar': ensemble_híbrido.MODEL_RADAR, 'azmina': ensemble_híbrido.MODEL_AZMINA,
+            'tokenizer_azmina': ensemble_híbrido.TOKENIZER_AZMINA}
+
+
+def _executar_backend(backend: str, repeticoes: int, batch_size: int,
+                      radar_id: str = None, azmina_id: str = None) -> dict:
+    """Roda no processo filho: carrega os modelos do backend e classifica o corpus"""
+    from ensemble_híbrido import carregar_modelos, classificar_ensemble_batch
+
+    modelos = _usar_modelos(radar_id, azmina_id)
+
+    linhas = _ementas_anotadas()
+    textos = [ementa for _, ementa, _ in linhas]
+
+    inicio = time.perf_counter()
+    radar, azmina = carregar_modelos(backend)
+    tempo_carga = time.perf_counter() - inicio
+
+    resultados = classificar_ensemble_batch(textos, radar, azmina, batch_size=batch_size)  # aquecimento
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        resultados = classificar_ensemble_batch(textos, radar, azmina, batch_size=batch_size)
+    tempo = (time.perf_counter() - inicio) / repeticoes
+
+    return {
+        'backend': backend,
+        'backend_efetivo': [type(radar).__name__, type(azmina).__name__],
+        'modelos': modelos,
+        'tempo_carga_s': tempo_carga,
+        'latencia_ms_por_pl': tempo / len(textos) * 1000,
+        'pico_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'pls': [
+            {'Nº': numero, 'Posição': posicao, 'classificacao': r['classificacao'],
+             'score_final': r['score_final'], 'radar': r['sinais']['radar'], 'azmina': r['sinais']['azmina']}
+            for (numero, _, posicao), r in zip(linhas, resultados)
+        ],
+    }
+
+
+def _acerto(pls) -> float:
+    anotadas = [p for p in pls if 'favorável' in p['Posição'].lower()]
+    corretas = sum(
+        ('desfavorável' in p['Posição'].lower()) == (p['classificacao'] == 'DESFAVORÁVEL') for p in anotadas
+    )
+    return corretas / len(anotadas) if anotadas else 0.0
+
+
+def comparar(base: dict, onnx: dict) -> dict:
+    """Deltas por sinal, flips de classificação e ganhos de latência/memória"""
+    pares = list(zip(base['pls'], onnx['pls']))
+    deltas = {
+        sinal: [abs(a[sinal] - b[sinal]) for a, b in pares]
+        for sinal in ('radar', 'azmina', 'score_final')
+    }
+    flips = [
+        {'Nº': a['Nº'], 'pytorch': a['classificacao'], 'onnx': b['classificacao'],
+         'score_pytorch': a['score_final'], 'score_onnx': b['score_final']}
+        for a, b in pares if a['classificacao'] != b['classificacao']
+    ]
+    return {
+        'pls': len(pares),
+        'delta_max': {s: max(v) if v else 0.0 for s, v in deltas.items()},
+        'delta_medio': {s: sum(v) / len(v) if v else 0.0 for s, v in deltas.items()},
+        'flips': flips,
+        'acerto': {'pytorch': _acerto(base['pls']), 'onnx': _acerto(onnx['pls'])},
+        'speedup_latencia': base['latencia_ms_por_pl'] / onnx['latencia_ms_por_pl'],
+        'reducao_memoria': 1 - onnx['pico_rss_mb'] / base['pico_rss_mb'],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--saida", default=None, help="arquivo JSON com o relatório completo")
+    parser.add_argument("--radar", default=None, help="modelo no lugar de MODEL_RADAR (Hub ou pasta)")
+    parser.add_argument("--azmina", default=None, help="modelo no lugar de MODEL_AZMINA (Hub ou pasta)")
+    parser.add_argument("--executar", choices=BACKENDS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.executar:
+        # Processo filho: resultado numa linha JSON
+        print(json.dumps(_executar_backend(args.executar, args.repeticoes, args.batch_size,
+                                           args.radar, args.azmina)))
+        sys.exit(0)
+
+    modelos = [opcao for nome in ("radar", "azmina") if getattr(args, nome)
+               for opcao in (f"--{nome}", getattr(args, nome))]
+    medicoes = {}
+    for backend in BACKENDS:
+        print(f"⏱️ {backend}...", flush=True)
+        processo = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--executar", backend,
+             "--repeticoes", str(args.repeticoes), "--batch-size", str(args.batch_size)] + modelos,
+            capture_output=True, text=True
+        )
+        linhas = [l for l in processo.stdout.splitlines() if l.startswith('{')]
+        if processo.returncode != 0 or not linhas:
+            print(f"   ❌ Falhou: {(processo.stderr or processo.stdout)[-500:]}")
+            sys.exit(1)
+        medicoes[backend] = json.loads(linhas[-1])
+        m = medicoes[backend]
+        print(f"   {' / '.join(m['backend_efetivo'])} | carga {m['tempo_carga_s']:.1f}s | "
+              f"{m['latencia_ms_por_pl']:.1f} ms/PL | pico {m['pico_rss_mb']:.0f} MB")
+
+    relatorio = comparar(medicoes['pytorch'], medicoes['onnx'])
+    print(f"\n📊 Paridade em {relatorio['pls']} PLs anotadas:")
+    for sinal in ('radar', 'azmina', 'score_final'):
+        print(f"   Δ {sinal:11} máx {relatorio['delta_max'][sinal]:.2e} | médio {relatorio['delta_medio'][sinal]:.2e}")
+    print(f"   Acerto: PyTorch {relatorio['acerto']['pytorch']:.1%} | ONNX {relatorio['acerto']['onnx']:.1%}")
+    print(f"   {'✅ Nenhuma' if not relatorio['flips'] else '⚠️ ' + str(len(relatorio['flips']))} classificação alterada")
+    for flip in relatorio['flips']:
+        print(f"      {flip['Nº']}: {flip['pytorch']} ({flip['score_pytorch']:.1%}) → "
+              f"{flip['onnx']} ({flip['score_onnx']:.1%})")
+    print(f"\n🚀 Latência: {relatorio['speedup_latencia']:.1f}x | Memória: {relatorio['reducao_memoria']:+.0%} de redução")
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump({'medicoes': medicoes, 'comparacao': relatorio}, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 Relatório salvo em {args.saida}")
@@ -0,0 +1,100 @@
+"""
+Benchmark de memória: PLs como dicionários vs. RegistroPL (__slots__)
+Monta o mesmo corpus sintético nos dois formatos (no estilo da ALESP, com
+centenas de milhares de proposituras) e mede a memória alocada com tracemalloc.
+
+Uso: python benchmark_registro.py [--pls 300000]
+"""
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+from registro_radar import RegistroPL
+
+CASAS = [
+    ('Câmara', 'Câmara dos Deputados', "https://www.camara.leg.br/proposicoesWeb/fichadetramitacao?idProposicao={}"),
+    ('Senado', 'Senado Federal', "https://www25.senado.leg.br/web/atividade/materias/-/materia/{}"),
+    ('ALESP', 'ALESP', "https://www.al.sp.gov.br/propositura/?id={}"),
+]
+
+
+def dados_brutos(n: int, seed: int = 42):
+    """Campos como chegam das APIs (strings novas a cada item, como no parsing real)"""
+    rnd = random.Random(seed)
+    for i in range(n):
+        casa, fonte, _ = CASAS[i % len(CASAS)]
+        ano = rnd.randint(2010, 2025)
+        yield {
+            'id': 100000 + i,
+            'numero': f"PL {rnd.randint(1, 5000)}/{ano}",
+            'ano': ano,
+            'casa': ''.join(casa),  # cópias, como strings vindas do JSON/XML
+            'fonte': ''.join(fonte),
+            'ementa': f"Dispõe sobre a política municipal número {i} e dá outras providências",
+            'data': f"{ano}-0{rnd.randint(1, 9)}-1{rnd.randint(0, 9)}",
+            'status': ''.join('Em tramitação'),
+        }
+
+
+def como_dict(item) -> dict:
+    """Formato atual: um dicionário por PL, link montado na hora"""
+    _, _, modelo = next(c for c in CASAS if c[0] == item['casa'])
+    return {
+        'Nº': item['numero'],
+        'Ano': str(item['ano']),
+        'Casa': item['casa'],
+        'Ementa': item['ementa'],
+        'Autores': 'N/A',
+        'Data': item['data'],
+        'Link': modelo.format(item['id']),
+        'Status': item['status'],
+        'Fonte': item['fonte'],
+    }
+
+
+def como_registro(item) -> RegistroPL:
+    return RegistroPL(
+        numero=item['numero'],
+        ano=item['ano'],
+        casa=item['casa'],
+        ementa=item['ementa'],
+        data=item['data'],
+        status=item['status'],
+        fonte=item['fonte'],
+        id_origem=item['id'],
+    )
+
+
+def medir(construtor, n: int):
+    """(MB alocados pela lista de PLs, segundos para construir)"""
+    gc.collect()
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    pls = [construtor(item) for item in dados_brutos(n)]
+    tempo = time.perf_counter() - inicio
+    atual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del pls
+    return atual / (1024 * 1024), tempo
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pls", type=int, default=300000)
+    args = parser.parse_args()
+
+    print(f"🧪 Corpus sintético: {args.pls} PLs\n")
+
+    # Mesmo conteúdo nos dois formatos
+    amostra = next(dados_brutos(1))
+    assert como_registro(amostra).para_dict() == como_dict(amostra), "formatos divergem"
+
+    mb_dict, t_dict = medir(como_dict, args.pls)
+    mb_registro, t_registro = medir(como_registro, args.pls)
+
+    print(f"   dict:       {mb_dict:8.1f} MB  ({mb_dict * 1024 * 1024 / args.pls:.0f} bytes/PL, {t_dict:.2f}s)")
+    print(f"   RegistroPL: {mb_registro:8.1f} MB  ({mb_registro * 1024 * 1024 / args.pls:.0f} bytes/PL, {t_registro:.2f}s)")
+    print(f"\n🎉 Economia: {1 - mb_registro / mb_dict:.0%} da memória")
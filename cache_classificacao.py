@@ -0,0 +1,164 @@
+"""
+Cache persistente das classificações do Ensemble Híbrido (SQLite)
+classificar_ensemble é determinístico para o mesmo texto, modelos, padrões e
+pesos; o resultado completo (incluindo 'sinais') fica guardado sob a chave
+(impressão digital da configuração, hash do texto) e é compartilhado entre os
+workers do Gradio. Quando um modelo, lista de padrões ou peso muda, a impressão
+digital muda junto e as entradas antigas deixam de ser usadas. Entradas de
+outras impressões não são apagadas (workers com configurações diferentes, ex.:
+um sem o AzMina, dividem o mesmo banco); o banco é podado por idade e tamanho.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from typing import Dict, List, Optional
+
+from http_radar import CACHE_DIR
+
+CAMINHO_CACHE_CLASSIFICACAO = os.path.join(CACHE_DIR, "classificacoes.sqlite3")
+
+# Consultas por SELECT (limite de parâmetros do SQLite)
+TAMANHO_CONSULTA = 500
+
+# Poda: entradas mais velhas que o TTL saem, e só as mais novas até o teto ficam
+CACHE_CLASSIFICACAO_TTL_SEGUNDOS = 30 * 24 * 60 * 60
+CACHE_CLASSIFICACAO_MAX_ENTRADAS = 200000
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS classificacoes (
+    impressao TEXT NOT NULL,
+    chave TEXT NOT NULL,
+    resultado TEXT NOT NULL,
+    criado_em REAL NOT NULL,
+    PRIMARY KEY (impressao, chave)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_classificacoes_criado ON classificacoes (criado_em);
+"""
+
+_estatisticas = {"hits": 0, "misses": 0, "gravacoes": 0}
+_lock = threading.Lock()
+
+# Bancos já podados nesta execução
+_podados = set()
+
+
+def chave_texto(texto: str) -> str:
+    """Hash do texto exato da ementa (os modelos distinguem caixa e acentos)"""
+    return hashlib.sha1(texto.encode('utf-8')).hexdigest()
+
+
+def impressao_digital(configuracao: Dict) -> str:
+    """Hash estável de tudo que influencia a classificação (modelos, padrões, pesos)"""
+    serializada = json.dumps(configuracao, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(serializada.encode('utf-8')).hexdigest()[:32]
+
+
+def _podar(conexao: sqlite3.Connection) -> int:
+    """Remove entradas vencidas (TTL) e as mais antigas além do teto; devolve quantas saíram"""
+    with conexao:
+        removidas = conexao.execute(
+            "DELETE FROM classificacoes WHERE criado_em < ?", (time.time() - CACHE_CLASSIFICACAO_TTL_SEGUNDOS,)
+        ).rowcount
+        removidas += conexao.execute(
+            "DELETE FROM classificacoes WHERE criado_em < "
+            "(SELECT criado_em FROM classificacoes ORDER BY criado_em DESC LIMIT 1 OFFSET ?)",
+            (CACHE_CLASSIFICACAO_MAX_ENTRADAS - 1,)
+        ).rowcount
+    return removidas
+
+
+def _conectar(caminho: Optional[str] = None) -> sqlite3.Connection:
+    """Abre o banco (WAL, para vários workers), podando-o na primeira conexão do processo"""
+    caminho = caminho or CAMINHO_CACHE_CLASSIFICACAO
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    conexao = sqlite3.connect(caminho, timeout=30)
+    conexao.execute("PRAGMA journal_mode=WAL")
+    conexao.executescript(_ESQUEMA)
+    if caminho not in _podados:
+        removidas = _podar(conexao)
+        if removidas:
+            print(f"   🧹 Cache de classificação: {removidas} entradas antigas removidas")
+        _podados.add(caminho)
+    return conexao
+
+
+def buscar(textos: List[str], impressao: str, caminho: Optional[str] = None) -> Dict[str, Dict]:
+    """
+    Resultados já guardados para os textos
+
+    Returns:
+        Texto -> resultado de classificar_ensemble (só os textos encontrados)
+    """
+    por_chave = {chave_texto(t): t for t in textos}
+    encontrados = {}
+    try:
+        with closing(_conectar(caminho)) as conexao:
+            chaves = list(por_chave)
+            for inicio in range(0, len(chaves), TAMANHO_CONSULTA):
+                parte = chaves[inicio:inicio + TAMANHO_CONSULTA]
+                linhas = conexao.execute(
+                    f"SELECT chave, resultado FROM classificacoes WHERE impressao = ? "
+                    f"AND chave IN ({','.join('?' * len(parte))})",
+                    [impressao, *parte]
+                ).fetchall()
+                for chave, resultado in linhas:
+                    encontrados[por_chave[chave]] = json.loads(resultado)
+    except sqlite3.Error as e:
+        print(f"   ⚠️ Cache de classificação indisponível: {e}")
+
+    with _lock:
+        _estatisticas["hits"] += sum(1 for t in textos if t in encontrados)
+        _estatisticas["misses"] += sum(1 for t in textos if t not in encontrados)
+    return encontrados
+
+
+def gravar(resultados: Dict[str, Dict], impressao: str, caminho: Optional[str] = None):
+    """Guarda resultados (texto -> resultado de classificar_ensemble)"""
+    if not resultados:
+        return
+    agora = time.time()
+    try:
+        with closing(_conectar(caminho)) as conexao, conexao:
+            conexao.executemany(
+                "INSERT OR REPLACE INTO classificacoes (impressao, chave, resultado, criado_em) VALUES (?, ?, ?, ?)",
+                [(impressao, chave_texto(t), json.dumps(r, ensure_ascii=False), agora) for t, r in resultados.items()]
+            )
+    except sqlite3.Error as e:
+        print(f"   ⚠️ Não foi possível gravar no cache de classificação: {e}")
+        return
+    with _lock:
+        _estatisticas["gravacoes"] += len(resultados)
+
+
+def estatisticas_classificacao(caminho: Optional[str] = None) -> Dict:
+    """Hits/misses deste processo, taxa de acerto e total de entradas guardadas (todos os workers)"""
+    with _lock:
+        stats = dict(_estatisticas)
+    consultas = stats["hits"] + stats["misses"]
+    stats["taxa_acerto"] = stats["hits"] / consultas if consultas else 0.0
+    caminho = caminho or CAMINHO_CACHE_CLASSIFICACAO
+    stats["entradas"] = 0
+    if os.path.exists(caminho):
+        try:
+            with closing(sqlite3.connect(caminho, timeout=30)) as conexao:
+                stats["entradas"] = conexao.execute("SELECT COUNT(*) FROM classificacoes").fetchone()[0]
+        except sqlite3.Error:
+            pass
+    return stats
+
+
+def limpar_cache_classificacao(caminho: Optional[str] = None):
+    """Apaga todas as classificações guardadas e zera as estatísticas"""
+    caminho = caminho or CAMINHO_CACHE_CLASSIFICACAO
+    if os.path.exists(caminho):
+        with closing(sqlite3.connect(caminho, timeout=30)) as conexao, conexao:
+            conexao.execute("DELETE FROM classificacoes")
+    with _lock:
+        for k in _estatisticas:
+            _estatisticas[k] = 0
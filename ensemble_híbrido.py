@@ -5,14 +5,24 @@ FASE 1 do Plano Revisado
 
 from transformers import pipeline
 import torch
+import itertools
+import os
 import re
-from typing import Dict, Tuple, List
+from typing import Callable, Dict, Tuple, List, Optional
 import pandas as pd
 
 # Modelos
 MODEL_RADAR = "Veronyka/tybyria-v2.1"  # TybyrIA v2.1
 MODEL_AZMINA = "azmina/ia-feminista-bert-posicao"
 
+# AzMina não tem tokenizer_config.json no repositório, então usamos o tokenizer do modelo base
+# Conforme README do modelo: base_model = neuralmind/bert-base-portuguese-cased
+TOKENIZER_AZMINA = "neuralmind/bert-base-portuguese-cased"
+
+# Backend de inferência: "pytorch" (pipelines transformers, fp32) ou "onnx"
+# (ONNX Runtime int8, ver onnx_radar.py; volta para pytorch se não der para carregar)
+BACKEND_MODELOS = os.getenv("RADAR_BACKEND_MODELOS", "pytorch")
+
 # Keywords (expandido baseado em análise dos resultados)
 KEYWORDS_FAVORAVEIS = [
     # Termos básicos
@@ -120,10 +130,41 @@ PADROES_RESTRITIVOS = [
     r"(proíbe|proibição).*(bloqueio|hormônio|cirurgia).*(menor|adolescent)"  # Restrições médicas para menores trans
 ]
 
-def carregar_modelos():
-    """Carrega ambos os modelos"""
-    print("📦 Carregando modelos...")
-    
+# Padrões de ALTA PRIORIDADE FAVORÁVEIS (boost negativo - diminui score)
+PADROES_FAVORAVEIS_ALTA = [
+    r"equipara.*(terapia|terapias).*conversão.*(à|a).*tortura",  # PL 5034
+    r"equipara.*(cura.*gay|terapia.*conversão).*tortura",
+    r"equipara.*terapia.*conversão.*tortura"
+]
+
+# "Criminaliza terapias de conversão": exceção favorável em extrair_keywords
+PADRAO_CRIMINALIZA_CONVERSAO = r'criminaliza.*terapia.*conversão'
+
+# Motor de sinais: todas as listas compiladas uma vez, sem padrões repetidos.
+# Cada texto é avaliado contra cada padrão único uma só vez (avaliar_padroes) e
+# keywords, padrões restritivos e padrões favoráveis leem o mesmo resultado.
+_PADROES_UNICOS = list(dict.fromkeys(
+    KEYWORDS_FAVORAVEIS + KEYWORDS_DESFAVORAVEIS + PADROES_ALTA_PRIORIDADE +
+    PADROES_RESTRITIVOS + PADROES_FAVORAVEIS_ALTA + [PADRAO_CRIMINALIZA_CONVERSAO]
+))
+_PADROES_COMPILADOS = [re.compile(padrao, re.IGNORECASE) for padrao in _PADROES_UNICOS]
+_POSICAO = {padrao: i for i, padrao in enumerate(_PADROES_UNICOS)}
+
+# Posições de cada lista no resultado (repetições dentro de uma lista contam de novo, como antes)
+_INDICES_FAVORAVEIS = [_POSICAO[p] for p in KEYWORDS_FAVORAVEIS]
+_INDICES_DESFAVORAVEIS = [_POSICAO[p] for p in KEYWORDS_DESFAVORAVEIS]
+_INDICES_ALTA_PRIORIDADE = [_POSICAO[p] for p in PADROES_ALTA_PRIORIDADE]
+_INDICES_RESTRITIVOS = [_POSICAO[p] for p in PADROES_RESTRITIVOS]
+_INDICES_FAVORAVEIS_ALTA = [_POSICAO[p] for p in PADROES_FAVORAVEIS_ALTA]
+_INDICE_CRIMINALIZA_CONVERSAO = _POSICAO[PADRAO_CRIMINALIZA_CONVERSAO]
+
+def avaliar_padroes(texto: str) -> Tuple[bool, ...]:
+    """Casa o texto (em minúsculas) com cada padrão único; posição i = _PADROES_UNICOS[i]"""
+    texto_lower = texto.lower()
+    return tuple(padrao.search(texto_lower) is not None for padrao in _PADROES_COMPILADOS)
+
+def _carregar_radar_pytorch():
+    """Radar Social como pipeline transformers (None se falhar)"""
     try:
         radar = pipeline(
             "text-classification",
@@ -134,18 +175,16 @@ def carregar_modelos():
     except Exception as e:
         print(f"   ⚠️ Erro ao carregar Radar Social: {e}")
         radar = None
-    
+    return radar
+
+def _carregar_azmina_pytorch():
+    """AzMina como pipeline transformers, com o tokenizer do modelo base (None se falhar)"""
     try:
-        # AzMina não tem tokenizer_config.json no repositório, então usamos o tokenizer do modelo base
-        # Conforme README do modelo: base_model = neuralmind/bert-base-portuguese-cased
         from transformers import AutoTokenizer, AutoModelForSequenceClassification
         
-        # Modelo base conforme documentado no README do repositório AzMina
-        base_model = "neuralmind/bert-base-portuguese-cased"
-        
         print("   🔧 Carregando AzMina com tokenizer do modelo base...")
         # Carregar tokenizer do modelo base (mesmo usado no treinamento do AzMina)
-        tokenizer = AutoTokenizer.from_pretrained(base_model)
+        tokenizer = AutoTokenizer.from_pretrained(TOKENIZER_AZMINA)
         # Carregar apenas o modelo AzMina (fine-tuned)
         model = AutoModelForSequenceClassification.from_pretrained(MODEL_AZMINA)
         
@@ -174,38 +213,69 @@ def carregar_modelos():
             print(f"   ❌ AzMina não pôde ser carregado: {str(e2)[:100]}")
             print("   ⚠️ Sistema funcionará apenas com Radar Social + Keywords + Padrões")
             azmina = None
+    return azmina
+
+def _carregar_onnx(nome: str, model_id: str, tokenizer_id: str = None):
+    """Modelo no ONNX Runtime int8 (None se onnxruntime/exportação falhar)"""
+    try:
+        from onnx_radar import carregar_onnx
+        
+        modelo = carregar_onnx(model_id, tokenizer_id)
+        print(f"   ✅ {nome} carregado (ONNX Runtime int8)")
+        return modelo
+    except Exception as e:
+        print(f"   ⚠️ {nome} sem ONNX ({str(e)[:100]}); usando PyTorch")
+        return None
+
+def carregar_modelos(backend: str = None):
+    """
+    Carrega ambos os modelos
+    
+    Args:
+        backend: "pytorch" ou "onnx" (None = BACKEND_MODELOS / RADAR_BACKEND_MODELOS);
+            com "onnx", cada modelo que não carregar no ONNX Runtime volta para PyTorch
+    """
+    backend = backend or BACKEND_MODELOS
+    print(f"📦 Carregando modelos ({backend})...")
+    
+    radar = azmina = None
+    if backend == "onnx":
+        radar = _carregar_onnx("Radar Social", MODEL_RADAR)
+        azmina = _carregar_onnx("AzMina", MODEL_AZMINA, TOKENIZER_AZMINA)
+    
+    if radar is None:
+        radar = _carregar_radar_pytorch()
+    if azmina is None:
+        azmina = _carregar_azmina_pytorch()
     
     return radar, azmina
 
-def extrair_keywords(texto: str) -> Tuple[int, int]:
+def extrair_keywords(texto: str, casamentos: Tuple[bool, ...] = None) -> Tuple[int, int]:
     """Conta keywords favoráveis e desfavoráveis"""
-    texto_lower = texto.lower()
-    
-    favoraveis = sum(1 for kw in KEYWORDS_FAVORAVEIS 
-                     if re.search(kw, texto_lower, re.IGNORECASE))
+    if casamentos is None:
+        casamentos = avaliar_padroes(texto)
     
-    desfavoraveis = sum(1 for kw in KEYWORDS_DESFAVORAVEIS 
-                        if re.search(kw, texto_lower, re.IGNORECASE))
+    favoraveis = sum(casamentos[i] for i in _INDICES_FAVORAVEIS)
+    desfavoraveis = sum(casamentos[i] for i in _INDICES_DESFAVORAVEIS)
     
     # EXCEÇÃO: "Criminaliza terapias de conversão" é favorável, não desfavorável
     # Se tem "criminaliza" + "terapia de conversão", reduzir contagem desfavorável
-    if re.search(r'criminaliza.*terapia.*conversão', texto_lower, re.IGNORECASE):
+    if casamentos[_INDICE_CRIMINALIZA_CONVERSAO]:
         desfavoraveis = max(0, desfavoraveis - 1)  # Remover "terapia de conversão" da contagem desfavorável
         favoraveis += 1  # Adicionar como favorável
     
     return favoraveis, desfavoraveis
 
-def detectar_padroes_restritivos(texto: str) -> float:
+def detectar_padroes_restritivos(texto: str, casamentos: Tuple[bool, ...] = None) -> float:
     """Detecta padrões legislativos desfavoráveis com pesos diferenciados"""
-    texto_lower = texto.lower()
+    if casamentos is None:
+        casamentos = avaliar_padroes(texto)
     
     # Padrões de alta prioridade (peso 2) - mais específicos e confiáveis
-    matches_alta = sum(1 for padrao in PADROES_ALTA_PRIORIDADE 
-                       if re.search(padrao, texto_lower, re.IGNORECASE))
+    matches_alta = sum(casamentos[i] for i in _INDICES_ALTA_PRIORIDADE)
     
     # Padrões normais (peso 1)
-    matches_normais = sum(1 for padrao in PADROES_RESTRITIVOS 
-                          if re.search(padrao, texto_lower, re.IGNORECASE))
+    matches_normais = sum(casamentos[i] for i in _INDICES_RESTRITIVOS)
     
     # BOOST FORTE: Se encontrou padrão de alta prioridade, dar score alto
     # Esses padrões são muito específicos e indicam claramente desfavorável
@@ -226,78 +296,92 @@ def detectar_padroes_restritivos(texto: str) -> float:
     
     return score_normalizado
 
-def classificar_ensemble(
-    texto: str,
-    radar_model,
-    azmina_model,
-    pesos: Dict[str, float] = None
-) -> Dict:
-    """Combina múltiplos sinais para classificar PL"""
-    
-    if pesos is None:
-        # Pesos ajustados: dar mais peso a keywords e padrões (mais específicos para legislação)
-        # Se AzMina não estiver disponível, redistribuir seu peso proporcionalmente
-        if azmina_model is None:
-            # Sem AzMina: aumentar peso de keywords e padrões proporcionalmente
-            pesos = {
-                'radar': 0.20,      # Detecção de ódio
-                'azmina': 0.0,      # AzMina não disponível
-                'keywords': 0.40,    # Aumentado de 0.35 para 0.40 (+0.05 do AzMina)
-                'padroes': 0.40     # Aumentado de 0.30 para 0.40 (+0.10 do AzMina)
-            }
-        else:
-            # Com ambos os modelos: distribuição otimizada
-            pesos = {
-                'radar': 0.20,      # Detecção de ódio (menos relevante em legislação)
-                'azmina': 0.15,     # Perspectiva feminista (proxy, não ideal) - REDUZIDO
-                'keywords': 0.35,   # Keywords específicas (MAIS IMPORTANTE - legislação tem termos claros)
-                'padroes': 0.30     # Padrões legislativos (CRÍTICO para detectar restrições) - AUMENTADO
-            }
-    
-    resultados = {}
-    
-    # Sinal 1: Radar Social (detecção de ódio)
-    if radar_model:
-        try:
-            radar_result = radar_model(texto, truncation=True, max_length=256)
-            label = radar_result[0]['label']
-            score = radar_result[0]['score']
-            score_odio = 1 - score if label != 'HATE' else score
-            resultados['radar'] = score_odio
-        except:
-            resultados['radar'] = 0.5  # Neutro se erro
-    else:
-        resultados['radar'] = 0.5
-    
-    # Sinal 2: AzMina (direitos de mulheres)
-    if azmina_model:
+# Textos por chamada dos modelos em classificar_ensemble_batch
+TAMANHO_LOTE_INFERENCIA = 16
+
+# Cascata: calcula primeiro os sinais baratos (keywords/padrões) e só roda um
+# modelo se o valor dele ainda puder mudar a classificação. Ordem = ordem de custo.
+CASCATA_ATIVA = os.getenv("RADAR_CASCATA", "0") == "1"
+SINAIS_MODELOS = ('radar', 'azmina')
+
+# Incrementar quando a lógica de combinação/limiares mudar (invalida o cache de classificações)
+VERSAO_CLASSIFICADOR = 2
+
+def _pesos_padrao(azmina_model) -> Dict[str, float]:
+    """Pesos dos sinais conforme os modelos disponíveis"""
+    # Pesos ajustados: dar mais peso a keywords e padrões (mais específicos para legislação)
+    # Se AzMina não estiver disponível, redistribuir seu peso proporcionalmente
+    if azmina_model is None:
+        # Sem AzMina: aumentar peso de keywords e padrões proporcionalmente
+        return {
+            'radar': 0.20,      # Detecção de ódio
+            'azmina': 0.0,      # AzMina não disponível
+            'keywords': 0.40,    # Aumentado de 0.35 para 0.40 (+0.05 do AzMina)
+            'padroes': 0.40     # Aumentado de 0.30 para 0.40 (+0.10 do AzMina)
+        }
+    # Com ambos os modelos: distribuição otimizada
+    return {
+        'radar': 0.20,      # Detecção de ódio (menos relevante em legislação)
+        'azmina': 0.15,     # Perspectiva feminista (proxy, não ideal) - REDUZIDO
+        'keywords': 0.35,   # Keywords específicas (MAIS IMPORTANTE - legislação tem termos claros)
+        'padroes': 0.30     # Padrões legislativos (CRÍTICO para detectar restrições) - AUMENTADO
+    }
+
+def _score_radar(saida: Dict) -> float:
+    """Probabilidade de ódio a partir de uma saída do Radar Social ({'label', 'score'})"""
+    label = saida['label']
+    score = saida['score']
+    return 1 - score if label != 'HATE' else score
+
+def _score_azmina(saida: Dict) -> float:
+    """Score desfavorável a partir de uma saída do AzMina ({'label', 'score'})"""
+    # Assumindo que label 0 = desfavorável, 1 = favorável
+    # Ajustar baseado na documentação real do modelo
+    score_favoravel = saida['score'] if saida['label'] == 'LABEL_1' else 1 - saida['score']
+    return 1 - score_favoravel  # Inverter: menor = mais favorável
+
+def _inferir(modelo, texto: str, conversor: Callable[[Dict], float]) -> Optional[float]:
+    """Sinal de um modelo para um texto (0.5 = neutro se o modelo faltar; None se a chamada falhar)"""
+    if not modelo:
+        return 0.5
+    try:
+        return conversor(modelo(texto, truncation=True, max_length=256)[0])
+    except Exception:
+        return None  # Vira neutro na combinação, marcado em 'modelos_com_falha'
+
+def _inferir_lote(modelo, textos: List[str], conversor: Callable[[Dict], float], batch_size: int) -> List[Optional[float]]:
+    """
+    Sinal de um modelo para vários textos, em lotes de tamanhos parecidos
+    
+    Os textos são ordenados por tamanho antes de formar os lotes, para que cada
+    lote tenha pouco padding; os scores voltam na ordem original. Se um lote
+    falhar, seus textos são refeitos um a um (mesmo tratamento de _inferir,
+    inclusive None para os que falharem de novo).
+    """
+    scores = [0.5] * len(textos)
+    if not modelo or not textos:
+        return scores
+    
+    ordem = sorted(range(len(textos)), key=lambda i: len(textos[i]))
+    for inicio in range(0, len(ordem), batch_size):
+        indices = ordem[inicio:inicio + batch_size]
         try:
-            azmina_result = azmina_model(texto, truncation=True, max_length=256)
-            # Assumindo que label 0 = desfavorável, 1 = favorável
-            # Ajustar baseado na documentação real do modelo
-            score_favoravel = azmina_result[0]['score'] if azmina_result[0]['label'] == 'LABEL_1' else 1 - azmina_result[0]['score']
-            resultados['azmina'] = 1 - score_favoravel  # Inverter: menor = mais favorável
-        except:
-            resultados['azmina'] = 0.5
-    else:
-        resultados['azmina'] = 0.5
-    
-    # Sinal 3: Keywords (com detecção de padrões favoráveis específicos)
-    texto_lower = texto.lower()
-    
-    # Padrões de ALTA PRIORIDADE FAVORÁVEIS (boost negativo - diminui score)
-    padroes_favoraveis_alta = [
-        r"equipara.*(terapia|terapias).*conversão.*(à|a).*tortura",  # PL 5034
-        r"equipara.*(cura.*gay|terapia.*conversão).*tortura",
-        r"equipara.*terapia.*conversão.*tortura"
-    ]
+            saidas = modelo([textos[i] for i in indices], batch_size=len(indices), truncation=True, max_length=256)
+            for i, saida in zip(indices, saidas):
+                scores[i] = conversor(saida)
+        except Exception:
+            for i in indices:
+                scores[i] = _inferir(modelo, textos[i], conversor)
+    return scores
+
+def _score_keywords(texto: str, casamentos: Tuple[bool, ...] = None) -> float:
+    """Sinal 3: Keywords (com detecção de padrões favoráveis específicos)"""
+    if casamentos is None:
+        casamentos = avaliar_padroes(texto)
     
-    tem_padrao_favoravel_alta = any(
-        re.search(padrao, texto_lower, re.IGNORECASE) 
-        for padrao in padroes_favoraveis_alta
-    )
+    tem_padrao_favoravel_alta = any(casamentos[i] for i in _INDICES_FAVORAVEIS_ALTA)
     
-    kw_fav, kw_desfav = extrair_keywords(texto)
+    kw_fav, kw_desfav = extrair_keywords(texto, casamentos)
     total_kw = kw_fav + kw_desfav if (kw_fav + kw_desfav) > 0 else 1
     
     if tem_padrao_favoravel_alta:
@@ -306,11 +390,19 @@ def classificar_ensemble(
     else:
         score_keywords = kw_desfav / total_kw  # Mais keywords desfavoráveis = maior score
     
-    resultados['keywords'] = min(score_keywords, 1.0)
-    
-    # Sinal 4: Padrões legislativos
-    padroes_score = detectar_padroes_restritivos(texto)
-    resultados['padroes'] = padroes_score
+    return min(score_keywords, 1.0)
+
+def _sinais_regex(texto: str) -> Dict[str, float]:
+    """Sinais 3 e 4 (keywords e padrões) a partir de uma única avaliação dos padrões"""
+    casamentos = avaliar_padroes(texto)
+    return {
+        'keywords': _score_keywords(texto, casamentos),
+        'padroes': detectar_padroes_restritivos(texto, casamentos),
+    }
+
+def _score_combinado(resultados: Dict[str, float], pesos: Dict[str, float]) -> float:
+    """Score final: média ponderada dos quatro sinais (com o ajuste de pesos dos padrões críticos)"""
+    padroes_score = resultados['padroes']
     
     # Ajuste dinâmico: Se padrões de alta prioridade foram detectados, aumentar seu peso
     # Isso garante que PLs com padrões críticos (ex: proibir símbolos em paradas, impedir menores)
@@ -334,19 +426,40 @@ def classificar_ensemble(
         pesos_ajustados['keywords'] * resultados['keywords'] +
         pesos_ajustados['padroes'] * resultados['padroes']
     )
-    
-    # Classificar
+    return score_final
+
+def _classe(score_final: float) -> str:
+    """Classificação pelos limiares do score final"""
     if score_final >= 0.5:
-        classificacao = "DESFAVORÁVEL"
+        return "DESFAVORÁVEL"
     elif score_final >= 0.3:
-        classificacao = "REVISÃO"
-    else:
-        classificacao = "FAVORÁVEL"
+        return "REVISÃO"
+    return "FAVORÁVEL"
+
+def _neutralizar_falhas(sinais: Dict[str, Optional[float]]) -> List[str]:
+    """Troca por 0.5 (neutro) os sinais de modelo cuja chamada falhou (None); devolve quais foram"""
+    falhas = [nome for nome in SINAIS_MODELOS if nome in sinais and sinais[nome] is None]
+    for nome in falhas:
+        sinais[nome] = 0.5
+    return falhas
+
+def _combinar_sinais(resultados: Dict[str, Optional[float]], pesos: Dict[str, float]) -> Dict:
+    """
+    Combina os quatro sinais com os pesos e monta o resultado de classificar_ensemble
+    
+    Sinais de modelo None (chamada falhou) entram como 0.5 e ficam listados em
+    'modelos_com_falha'; esses resultados não vão para o cache de classificações.
+    """
+    resultados = dict(resultados)
+    falhas = _neutralizar_falhas(resultados)
+    score_final = _score_combinado(resultados, pesos)
+    classificacao = _classe(score_final)
     
     return {
         'classificacao': classificacao,
         'score_final': score_final,
         'sinais': resultados,
+        'modelos_com_falha': falhas,
         'pesos_usados': pesos,
         'explicacao': f"""
         Score Final: {score_final:.2%}
@@ -359,6 +472,236 @@ def classificar_ensemble(
         """
     }
 
+def _intervalo_score(parciais: Dict[str, float], pesos: Dict[str, float], pendentes: List[str]) -> Tuple[float, float]:
+    """
+    Menor e maior score final possíveis com os sinais pendentes em qualquer valor de 0 a 1
+    
+    O score é uma soma de pesos × sinais, monótona em cada sinal (também em ponto
+    flutuante: produto por constante e soma com arredondamento ao mais próximo são
+    monótonos), então os extremos estão nos cantos 0/1 dos sinais pendentes.
+    Todo sinal de modelo fica em [0, 1], inclusive o 0.5 usado quando o modelo falha.
+    """
+    scores = [
+        _score_combinado({**parciais, **dict(zip(pendentes, canto))}, pesos)
+        for canto in itertools.product((0.0, 1.0), repeat=len(pendentes))
+    ]
+    return min(scores), max(scores)
+
+def _classe_decidida(parciais: Dict[str, float], pesos: Dict[str, float], pendentes: List[str]) -> Optional[str]:
+    """Classificação final se os sinais pendentes não podem mais mudá-la (None se podem)"""
+    minimo, maximo = _intervalo_score(parciais, pesos, pendentes)
+    return _classe(minimo) if _classe(minimo) == _classe(maximo) else None
+
+def _resultado_cascata(parciais: Dict[str, float], pesos: Dict[str, float], pendentes: List[str],
+                       falhas: List[str] = ()) -> Dict:
+    """
+    Resultado no formato de classificar_ensemble para a cascata
+    
+    Com sinais pendentes (curto-circuito), eles entram como 0.5 (neutro) no score
+    exibido; a classificação é a mesma do ensemble completo, e o score real fica
+    em 'intervalo_score'.
+    """
+    sinais = {nome: parciais.get(nome, 0.5) for nome in ('radar', 'azmina', 'keywords', 'padroes')}
+    resultado = _combinar_sinais(sinais, pesos)
+    resultado['modelos_com_falha'] = list(falhas)
+    resultado['curto_circuito'] = bool(pendentes)
+    resultado['sinais_nao_avaliados'] = list(pendentes)
+    resultado['intervalo_score'] = _intervalo_score(parciais, pesos, pendentes) if pendentes else (
+        resultado['score_final'], resultado['score_final'])
+    return resultado
+
+def _classificar_cascata(texto: str, radar_model, azmina_model, pesos: Dict[str, float]) -> Dict:
+    """classificar_ensemble em cascata: regex primeiro, modelos só quando podem mudar a classe"""
+    modelos = {'radar': (radar_model, _score_radar), 'azmina': (azmina_model, _score_azmina)}
+    parciais = _sinais_regex(texto)
+    for nome in SINAIS_MODELOS:
+        if not modelos[nome][0]:
+            parciais[nome] = 0.5  # Modelo ausente: mesmo valor neutro do ensemble completo
+    pendentes = [nome for nome in SINAIS_MODELOS if nome not in parciais]
+    falhas = []
+    
+    while pendentes and _classe_decidida(parciais, pesos, pendentes) is None:
+        nome = pendentes.pop(0)
+        modelo, conversor = modelos[nome]
+        parciais[nome] = _inferir(modelo, texto, conversor)
+        falhas += _neutralizar_falhas(parciais)
+    return _resultado_cascata(parciais, pesos, pendentes, falhas)
+
+def classificar_ensemble(
+    texto: str,
+    radar_model,
+    azmina_model,
+    pesos: Dict[str, float] = None,
+    cascata: bool = None
+) -> Dict:
+    """
+    Combina múltiplos sinais para classificar PL
+    
+    Com `cascata` (padrão: CASCATA_ATIVA / RADAR_CASCATA=1), os modelos só rodam
+    se ainda puderem mudar a classificação; o resultado ganha 'curto_circuito',
+    'sinais_nao_avaliados' e 'intervalo_score'.
+    """
+    
+    if pesos is None:
+        pesos = _pesos_padrao(azmina_model)
+    if cascata if cascata is not None else CASCATA_ATIVA:
+        return _classificar_cascata(texto, radar_model, azmina_model, pesos)
+    
+    resultados = {
+        'radar': _inferir(radar_model, texto, _score_radar),        # Sinal 1: Radar Social (detecção de ódio)
+        'azmina': _inferir(azmina_model, texto, _score_azmina),     # Sinal 2: AzMina (direitos de mulheres)
+        **_sinais_regex(texto),                                     # Sinais 3 e 4: Keywords e Padrões legislativos
+    }
+    return _combinar_sinais(resultados, pesos)
+
+def classificar_ensemble_batch(
+    textos: List[str],
+    radar_model,
+    azmina_model,
+    pesos: Dict[str, float] = None,
+    batch_size: int = TAMANHO_LOTE_INFERENCIA,
+    cascata: bool = None
+) -> List[Dict]:
+    """
+    classificar_ensemble para uma lista de ementas, com inferência em lotes
+    
+    Cada modelo roda uma vez sobre a lista, em lotes de `batch_size` textos de
+    tamanho parecido (menos padding); keywords e padrões são calculados na mesma
+    passada. Os resultados saem na ordem de `textos` e são os mesmos da versão
+    item a item (os scores dos modelos podem diferir só no arredondamento de
+    ponto flutuante da inferência em lote).
+    
+    Args:
+        textos: Ementas a classificar
+        radar_model: Pipeline do Radar Social (ou None)
+        azmina_model: Pipeline do AzMina (ou None)
+        pesos: Pesos dos sinais (None = mesmos padrões de classificar_ensemble)
+        batch_size: Textos por chamada de cada modelo
+        cascata: Rodar cada modelo só nos textos em que ele ainda pode mudar a
+            classificação (None = CASCATA_ATIVA)
+    
+    Returns:
+        Lista de dicionários no formato de classificar_ensemble
+    """
+    textos = list(textos)
+    if pesos is None:
+        pesos = _pesos_padrao(azmina_model)
+    if cascata if cascata is not None else CASCATA_ATIVA:
+        return _classificar_cascata_batch(textos, radar_model, azmina_model, pesos, batch_size)
+    
+    scores_radar = _inferir_lote(radar_model, textos, _score_radar, batch_size)
+    scores_azmina = _inferir_lote(azmina_model, textos, _score_azmina, batch_size)
+    
+    return [
+        _combinar_sinais({'radar': radar, 'azmina': azmina, **_sinais_regex(texto)}, pesos)
+        for texto, radar, azmina in zip(textos, scores_radar, scores_azmina)
+    ]
+
+def _classificar_cascata_batch(
+    textos: List[str],
+    radar_model,
+    azmina_model,
+    pesos: Dict[str, float],
+    batch_size: int
+) -> List[Dict]:
+    """Cascata em lote: cada modelo roda (em lotes) só nos textos ainda indecisos"""
+    modelos = {'radar': (radar_model, _score_radar), 'azmina': (azmina_model, _score_azmina)}
+    parciais = [_sinais_regex(texto) for texto in textos]
+    for sinais in parciais:
+        for nome in SINAIS_MODELOS:
+            if not modelos[nome][0]:
+                sinais[nome] = 0.5
+    pendentes = [[nome for nome in SINAIS_MODELOS if nome not in sinais] for sinais in parciais]
+    falhas = [[] for _ in textos]
+    decididos = [False] * len(textos)
+    
+    for nome in SINAIS_MODELOS:
+        modelo, conversor = modelos[nome]
+        indices = []
+        for i in range(len(textos)):
+            if decididos[i] or nome not in pendentes[i]:
+                continue
+            if _classe_decidida(parciais[i], pesos, pendentes[i]) is not None:
+                decididos[i] = True
+            else:
+                indices.append(i)
+        scores = _inferir_lote(modelo, [textos[i] for i in indices], conversor, batch_size)
+        for i, score in zip(indices, scores):
+            parciais[i][nome] = score
+            pendentes[i].remove(nome)
+            falhas[i] += _neutralizar_falhas(parciais[i])
+    
+    return [
+        _resultado_cascata(sinais, pesos, faltando, falhou)
+        for sinais, faltando, falhou in zip(parciais, pendentes, falhas)
+    ]
+
+def _revisao_modelo(modelo) -> Optional[Dict]:
+    """Identificação do modelo carregado (revisão do Hub quando disponível; None = ausente)"""
+    if modelo is None:
+        return None
+    origem = getattr(modelo, 'origem', None)
+    if origem:
+        # Modelo exportado (onnx_radar): config aponta para a pasta local; vale a origem no Hub
+        return {
+            'backend': type(modelo).__name__,
+            'arquivo': getattr(modelo, 'arquivo', None),
+            'modelo': origem.get('model_id'),
+            'revisao': origem.get('revisao'),
+            'tokenizer': origem.get('tokenizer_id'),
+        }
+    config = getattr(getattr(modelo, 'model', None), 'config', None)
+    tokenizer = getattr(modelo, 'tokenizer', None)
+    return {
+        'backend': type(modelo).__name__,
+        'arquivo': getattr(modelo, 'arquivo', None),
+        'modelo': getattr(config, '_name_or_path', type(modelo).__name__),
+        'revisao': getattr(config, '_commit_hash', None),
+        'tokenizer': getattr(tokenizer, 'name_or_path', None),
+    }
+
+def configuracao_classificador(radar_model, azmina_model, pesos: Dict[str, float] = None) -> Dict:
+    """Tudo que determina o resultado de classificar_ensemble (base da impressão digital do cache)"""
+    return {
+        'versao': VERSAO_CLASSIFICADOR,
+        'cascata': CASCATA_ATIVA,
+        'radar': (MODEL_RADAR, _revisao_modelo(radar_model)),
+        'azmina': (MODEL_AZMINA, _revisao_modelo(azmina_model)),
+        'pesos': pesos if pesos is not None else _pesos_padrao(azmina_model),
+        'padroes': _PADROES_UNICOS,
+        'listas': [KEYWORDS_FAVORAVEIS, KEYWORDS_DESFAVORAVEIS, PADROES_ALTA_PRIORIDADE,
+                   PADROES_RESTRITIVOS, PADROES_FAVORAVEIS_ALTA],
+    }
+
+def classificar_ensemble_cache(
+    textos: List[str],
+    radar_model,
+    azmina_model,
+    pesos: Dict[str, float] = None,
+    batch_size: int = TAMANHO_LOTE_INFERENCIA
+) -> List[Dict]:
+    """
+    classificar_ensemble_batch com o cache persistente (cache_classificacao)
+    
+    Só os textos ainda não classificados com esta configuração passam pelos
+    modelos; os demais vêm do cache. Se o cache falhar, classifica tudo.
+    Resultados em que a chamada a um modelo falhou não são gravados (o texto
+    volta a passar pelos modelos na próxima vez).
+    """
+    import cache_classificacao
+    
+    textos = list(textos)
+    impressao = cache_classificacao.impressao_digital(configuracao_classificador(radar_model, azmina_model, pesos))
+    guardados = cache_classificacao.buscar(textos, impressao)
+    
+    faltando = list(dict.fromkeys(t for t in textos if t not in guardados))
+    if faltando:
+        novos = dict(zip(faltando, classificar_ensemble_batch(faltando, radar_model, azmina_model, pesos, batch_size)))
+        cache_classificacao.gravar({t: r for t, r in novos.items() if not r['modelos_com_falha']}, impressao)
+        guardados.update(novos)
+    
+    return [guardados[t] for t in textos]
+
 def testar_ensemble(dataset_path: str = "pls_processadas.csv"):
     """Testa o ensemble no dataset anotado"""
     
@@ -375,17 +718,15 @@ def testar_ensemble(dataset_path: str = "pls_processadas.csv"):
         print(f"❌ Erro ao carregar {dataset_path}")
         return
     
-    # Classificar cada PL
+    # Classificar todas as PLs de uma vez (inferência em lotes)
+    linhas = [(idx, row, str(row.get('Ementa', ''))) for idx, row in df.iterrows()]
+    linhas = [(idx, row, ementa) for idx, row, ementa in linhas if ementa and ementa.strip() != '']
+    classificacoes = classificar_ensemble_batch([ementa for _, _, ementa in linhas], radar, azmina)
+    
     resultados = []
-    for idx, row in df.iterrows():
-        ementa = str(row.get('Ementa', ''))
+    for (idx, row, ementa), resultado in zip(linhas, classificacoes):
         posicao_real = row.get('Posição', 'N/A')
         
-        if not ementa or ementa.strip() == '':
-            continue
-        
-        resultado = classificar_ensemble(ementa, radar, azmina)
-        
         resultados.append({
             'PL': row.get('Nº', f'PL {idx+1}'),
             'Classificação Real': posicao_real,
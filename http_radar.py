@@ -0,0 +1,806 @@
+"""
+Camada HTTP compartilhada pelas fontes do Radar Legislativo
+Sessão única com pool de conexões (keep-alive), limite de conexões por host,
+retry com backoff exponencial + jitter em 429/5xx (respeitando Retry-After),
+disjuntor por host (falha rápido e serve cache quando o host está fora), requisições
+"hedge" opcionais e cache de respostas em dois níveis (memória LRU + disco) com TTL por ano
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+import weakref
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures import TimeoutError as FuturesTimeout
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Dict, Iterator, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+# Diretório de cache em disco (compartilhado com api_radar)
+# Pode ser sobrescrito via variável de ambiente RADAR_CACHE_DIR
+CACHE_DIR = os.getenv(
+    "RADAR_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache_radar")
+)
+
+# Teto de requisições simultâneas por host (compartilhado entre todas as buscas e
+# usuários). O limite efetivo é adaptativo (AIMD, ver LimiteAdaptativo): começa em
+# CONEXOES_INICIAIS, sobe enquanto o host responde rápido e cai pela metade em
+# 429/503/timeout. O teto também define o pool de conexões keep-alive do host.
+MAX_CONEXOES_POR_HOST = {
+    "dadosabertos.camara.leg.br": 12,
+    "legis.senado.leg.br": 6,
+    "splegisws.saopaulo.sp.leg.br": 4,
+    "www.al.sp.gov.br": 2,
+}
+MAX_CONEXOES_PADRAO = 4
+CONEXOES_INICIAIS = 2
+
+# AIMD: respostas mais lentas que isso não aumentam o limite; reduções seguidas
+# só contam uma vez por intervalo (uma rajada de 429 não zera o limite)
+LATENCIA_LENTA = 3.0
+INTERVALO_REDUCAO = 2.0
+FATOR_REDUCAO = 0.5
+STATUS_SOBRECARGA = (429, 503)
+
+# Disjuntor por host: após FALHAS_PARA_ABRIR falhas seguidas (já contando os retries),
+# o host fica "aberto" por TEMPO_DISJUNTOR_ABERTO segundos: as requisições falham na
+# hora (ou saem do cache, mesmo expirado). Depois disso uma única requisição de teste
+# decide se o disjuntor fecha de novo.
+FALHAS_PARA_ABRIR = 3
+TEMPO_DISJUNTOR_ABERTO = 60.0
+
+# Hedge: se uma requisição passar do percentil HEDGE_PERCENTIL das latências
+# recentes do host, uma segunda idêntica é disparada e vale a que responder primeiro.
+# Desligado por padrão (dobra requisições na cauda); ative com RADAR_HEDGE=1 ou get(hedge=True)
+HEDGE_ATIVO = os.getenv("RADAR_HEDGE", "0") == "1"
+HEDGE_PERCENTIL = 0.95
+HEDGE_AMOSTRAS_MINIMAS = 20
+HEDGE_ESPERA_MINIMA = 0.5
+
+# Retry
+TENTATIVAS_MAXIMAS = 4          # Total de tentativas (1 original + 3 retries)
+BACKOFF_BASE = 0.5              # Segundos; dobra a cada tentativa
+BACKOFF_MAXIMO = 30.0           # Teto de espera entre tentativas (inclui Retry-After)
+STATUS_RETENTAVEIS = (429, 500, 502, 503, 504)
+
+# Cache de respostas
+CACHE_MEMORIA_MAX_BYTES = 64 * 1024 * 1024   # Teto do LRU em memória
+CACHE_ENTRADA_MAX_BYTES = 16 * 1024 * 1024   # Respostas maiores vão só para o disco
+CACHE_DIR_HTTP = os.path.join(CACHE_DIR, "http")
+
+# TTL por host: anos fechados praticamente não mudam; o ano corrente muda todo dia
+TTL_CACHE_POR_HOST = {
+    "dadosabertos.camara.leg.br": {"ano_fechado": 14 * 24 * 3600, "ano_corrente": 3600},
+    "legis.senado.leg.br": {"ano_fechado": 21 * 24 * 3600, "ano_corrente": 3600},
+    "splegisws.saopaulo.sp.leg.br": {"ano_fechado": 21 * 24 * 3600, "ano_corrente": 3600},
+}
+TTL_CACHE_PADRAO = {"ano_fechado": 7 * 24 * 3600, "ano_corrente": 3600}
+
+USER_AGENT = "RadarLegislativoLGBTQIA/1.0 (+https://huggingface.co/spaces/Veronyka/radar-legislativo-lgbtqi)"
+
+_sessao = None
+_lock_sessao = threading.Lock()
+_limites_host = {}
+_lock_limites = threading.Lock()
+_disjuntores_host = {}
+_latencias_host = {}  # host -> deque das latências recentes (hedge)
+_executor_hedge = None
+
+_cache_memoria = OrderedDict()  # chave -> entrada (LRU: mais recente no fim)
+_cache_bytes = 0
+_lock_cache = threading.Lock()
+_estatisticas = {"hits_memoria": 0, "hits_disco": 0, "misses": 0, "gravacoes": 0, "servidas_expiradas": 0, "hedges": 0}
+
+# Servidores locais (servidor_replay.py) que recebem URLs no formato {base}/{host real}/{caminho}
+_servidores_locais = set()
+
+
+def registrar_servidor_local(base_url: str):
+    """
+    Passa a tratar base_url como substituto local das APIs reais
+
+    Limites de conexão, TTLs e logs continuam valendo pelo host real, que vem no
+    primeiro segmento do caminho.
+    """
+    partes = urlparse(base_url)
+    _servidores_locais.add(partes.netloc)
+    sessao = obter_sessao()
+    sessao.mount(
+        f"{partes.scheme}://{partes.netloc}",
+        HTTPAdapter(pool_connections=1, pool_maxsize=sum(MAX_CONEXOES_POR_HOST.values()), max_retries=0)
+    )
+
+
+def host_da_url(url: str) -> str:
+    """Host real da URL (também para URLs reescritas para um servidor local)"""
+    partes = urlparse(url)
+    if partes.netloc in _servidores_locais:
+        return partes.path.lstrip('/').split('/', 1)[0]
+    return partes.netloc
+
+
+def limite_conexoes(url: str) -> int:
+    """Número máximo de conexões simultâneas permitido para o host da URL"""
+    return MAX_CONEXOES_POR_HOST.get(host_da_url(url), MAX_CONEXOES_PADRAO)
+
+
+def obter_sessao() -> requests.Session:
+    """Retorna a sessão HTTP compartilhada (criada sob demanda)"""
+    global _sessao
+    with _lock_sessao:
+        if _sessao is None:
+            sessao = requests.Session()
+            sessao.headers['User-Agent'] = USER_AGENT
+            # Pool dimensionado por host; retry é feito em get() para controlar backoff
+            for host, limite in MAX_CONEXOES_POR_HOST.items():
+                sessao.mount(f"https://{host}", HTTPAdapter(pool_connections=1, pool_maxsize=limite, max_retries=0))
+            adaptador_padrao = HTTPAdapter(pool_connections=8, pool_maxsize=MAX_CONEXOES_PADRAO, max_retries=0)
+            sessao.mount("https://", adaptador_padrao)
+            sessao.mount("http://", adaptador_padrao)
+            _sessao = sessao
+        return _sessao
+
+
+class LimiteAdaptativo:
+    """
+    Limite de requisições simultâneas de um host com aumento aditivo e redução
+    multiplicativa (AIMD)
+
+    Cada resposta rápida e bem-sucedida soma 1/limite (≈ +1 a cada "janela"
+    completa); 429/503/timeout multiplicam o limite por FATOR_REDUCAO.
+    """
+
+    def __init__(self, host: str, maximo: int, inicial: int = CONEXOES_INICIAIS):
+        self.host = host
+        self.maximo = maximo
+        self.limite = float(min(inicial, maximo))
+        self.em_uso = 0
+        self.reducoes = 0
+        self._ultima_reducao = 0.0
+        self._condicao = threading.Condition()
+
+    def adquirir(self):
+        with self._condicao:
+            while self.em_uso >= max(1, int(self.limite)):
+                self._condicao.wait()
+            self.em_uso += 1
+
+    def liberar(self, sucesso: bool, latencia: float = 0.0, sobrecarga: bool = False):
+        """
+        Args:
+            sucesso: Resposta obtida sem erro de servidor
+            latencia: Tempo da requisição (segundos)
+            sobrecarga: O host sinalizou excesso (429/503/timeout)
+        """
+        with self._condicao:
+            self.em_uso -= 1
+            agora = time.monotonic()
+            if sobrecarga:
+                if agora - self._ultima_reducao >= INTERVALO_REDUCAO:
+                    anterior = self.limite
+                    self.limite = max(1.0, self.limite * FATOR_REDUCAO)
+                    self._ultima_reducao = agora
+                    self.reducoes += 1
+                    if int(anterior) != int(self.limite):
+                        print(f"   🐢 {self.host}: reduzindo para {int(self.limite)} conexões simultâneas")
+            elif sucesso and latencia < LATENCIA_LENTA:
+                self.limite = min(float(self.maximo), self.limite + 1.0 / self.limite)
+            self._condicao.notify_all()
+
+    def estado(self) -> Dict:
+        with self._condicao:
+            return {"limite": int(self.limite), "maximo": self.maximo, "em_uso": self.em_uso, "reducoes": self.reducoes}
+
+
+def _limite_host(url: str) -> LimiteAdaptativo:
+    """Limitador adaptativo do host da URL (um por host, compartilhado pelo processo)"""
+    host = host_da_url(url)
+    with _lock_limites:
+        if host not in _limites_host:
+            _limites_host[host] = LimiteAdaptativo(host, limite_conexoes(url))
+        return _limites_host[host]
+
+
+def estado_limites() -> Dict[str, Dict]:
+    """Limite atual de conexões de cada host já acessado: {host: {'limite', 'maximo', 'em_uso', 'reducoes'}}"""
+    with _lock_limites:
+        limites = list(_limites_host.values())
+    return {limite.host: limite.estado() for limite in limites}
+
+
+class CircuitoAberto(requests.exceptions.ConnectionError):
+    """Host com o disjuntor aberto e sem resposta em cache para servir"""
+
+
+class Disjuntor:
+    """
+    Disjuntor (circuit breaker) de um host: fechado → aberto → meio-aberto → fechado
+
+    Fechado: tudo passa; FALHAS_PARA_ABRIR falhas seguidas (cada tentativa conta)
+    abrem o disjuntor. Aberto: nada passa até TEMPO_DISJUNTOR_ABERTO. Meio-aberto:
+    só uma requisição de teste passa; sucesso fecha, falha reabre.
+    """
+
+    def __init__(self, host: str):
+        self.host = host
+        self.estado = "fechado"
+        self.falhas = 0
+        self.aberturas = 0
+        self._aberto_ate = 0.0
+        self._teste_em_andamento = False
+        self._lock = threading.Lock()
+
+    def permite(self) -> bool:
+        with self._lock:
+            if self.estado == "fechado":
+                return True
+            if self.estado == "aberto" and time.monotonic() >= self._aberto_ate:
+                self.estado = "meio-aberto"
+            if self.estado == "meio-aberto" and not self._teste_em_andamento:
+                self._teste_em_andamento = True
+                return True
+            return False
+
+    def registrar(self, sucesso: bool):
+        with self._lock:
+            self._teste_em_andamento = False
+            if sucesso:
+                if self.estado != "fechado":
+                    print(f"   🔌 {self.host}: respondendo de novo, disjuntor fechado")
+                self.estado = "fechado"
+                self.falhas = 0
+                return
+            self.falhas += 1
+            if self.estado == "meio-aberto" or self.falhas >= FALHAS_PARA_ABRIR:
+                if self.estado != "aberto":
+                    print(f"   ⚡ {self.host}: {self.falhas} falhas seguidas, disjuntor aberto por {TEMPO_DISJUNTOR_ABERTO:.0f}s")
+                    self.aberturas += 1
+                self.estado = "aberto"
+                self._aberto_ate = time.monotonic() + TEMPO_DISJUNTOR_ABERTO
+
+    def desistir(self):
+        """A requisição saiu por um erro que não é do host: libera o teste do meio-aberto sem contar falha"""
+        with self._lock:
+            self._teste_em_andamento = False
+
+    def aberto(self) -> bool:
+        """Aberto por falhas de outras requisições (sem consumir o teste do meio-aberto)"""
+        with self._lock:
+            return self.estado == "aberto"
+
+    def situacao(self) -> Dict:
+        with self._lock:
+            return {"estado": self.estado, "falhas": self.falhas, "aberturas": self.aberturas}
+
+
+def _disjuntor_host(url: str) -> Disjuntor:
+    host = host_da_url(url)
+    with _lock_limites:
+        if host not in _disjuntores_host:
+            _disjuntores_host[host] = Disjuntor(host)
+        return _disjuntores_host[host]
+
+
+def estado_disjuntores() -> Dict[str, Dict]:
+    """Situação do disjuntor de cada host já acessado: {host: {'estado', 'falhas', 'aberturas'}}"""
+    with _lock_limites:
+        disjuntores = list(_disjuntores_host.values())
+    return {d.host: d.situacao() for d in disjuntores}
+
+
+def _registrar_latencia(url: str, latencia: float):
+    host = host_da_url(url)
+    with _lock_limites:
+        amostras = _latencias_host.setdefault(host, deque(maxlen=200))
+    amostras.append(latencia)
+
+
+def _limiar_hedge(url: str) -> Optional[float]:
+    """Espera (segundos) antes de disparar a requisição extra; None = poucas amostras"""
+    amostras = sorted(_latencias_host.get(host_da_url(url), ()))
+    if len(amostras) < HEDGE_AMOSTRAS_MINIMAS:
+        return None
+    return max(HEDGE_ESPERA_MINIMA, amostras[min(len(amostras) - 1, int(len(amostras) * HEDGE_PERCENTIL))])
+
+
+def _espera_retry_after(response: requests.Response) -> Optional[float]:
+    """Interpreta o header Retry-After (segundos ou data HTTP)"""
+    valor = response.headers.get('Retry-After')
+    if not valor:
+        return None
+    try:
+        return max(0.0, float(valor))
+    except ValueError:
+        pass
+    try:
+        data = parsedate_to_datetime(valor)
+        return max(0.0, (data - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def _espera_backoff(tentativa: int) -> float:
+    """Backoff exponencial com jitter completo: uniforme em [0, base * 2^tentativa]"""
+    return random.uniform(0, min(BACKOFF_MAXIMO, BACKOFF_BASE * (2 ** tentativa)))
+
+
+# ---------------------------------------------------------------------------
+# Cache de respostas
+# ---------------------------------------------------------------------------
+
+def ttl_para_ano(url: str, ano) -> float:
+    """TTL de cache (segundos) para uma consulta referente a um ano"""
+    politica = TTL_CACHE_POR_HOST.get(host_da_url(url), TTL_CACHE_PADRAO)
+    try:
+        fechado = int(ano) < datetime.now().year
+    except (TypeError, ValueError):
+        fechado = False
+    return politica["ano_fechado"] if fechado else politica["ano_corrente"]
+
+
+def _chave_cache(url: str, params: Dict, headers: Dict) -> str:
+    partes = {
+        "url": url,
+        "params": sorted((str(k), str(v)) for k, v in (params or {}).items()),
+        "accept": (headers or {}).get('Accept', ''),
+    }
+    return hashlib.sha256(json.dumps(partes, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def _caminho_cache_http(chave: str) -> str:
+    return os.path.join(CACHE_DIR_HTTP, chave[:2], chave + ".gz")
+
+
+def _guardar_memoria(chave: str, entrada: Dict):
+    global _cache_bytes
+    tamanho = len(entrada["corpo"])
+    if tamanho > CACHE_ENTRADA_MAX_BYTES:
+        return
+    with _lock_cache:
+        anterior = _cache_memoria.pop(chave, None)
+        if anterior is not None:
+            _cache_bytes -= len(anterior["corpo"])
+        _cache_memoria[chave] = entrada
+        _cache_bytes += tamanho
+        while _cache_bytes > CACHE_MEMORIA_MAX_BYTES and _cache_memoria:
+            _, removida = _cache_memoria.popitem(last=False)
+            _cache_bytes -= len(removida["corpo"])
+
+
+def _ler_cache(chave: str, aceitar_expirada: bool = False) -> Optional[Dict]:
+    """
+    Procura a entrada na memória e depois no disco; ignora entradas expiradas,
+    a não ser com aceitar_expirada (host fora do ar: melhor dado velho que nenhum)
+    """
+    agora = 0.0 if aceitar_expirada else time.time()
+    with _lock_cache:
+        entrada = _cache_memoria.get(chave)
+        if entrada is not None:
+            if entrada["expira_em"] > agora:
+                _cache_memoria.move_to_end(chave)
+                _estatisticas["servidas_expiradas" if aceitar_expirada else "hits_memoria"] += 1
+                return entrada
+    
+    try:
+        with gzip.open(_caminho_cache_http(chave), 'rb') as f:
+            meta = json.loads(f.readline())
+            if meta["expira_em"] <= agora:
+                return None
+            entrada = dict(meta, corpo=f.read())
+    except (OSError, ValueError, KeyError):
+        return None
+    
+    if not aceitar_expirada:
+        _guardar_memoria(chave, entrada)
+    with _lock_cache:
+        _estatisticas["servidas_expiradas" if aceitar_expirada else "hits_disco"] += 1
+    return entrada
+
+
+def _gravar_cache(chave: str, response: requests.Response, ttl: float):
+    entrada = {
+        "url": response.url,
+        "status": response.status_code,
+        "headers": {k: v for k, v in response.headers.items() if k.lower() in ('content-type', 'etag', 'last-modified')},
+        "expira_em": time.time() + ttl,
+        "corpo": response.content,
+    }
+    _guardar_memoria(chave, entrada)
+    
+    caminho = _caminho_cache_http(chave)
+    try:
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        tmp = f"{caminho}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp, 'wb') as f:
+            meta = {k: v for k, v in entrada.items() if k != "corpo"}
+            f.write(json.dumps(meta).encode('utf-8') + b"\n")
+            f.write(entrada["corpo"])
+        os.replace(tmp, caminho)
+    except OSError as e:
+        print(f"   ⚠️ Não foi possível gravar cache HTTP em disco: {e}")
+    
+    with _lock_cache:
+        _estatisticas["gravacoes"] += 1
+
+
+def _resposta_do_cache(entrada: Dict, expirada: bool = False) -> requests.Response:
+    """Reconstrói um requests.Response a partir de uma entrada do cache"""
+    response = requests.Response()
+    response.status_code = entrada["status"]
+    response.reason = "OK"
+    response.url = entrada["url"]
+    response.headers = CaseInsensitiveDict(entrada["headers"])
+    response.headers['X-Radar-Cache'] = 'STALE' if expirada else 'HIT'
+    response._content = entrada["corpo"]
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    return response
+
+
+def estatisticas_cache() -> Dict:
+    """Contadores do cache de respostas (hits por nível, misses, taxa de acerto, uso de memória)"""
+    with _lock_cache:
+        stats = dict(_estatisticas)
+        stats["entradas_memoria"] = len(_cache_memoria)
+        stats["bytes_memoria"] = _cache_bytes
+    consultas = stats["hits_memoria"] + stats["hits_disco"] + stats["misses"]
+    stats["taxa_acerto"] = (stats["hits_memoria"] + stats["hits_disco"]) / consultas if consultas else 0.0
+    return stats
+
+
+def limpar_cache(disco: bool = False):
+    """Esvazia o cache em memória (e opcionalmente o de disco) e zera as estatísticas"""
+    global _cache_bytes
+    with _lock_cache:
+        _cache_memoria.clear()
+        _cache_bytes = 0
+        for k in _estatisticas:
+            _estatisticas[k] = 0
+    if disco and os.path.isdir(CACHE_DIR_HTTP):
+        import shutil
+        shutil.rmtree(CACHE_DIR_HTTP, ignore_errors=True)
+
+
+def get(
+    url: str,
+    params: Dict = None,
+    headers: Dict = None,
+    timeout: float = 15,
+    stream: bool = False,
+    tentativas: int = None,
+    cache_ttl: Optional[float] = None,
+    hedge: Optional[bool] = None
+) -> requests.Response:
+    """
+    GET pela sessão compartilhada, com limite por host, retry e cache opcional
+
+    Repete a requisição em erros de conexão/timeout e em respostas 429/5xx.
+    Se as tentativas se esgotarem com status retentável, a última resposta é
+    devolvida (quem chama decide via raise_for_status); erros de rede são relançados.
+    Cada tentativa que falha conta no disjuntor do host; com ele aberto (inclusive
+    no meio das tentativas), devolve a resposta em cache mesmo expirada
+    (header X-Radar-Cache: STALE) ou levanta CircuitoAberto sem esperar a rede.
+
+    Args:
+        url: URL completa
+        params: Query string
+        headers: Headers adicionais
+        timeout: Timeout de cada tentativa em segundos
+        stream: Repassado ao requests (não lê o corpo imediatamente)
+        tentativas: Total de tentativas (padrão: TENTATIVAS_MAXIMAS)
+        cache_ttl: Se informado, respostas 200 são guardadas em cache por esse
+            tempo (segundos) e reaproveitadas; ver ttl_para_ano(). Ignorado com stream=True
+        hedge: Disparar uma segunda requisição se a primeira passar do percentil
+            de latência do host (None = HEDGE_ATIVO). Ignorado com stream=True
+
+    Returns:
+        requests.Response
+    """
+    if hedge is None:
+        hedge = HEDGE_ATIVO
+    buscar = _get_rede_hedge if hedge and not stream else _get_rede
+    
+    if cache_ttl and not stream:
+        chave = _chave_cache(url, params, headers)
+        entrada = _ler_cache(chave)
+        if entrada is not None:
+            return _resposta_do_cache(entrada)
+        with _lock_cache:
+            _estatisticas["misses"] += 1
+        try:
+            response = buscar(url, params, headers, timeout, stream, tentativas)
+        except CircuitoAberto:
+            entrada = _ler_cache(chave, aceitar_expirada=True)
+            if entrada is None:
+                raise
+            return _resposta_do_cache(entrada, expirada=True)
+        if response.status_code == 200:
+            _gravar_cache(chave, response, cache_ttl)
+        return response
+    
+    return buscar(url, params, headers, timeout, stream, tentativas)
+
+
+def _get_rede_hedge(
+    url: str,
+    params: Optional[Dict],
+    headers: Optional[Dict],
+    timeout: float,
+    stream: bool,
+    tentativas: Optional[int]
+) -> requests.Response:
+    """_get_rede com uma segunda requisição idêntica se a primeira demorar (ver HEDGE_PERCENTIL)"""
+    global _executor_hedge
+    limiar = _limiar_hedge(url)
+    if limiar is None:
+        return _get_rede(url, params, headers, timeout, stream, tentativas)
+    
+    with _lock_limites:
+        if _executor_hedge is None:
+            _executor_hedge = ThreadPoolExecutor(
+                max_workers=2 * sum(MAX_CONEXOES_POR_HOST.values()), thread_name_prefix="hedge"
+            )
+    
+    primeira = _executor_hedge.submit(_get_rede, url, params, headers, timeout, stream, tentativas)
+    try:
+        return primeira.result(timeout=limiar)
+    except FuturesTimeout:
+        pass
+    
+    segunda = _executor_hedge.submit(_get_rede, url, params, headers, timeout, stream, tentativas)
+    with _lock_cache:
+        _estatisticas["hedges"] += 1
+    
+    pendentes = {primeira, segunda}
+    erro = None
+    while pendentes:
+        concluidas, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+        for futuro in concluidas:
+            try:
+                response = futuro.result()
+            except Exception as e:
+                erro = e
+                continue
+            # A mais lenta é descartada quando terminar
+            for outra in pendentes:
+                outra.add_done_callback(lambda f: f.exception() is None and f.result().close())
+            return response
+    raise erro
+
+
+def _liberar_ao_fechar(response: requests.Response, limite: LimiteAdaptativo, inicio: float,
+                      sucesso: bool, sobrecarga: bool):
+    """
+    Com stream=True, mantém a vaga do host ocupada até o corpo ser lido e a
+    resposta fechada (response.close), e mede a latência até ali; se a resposta
+    for descartada sem close, a vaga é devolvida quando ela for coletada
+    """
+    lock = threading.Lock()
+    pendente = [True]
+
+    def liberar():
+        with lock:
+            if not pendente[0]:
+                return
+            pendente[0] = False
+        limite.liberar(sucesso, time.monotonic() - inicio, sobrecarga=sobrecarga)
+
+    fechar = response.close
+
+    def fechar_e_liberar():
+        try:
+            fechar()
+        finally:
+            liberar()
+
+    response.close = fechar_e_liberar
+    weakref.finalize(response, liberar)
+
+
+def _get_rede(
+    url: str,
+    params: Optional[Dict],
+    headers: Optional[Dict],
+    timeout: float,
+    stream: bool,
+    tentativas: Optional[int]
+) -> requests.Response:
+    """
+    Executa o GET na rede com retry (ver get())
+
+    Cada tentativa que falha (erro de rede, timeout, 429/5xx) conta no disjuntor do
+    host, então um host fora do ar abre o disjuntor já na primeira requisição em
+    vez de esperar todas as tentativas de várias delas. Exceções que não vêm do
+    requests (interrupção, erro de programação) sobem sem mexer no disjuntor.
+    Com stream=True, a vaga do limite do host só é devolvida quando a resposta é
+    fechada (o download do corpo também conta no limite e na latência).
+    """
+    if tentativas is None:
+        tentativas = TENTATIVAS_MAXIMAS
+    sessao = obter_sessao()
+
+    limite = _limite_host(url)
+    disjuntor = _disjuntor_host(url)
+
+    if not disjuntor.permite():
+        raise CircuitoAberto(f"{host_da_url(url)}: disjuntor aberto (host falhando)")
+
+    for tentativa in range(tentativas):
+        ultima = tentativa == tentativas - 1
+        if tentativa and disjuntor.aberto():
+            # Outras requisições já derrubaram o host: não insistir
+            raise CircuitoAberto(f"{host_da_url(url)}: disjuntor aberto (host falhando)")
+        limite.adquirir()
+        inicio = time.monotonic()
+        try:
+            response = sessao.get(url, params=params, headers=headers, timeout=timeout, stream=stream)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            limite.liberar(False, sobrecarga=isinstance(e, requests.exceptions.Timeout))
+            disjuntor.registrar(False)
+            if ultima:
+                raise
+            if disjuntor.aberto():
+                raise CircuitoAberto(f"{host_da_url(url)}: disjuntor aberto (host falhando)") from e
+            espera = _espera_backoff(tentativa)
+            print(f"   🔁 {host_da_url(url)}: {type(e).__name__}, nova tentativa em {espera:.1f}s")
+            time.sleep(espera)
+            continue
+        except requests.exceptions.RequestException:
+            limite.liberar(False)
+            disjuntor.registrar(False)
+            raise
+        except BaseException:
+            # Não é falha do host (KeyboardInterrupt, GeneratorExit, bug): só devolver a vaga
+            limite.liberar(False)
+            disjuntor.desistir()
+            raise
+        latencia = time.monotonic() - inicio
+        sucesso = response.status_code < 500 and response.status_code != 429
+        sobrecarga = response.status_code in STATUS_SOBRECARGA
+        if stream:
+            _liberar_ao_fechar(response, limite, inicio, sucesso, sobrecarga)
+        else:
+            limite.liberar(sucesso, latencia, sobrecarga=sobrecarga)
+        disjuntor.registrar(sucesso)
+
+        if response.status_code not in STATUS_RETENTAVEIS or ultima:
+            if sucesso:
+                _registrar_latencia(url, latencia)
+            return response
+
+        if disjuntor.aberto():
+            response.close()
+            raise CircuitoAberto(f"{host_da_url(url)}: disjuntor aberto (host falhando)")
+        espera = _espera_retry_after(response)
+        if espera is None:
+            espera = _espera_backoff(tentativa)
+        espera = min(espera, BACKOFF_MAXIMO)
+        print(f"   🔁 {host_da_url(url)}: HTTP {response.status_code}, nova tentativa em {espera:.1f}s")
+        response.close()
+        time.sleep(espera)
+
+    return response
+
+
+def _abrir_cache(chave: str, aceitar_expirada: bool = False):
+    """
+    Entrada do cache para leitura em blocos: bytes (memória), arquivo gzip já
+    posicionado no corpo (disco) ou None
+    """
+    agora = 0.0 if aceitar_expirada else time.time()
+    estatistica = "servidas_expiradas" if aceitar_expirada else None
+    with _lock_cache:
+        entrada = _cache_memoria.get(chave)
+        if entrada is not None and entrada["expira_em"] > agora:
+            _cache_memoria.move_to_end(chave)
+            _estatisticas[estatistica or "hits_memoria"] += 1
+            return entrada["corpo"]
+    
+    try:
+        arquivo = gzip.open(_caminho_cache_http(chave), 'rb')
+    except OSError:
+        return None
+    try:
+        meta = json.loads(arquivo.readline())
+        if meta["expira_em"] > agora:
+            with _lock_cache:
+                _estatisticas[estatistica or "hits_disco"] += 1
+            return arquivo
+    except (OSError, ValueError, KeyError):
+        pass
+    arquivo.close()
+    return None
+
+
+def _blocos_do_cache(origem, tamanho_bloco: int) -> Iterator[bytes]:
+    if isinstance(origem, bytes):
+        for i in range(0, len(origem), tamanho_bloco):
+            yield origem[i:i + tamanho_bloco]
+        return
+    with origem:
+        while True:
+            bloco = origem.read(tamanho_bloco)
+            if not bloco:
+                return
+            yield bloco
+
+
+def iterar_corpo(
+    url: str,
+    params: Dict = None,
+    headers: Dict = None,
+    timeout: float = 15,
+    cache_ttl: Optional[float] = None,
+    tamanho_bloco: int = 64 * 1024
+) -> Iterator[bytes]:
+    """
+    Itera o corpo de um GET em blocos, sem carregá-lo inteiro na memória
+
+    Com cache_ttl, um acerto no cache é lido bloco a bloco do disco; numa falta,
+    os blocos vindos da rede são gravados no cache enquanto são consumidos. Se
+    quem consome parar antes do fim, a conexão é fechada e nada é gravado. Com o
+    disjuntor do host aberto, serve a cópia em cache mesmo expirada.
+
+    Raises:
+        requests.exceptions.HTTPError: resposta com status de erro
+    """
+    chave = _chave_cache(url, params, headers) if cache_ttl else None
+    
+    if chave:
+        origem = _abrir_cache(chave)
+        if origem is not None:
+            yield from _blocos_do_cache(origem, tamanho_bloco)
+            return
+        with _lock_cache:
+            _estatisticas["misses"] += 1
+    
+    try:
+        response = _get_rede(url, params, headers, timeout, True, None)
+    except CircuitoAberto:
+        origem = _abrir_cache(chave, aceitar_expirada=True) if chave else None
+        if origem is None:
+            raise
+        yield from _blocos_do_cache(origem, tamanho_bloco)
+        return
+
+    try:
+        response.raise_for_status()
+        if not chave or response.status_code != 200:
+            yield from response.iter_content(chunk_size=tamanho_bloco)
+            return
+        
+        caminho = _caminho_cache_http(chave)
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        tmp = f"{caminho}.{threading.get_ident()}.tmp"
+        completo = False
+        try:
+            with gzip.open(tmp, 'wb') as f:
+                meta = {
+                    "url": response.url,
+                    "status": response.status_code,
+                    "headers": {k: v for k, v in response.headers.items() if k.lower() in ('content-type', 'etag', 'last-modified')},
+                    "expira_em": time.time() + cache_ttl,
+                }
+                f.write(json.dumps(meta).encode('utf-8') + b"\n")
+                for bloco in response.iter_content(chunk_size=tamanho_bloco):
+                    f.write(bloco)
+                    yield bloco
+            completo = True
+            os.replace(tmp, caminho)
+            with _lock_cache:
+                _estatisticas["gravacoes"] += 1
+        finally:
+            if not completo and os.path.exists(tmp):
+                os.remove(tmp)
+    finally:
+        response.close()
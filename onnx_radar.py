@@ -0,0 +1,237 @@
+"""
+Backend ONNX Runtime (int8) para os modelos do Ensemble Híbrido
+Exporta um modelo de classificação do Hugging Face para ONNX, aplica
+quantização dinâmica int8 e o executa com ONNX Runtime na CPU. O
+ClassificadorONNX é chamado como o pipeline "text-classification" do
+transformers (texto ou lista de textos -> [{'label', 'score'}]), então o resto
+do ensemble não muda.
+
+Dependência opcional: onnxruntime (pip install onnxruntime). Sem ela,
+carregar_modelos(backend="onnx") volta para os pipelines PyTorch.
+
+Uso:
+    python onnx_radar.py     # exporta e quantiza os dois modelos (primeira vez)
+"""
+
+import inspect
+import json
+import os
+import re
+import time
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from http_radar import CACHE_DIR
+
+DIR_ONNX = os.path.join(CACHE_DIR, "onnx")
+
+# Opset com suporte a todas as operações do BERT exportado pelo torch
+OPSET_ONNX = 14
+
+ARQUIVO_FP32 = "modelo.onnx"
+ARQUIVO_INT8 = "modelo.int8.onnx"
+
+# Modelo/revisão do Hub de onde a exportação saiu (para reexportar quando o Hub mudar)
+ARQUIVO_ORIGEM = "origem.json"
+
+# Consulta ao Hub para ver se o modelo mudou: no máximo uma vez por TTL (registrada
+# em origem.json) e com timeout curto, para não travar a carga do app sem rede
+VERIFICACAO_HUB_TTL_SEGUNDOS = 24 * 60 * 60
+TIMEOUT_HUB = 3.0
+
+
+def diretorio_modelo(model_id: str) -> str:
+    """Pasta do modelo exportado (ex.: azmina/ia-feminista-bert-posicao -> azmina__ia-feminista-bert-posicao)"""
+    return os.path.join(DIR_ONNX, re.sub(r'[^\w.-]+', '__', model_id))
+
+
+def revisao_hub(model_id: str) -> Optional[str]:
+    """Revisão (sha do commit) atual do modelo no Hub; None para pasta local ou sem rede"""
+    if os.path.isdir(model_id):
+        return None
+    try:
+        from huggingface_hub import HfApi
+
+        return HfApi().model_info(model_id, timeout=TIMEOUT_HUB).sha
+    except Exception:
+        return None
+
+
+def ler_origem(diretorio: str) -> Dict:
+    """Conteúdo de origem.json da exportação ({} se não existir)"""
+    try:
+        with open(os.path.join(diretorio, ARQUIVO_ORIGEM), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _gravar_origem(diretorio: str, origem: Dict):
+    with open(os.path.join(diretorio, ARQUIVO_ORIGEM), 'w', encoding='utf-8') as f:
+        json.dump(origem, f, ensure_ascii=False, indent=1)
+
+
+def exportar_onnx(model_id: str, tokenizer_id: Optional[str] = None, quantizar: bool = True) -> str:
+    """
+    Exporta o modelo para ONNX (eixos de lote e sequência dinâmicos) e quantiza em int8
+
+    Args:
+        model_id: Modelo de classificação no Hub
+        tokenizer_id: Tokenizer a usar (None = o do próprio modelo)
+        quantizar: Gerar também a versão int8 (quantização dinâmica dos pesos)
+
+    Returns:
+        Pasta com o(s) .onnx, tokenizer e config.json
+    """
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    destino = diretorio_modelo(model_id)
+    os.makedirs(destino, exist_ok=True)
+
+    print(f"   🔧 Exportando {model_id} para ONNX...")
+    tokenizer = AutoTokenizer.from_pretrained(tokenizer_id or model_id)
+    modelo = AutoModelForSequenceClassification.from_pretrained(model_id)
+    modelo.eval()
+
+    exemplo = tokenizer(["Dispõe sobre o nome social", "Texto de exemplo"], padding=True, return_tensors="pt")
+    entradas = [nome for nome in ("input_ids", "attention_mask", "token_type_ids") if nome in exemplo]
+    eixos = {nome: {0: "lote", 1: "sequencia"} for nome in entradas}
+    eixos["logits"] = {0: "lote"}
+
+    caminho_fp32 = os.path.join(destino, ARQUIVO_FP32)
+    # torch >= 2.9 usa por padrão o exportador dynamo (exige onnxscript e ignora
+    # dynamic_axes); o exportador TorchScript é o que este módulo usa
+    opcoes = {'dynamo': False} if 'dynamo' in inspect.signature(torch.onnx.export).parameters else {}
+    with torch.no_grad():
+        torch.onnx.export(
+            modelo,
+            tuple(exemplo[nome] for nome in entradas),
+            caminho_fp32,
+            input_names=entradas,
+            output_names=["logits"],
+            dynamic_axes=eixos,
+            opset_version=OPSET_ONNX,
+            **opcoes,
+        )
+    tokenizer.save_pretrained(destino)
+    modelo.config.save_pretrained(destino)
+    _gravar_origem(destino, {
+        'model_id': model_id,
+        'tokenizer_id': tokenizer_id or model_id,
+        'revisao': getattr(modelo.config, '_commit_hash', None) or revisao_hub(model_id),
+        'exportado_em': time.time(),
+        'verificado_em': time.time(),
+    })
+
+    if quantizar:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        quantize_dynamic(caminho_fp32, os.path.join(destino, ARQUIVO_INT8), weight_type=QuantType.QInt8)
+        print(f"   ✅ {model_id}: ONNX fp32 e int8 em {destino}")
+    else:
+        print(f"   ✅ {model_id}: ONNX fp32 em {destino}")
+    return destino
+
+
+class ClassificadorONNX:
+    """Modelo exportado rodando no ONNX Runtime, com a interface do pipeline text-classification"""
+
+    def __init__(self, diretorio: str, arquivo: str = ARQUIVO_INT8, threads: Optional[int] = None):
+        import onnxruntime as ort
+        from transformers import AutoConfig, AutoTokenizer
+
+        opcoes = ort.SessionOptions()
+        opcoes.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            opcoes.intra_op_num_threads = threads
+        self.sessao = ort.InferenceSession(
+            os.path.join(diretorio, arquivo), opcoes, providers=["CPUExecutionProvider"]
+        )
+        self.entradas = [e.name for e in self.sessao.get_inputs()]
+        self.tokenizer = AutoTokenizer.from_pretrained(diretorio)
+        config = AutoConfig.from_pretrained(diretorio)
+        # Mesmos atributos que _revisao_modelo lê de um pipeline (arquivo distingue fp32/int8);
+        # origem traz o modelo/revisão do Hub, já que config aponta para a pasta local
+        self.model = SimpleNamespace(config=config)
+        self.arquivo = arquivo
+        self.origem = ler_origem(diretorio)
+        self.id2label = config.id2label
+        self.sigmoide = config.num_labels == 1 or config.problem_type == "multi_label_classification"
+
+    def __call__(self, textos: Union[str, List[str]], truncation: bool = True, max_length: int = 256,
+                 batch_size: Optional[int] = None, **kwargs) -> List[Dict]:
+        lista = [textos] if isinstance(textos, str) else list(textos)
+        tamanho = batch_size or len(lista) or 1
+        saidas = []
+        for inicio in range(0, len(lista), tamanho):
+            codificado = self.tokenizer(
+                lista[inicio:inicio + tamanho], padding=True, truncation=truncation,
+                max_length=max_length, return_tensors="np"
+            )
+            logits = self.sessao.run(None, {nome: codificado[nome].astype(np.int64) for nome in self.entradas})[0]
+            saidas.extend(self._rotular(logits))
+        return saidas
+
+    def _rotular(self, logits: np.ndarray) -> List[Dict]:
+        """Maior classe e probabilidade (softmax, ou sigmoide com um só rótulo), como o pipeline"""
+        if self.sigmoide:
+            probabilidades = 1 / (1 + np.exp(-logits))
+        else:
+            deslocados = logits - logits.max(axis=-1, keepdims=True)
+            probabilidades = np.exp(deslocados) / np.exp(deslocados).sum(axis=-1, keepdims=True)
+        classes = probabilidades.argmax(axis=-1)
+        return [
+            {'label': self.id2label[int(c)], 'score': float(p[c])}
+            for c, p in zip(classes, probabilidades)
+        ]
+
+
+def _motivo_reexportar(destino: str, arquivo: str, model_id: str, tokenizer_id: Optional[str]) -> Optional[str]:
+    """Por que a exportação em disco não serve (None = serve)"""
+    if not os.path.exists(os.path.join(destino, arquivo)):
+        return "primeira exportação"
+    origem = ler_origem(destino)
+    if origem.get('model_id') != model_id or origem.get('tokenizer_id') != (tokenizer_id or model_id):
+        return "exportação sem origem conhecida"
+    if time.time() - origem.get('verificado_em', 0) < VERIFICACAO_HUB_TTL_SEGUNDOS:
+        return None
+    atual = revisao_hub(model_id)
+    if atual and atual != origem.get('revisao'):
+        return f"modelo atualizado no Hub ({str(origem.get('revisao'))[:8]} → {atual[:8]})"
+    # Mesma revisão ou Hub inacessível: próxima consulta só depois do TTL
+    origem['verificado_em'] = time.time()
+    try:
+        _gravar_origem(destino, origem)
+    except OSError:
+        pass
+    return None
+
+
+def carregar_onnx(model_id: str, tokenizer_id: Optional[str] = None, quantizado: bool = True) -> ClassificadorONNX:
+    """
+    Carrega o modelo no ONNX Runtime, exportando/quantizando quando necessário
+
+    Reexporta na primeira vez e quando a revisão do modelo no Hub for diferente
+    da registrada em origem.json. O Hub é consultado no máximo uma vez a cada
+    VERIFICACAO_HUB_TTL_SEGUNDOS, com timeout de TIMEOUT_HUB; sem rede, usa a
+    exportação existente.
+    """
+    import onnxruntime  # noqa: F401 - falhar cedo (e cair para PyTorch) se não estiver instalado
+
+    destino = diretorio_modelo(model_id)
+    arquivo = ARQUIVO_INT8 if quantizado else ARQUIVO_FP32
+    motivo = _motivo_reexportar(destino, arquivo, model_id, tokenizer_id)
+    if motivo:
+        print(f"   🔧 {model_id}: exportando para ONNX ({motivo})")
+        exportar_onnx(model_id, tokenizer_id, quantizar=quantizado)
+    return ClassificadorONNX(destino, arquivo)
+
+
+if __name__ == "__main__":
+    from ensemble_híbrido import MODEL_RADAR, MODEL_AZMINA, TOKENIZER_AZMINA
+
+    exportar_onnx(MODEL_RADAR)
+    exportar_onnx(MODEL_AZMINA, TOKENIZER_AZMINA)
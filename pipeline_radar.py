@@ -0,0 +1,305 @@
+"""
+Pipeline em fluxo do radar: buscar → filtrar → agrupar duplicatas → classificar
+Cada etapa é um gerador que consome o anterior, então as primeiras PLs
+classificadas saem enquanto as páginas seguintes ainda estão chegando e a
+memória fica limitada à janela em voo, não ao total de resultados.
+
+Exemplo:
+    pls = fontes_em_fluxo(["camara", "senado"], 2022, 2024)
+    for pl in classificar(limitar(agrupar_duplicatas(filtrar(pls)), 50), radar, azmina):
+        print(pl['Nº'], pl['Classificação'])
+"""
+
+import queue
+import re
+import threading
+import time
+from contextlib import closing
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from api_radar import (
+    TERMOS_BUSCA,
+    NOMES_FONTES,
+    iterar_camara_deputados,
+    enriquecer_camara,
+    buscar_senado_federal,
+    buscar_alesp,
+    buscar_camara_sao_paulo,
+    termos_na_ementa,
+)
+from registro_radar import hash_ementa, normalizar_ementa
+
+# Quantas PLs podem ficar prontas esperando o consumidor (por fluxo)
+TAMANHO_FILA = 200
+
+# PLs da Câmara enriquecidas por vez (detalhes/autores em paralelo dentro do lote)
+TAMANHO_LOTE_DETALHES = 10
+
+# PLs classificadas por vez (uma chamada de cada modelo por lote)
+TAMANHO_LOTE_CLASSIFICACAO = 16
+
+# Ementas normalizadas mais curtas que isso ("Sem ementa", "N/A") não agrupam PLs
+EMENTA_MINIMA_AGRUPAR = 20
+
+# Numeração unificada do Congresso (desde 2019): o mesmo "PL n/ano" na Câmara e no Senado
+ANO_NUMERACAO_UNIFICADA = 2019
+_RE_PL_FEDERAL = re.compile(r'^PL\s+0*(\d+)/(\d{4})$')
+CASAS_FEDERAIS = ('Câmara', 'Senado')
+
+_FIM = object()
+
+
+def _camara_em_fluxo(ano_inicio: int, ano_fim: int, limite: int) -> Iterator[Dict]:
+    """PLs da Câmara página a página, com Autores/Status preenchidos em lotes"""
+    with closing(iterar_camara_deputados(reversed(range(ano_inicio, ano_fim + 1)))) as pls:
+        yield from enriquecer(islice(pls, limite))
+
+
+# Fonte -> gerador de PLs (ano_inicio, ano_fim, limite); cada um já para em
+# `limite` PLs. Fontes sem paginação devolvem o ano inteiro de uma vez; a Câmara
+# sai página a página.
+GERADORES_FONTES: Dict[str, Callable[[int, int, int], Iterable[Dict]]] = {
+    'camara': _camara_em_fluxo,
+    'senado': lambda a, b, limite: buscar_senado_federal(limite=limite, ano_inicio_manual=a, ano_fim_manual=b),
+    'alesp': lambda a, b, limite: buscar_alesp(limite=limite, ano_inicio_manual=a, ano_fim_manual=b),
+    'camara_sp': lambda a, b, limite: buscar_camara_sao_paulo(limite=limite, ano_inicio_manual=a, ano_fim_manual=b),
+}
+
+
+def fontes_em_fluxo(
+    fontes: Optional[List[str]],
+    ano_inicio: int,
+    ano_fim: int,
+    limite_por_fonte: int = 50,
+    prazo_total: Optional[float] = None
+) -> Iterator[Dict]:
+    """
+    Gera as PLs de várias fontes à medida que cada uma as produz
+
+    Cada fonte roda numa thread que deposita PLs numa fila limitada (TAMANHO_FILA);
+    a thread espera quando a fila enche e para quando o consumidor fecha o gerador.
+
+    Args:
+        fontes: Identificadores de api_radar.NOMES_FONTES (None = todas)
+        ano_inicio: Ano inicial
+        ano_fim: Ano final
+        limite_por_fonte: Máximo de PLs de cada fonte
+        prazo_total: Segundos até parar de esperar fontes lentas (None = sem prazo)
+
+    Yields:
+        PLs no formato dos buscar_* de api_radar, na ordem em que chegam
+    """
+    fontes = list(fontes) if fontes else list(NOMES_FONTES)
+    fila = queue.Queue(maxsize=TAMANHO_FILA)
+    parar = threading.Event()
+
+    def depositar(item) -> bool:
+        while not parar.is_set():
+            try:
+                fila.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produzir(fonte):
+        try:
+            gerador = GERADORES_FONTES[fonte](int(ano_inicio), int(ano_fim), limite_por_fonte)
+            for pl in gerador:
+                if not depositar(pl):
+                    break
+            if hasattr(gerador, 'close'):
+                gerador.close()
+        except Exception as e:
+            print(f"   ⚠️ Erro no fluxo de {NOMES_FONTES.get(fonte, fonte)}: {str(e)[:100]}")
+        finally:
+            depositar(_FIM)
+
+    for fonte in fontes:
+        threading.Thread(target=produzir, args=(fonte,), name=f"fluxo-{fonte}", daemon=True).start()
+
+    prazo = time.time() + prazo_total if prazo_total else None
+    ativas = len(fontes)
+    try:
+        while ativas:
+            espera = None if prazo is None else prazo - time.time()
+            if espera is not None and espera <= 0:
+                print(f"   ⏱️ Prazo de {prazo_total:.0f}s esgotado; {ativas} fonte(s) ainda sem terminar")
+                break
+            try:
+                item = fila.get(timeout=espera)
+            except queue.Empty:
+                continue
+            if item is _FIM:
+                ativas -= 1
+            else:
+                yield item
+    finally:
+        parar.set()
+
+
+def enriquecer(pls: Iterable[Dict], tamanho_lote: int = TAMANHO_LOTE_DETALHES) -> Iterator[Dict]:
+    """Preenche Autores/Status das PLs da Câmara em lotes (ver api_radar.enriquecer_camara)"""
+    lote = []
+    for pl in pls:
+        lote.append(pl)
+        if len(lote) >= tamanho_lote:
+            yield from enriquecer_camara(lote)
+            lote = []
+    if lote:
+        yield from enriquecer_camara(lote)
+
+
+def filtrar(pls: Iterable[Dict], termos_minimos: int = 1) -> Iterator[Dict]:
+    """Versão em fluxo de api_radar.filtrar_pls_relevantes (anota Termos_Encontrados)"""
+    for pl in pls:
+        presentes = termos_na_ementa(pl.get('Ementa', ''))
+        termos_encontrados = sum(1 for termo in TERMOS_BUSCA if termo.lower() in presentes)
+        if termos_encontrados >= termos_minimos:
+            pl['Termos_Encontrados'] = termos_encontrados
+            yield pl
+
+
+def deduplicar(pls: Iterable[Dict], chave: Callable[[Dict], str] = None) -> Iterator[Dict]:
+    """Descarta PLs repetidas (padrão: mesmo Nº e Ano), mantendo a primeira"""
+    if chave is None:
+        chave = lambda pl: f"{pl.get('Nº')}_{pl.get('Ano')}"
+    vistas = set()
+    for pl in pls:
+        identificador = chave(pl)
+        if identificador not in vistas:
+            vistas.add(identificador)
+            yield pl
+
+
+def _chaves_duplicata(pl: Dict) -> List[str]:
+    """Chaves que identificam a mesma proposição: registro, ementa normalizada e número federal"""
+    chaves = [f"registro:{pl.get('Casa')}:{pl.get('Nº')}:{pl.get('Ano')}"]
+    
+    if len(normalizar_ementa(pl.get('Ementa', ''))) >= EMENTA_MINIMA_AGRUPAR:
+        chaves.append(f"ementa:{hash_ementa(pl.get('Ementa', ''))}")
+    
+    federal = _RE_PL_FEDERAL.match(str(pl.get('Nº', '')).strip())
+    if pl.get('Casa') in CASAS_FEDERAIS and federal and int(federal.group(2)) >= ANO_NUMERACAO_UNIFICADA:
+        chaves.append(f"federal:PL {federal.group(1)}/{federal.group(2)}")
+    
+    return chaves
+
+
+def agrupar_duplicatas(pls: Iterable[Dict]) -> Iterator[Dict]:
+    """
+    Junta registros da mesma proposição vindos de Casas/anos diferentes
+    
+    Dois registros são a mesma proposição se têm a mesma ementa normalizada
+    (caixa, acentos, pontuação e espaços ignorados), o mesmo Nº/Ano na mesma
+    Casa, ou o mesmo "PL n/ano" na Câmara e no Senado (numeração unificada).
+    
+    Em fluxo: o primeiro registro de cada grupo sai na hora, como representante,
+    com 'Casas', 'Links' e 'Duplicatas'; os seguintes são anexados a ele (as
+    listas crescem no objeto já entregue) e não saem de novo, então cada
+    proposição é classificada uma vez. Use expandir_grupos para voltar a um
+    registro por Casa.
+    """
+    representantes = {}
+    for pl in pls:
+        chaves = _chaves_duplicata(pl)
+        representante = next((representantes[c] for c in chaves if c in representantes), None)
+        
+        if representante is None:
+            pl['Casas'] = [pl.get('Casa')]
+            pl['Links'] = [pl.get('Link')]
+            pl['Duplicatas'] = []
+            for chave in chaves:
+                representantes[chave] = pl
+            yield pl
+            continue
+        
+        if pl.get('Casa') not in representante['Casas']:
+            representante['Casas'].append(pl.get('Casa'))
+        if pl.get('Link') not in representante['Links']:
+            representante['Links'].append(pl.get('Link'))
+        representante['Duplicatas'].append(pl)
+        for chave in chaves:
+            representantes.setdefault(chave, representante)
+
+
+def expandir_grupos(pls: Iterable[Dict]) -> Iterator[Dict]:
+    """Desfaz agrupar_duplicatas: cada duplicata sai com a classificação do seu representante"""
+    for pl in pls:
+        yield pl
+        for duplicata in pl.get('Duplicatas') or []:
+            for chave in ('Classificação', 'Score', 'Resultado', 'Termos_Encontrados'):
+                if chave in pl:
+                    duplicata[chave] = pl[chave]
+            yield duplicata
+
+
+def limitar(pls: Iterable[Dict], limite: int) -> Iterator[Dict]:
+    """Para depois de `limite` PLs e fecha as etapas anteriores (que param de buscar)"""
+    try:
+        for i, pl in enumerate(pls, 1):
+            yield pl
+            if i >= limite:
+                break
+    finally:
+        if hasattr(pls, 'close'):
+            pls.close()
+
+
+def classificar(
+    pls: Iterable[Dict],
+    radar_model,
+    azmina_model,
+    tamanho_lote: int = TAMANHO_LOTE_CLASSIFICACAO,
+    usar_cache: bool = True
+) -> Iterator[Dict]:
+    """
+    Classifica as PLs com o Ensemble Híbrido em lotes, à medida que chegam
+
+    Cada lote de `tamanho_lote` PLs passa pelos modelos de uma vez
+    (classificar_ensemble_batch); o último lote sai incompleto quando o fluxo acaba.
+    Com `usar_cache`, ementas já classificadas com os mesmos modelos/padrões/pesos
+    vêm do cache persistente (cache_classificacao) sem passar pelos modelos.
+
+    Yields:
+        A PL com 'Classificação', 'Score' (0-1) e 'Resultado' (saída completa de
+        classificar_ensemble); PLs sem ementa são descartadas
+    """
+    # Import tardio: carregar transformers só quando a etapa for usada
+    from ensemble_híbrido import classificar_ensemble_batch, classificar_ensemble_cache
+    classificar_textos = classificar_ensemble_cache if usar_cache else classificar_ensemble_batch
+
+    def classificar_lote(lote):
+        resultados = classificar_textos([pl['Ementa'] for pl in lote], radar_model, azmina_model)
+        for pl, resultado in zip(lote, resultados):
+            pl['Classificação'] = resultado['classificacao']
+            pl['Score'] = resultado['score_final']
+            pl['Resultado'] = resultado
+            yield pl
+
+    lote = []
+    for pl in pls:
+        if not pl.get('Ementa', ''):
+            continue
+        lote.append(pl)
+        if len(lote) >= tamanho_lote:
+            yield from classificar_lote(lote)
+            lote = []
+    if lote:
+        yield from classificar_lote(lote)
+
+
+def pipeline(
+    fontes: Optional[List[str]],
+    ano_inicio: int,
+    ano_fim: int,
+    radar_model,
+    azmina_model,
+    limite: int = 50,
+    limite_por_fonte: Optional[int] = None,
+    prazo_total: Optional[float] = None
+) -> Iterator[Dict]:
+    """Encadeia todas as etapas: fontes_em_fluxo → filtrar → agrupar_duplicatas → limitar → classificar"""
+    pls = fontes_em_fluxo(fontes, ano_inicio, ano_fim, limite_por_fonte or limite, prazo_total)
+    return classificar(limitar(agrupar_duplicatas(filtrar(pls)), limite), radar_model, azmina_model)
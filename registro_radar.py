@@ -0,0 +1,186 @@
+"""
+Representação compacta das PLs coletadas pelo radar
+RegistroPL usa __slots__, interna os campos categóricos (Casa, Fonte, Ano, Status)
+e só monta o Link quando ele é lido; continua se comportando como o dicionário
+{'Nº', 'Ano', 'Casa', 'Ementa', 'Autores', 'Data', 'Link', 'Status', 'Fonte'}
+usado pelo resto do sistema (pl['Nº'], pl.get('Link'), pd.DataFrame, etc.).
+"""
+
+import hashlib
+import re
+import sys
+import unicodedata
+from collections.abc import MutableMapping
+from typing import Dict, Iterable, List, Optional
+
+# Casa -> (modelo do link a partir do id de origem, link quando não há id)
+LINKS_POR_CASA = {
+    'Câmara': (
+        "https://www.camara.leg.br/proposicoesWeb/fichadetramitacao?idProposicao={}",
+        "https://www.camara.leg.br/proposicoesWeb/fichadetramitacao?idProposicao=",
+    ),
+    'Senado': (
+        "https://www25.senado.leg.br/web/atividade/materias/-/materia/{}",
+        "https://www25.senado.leg.br/web/atividade/materias",
+    ),
+    'Câmara Municipal SP': (
+        "https://www.saopaulo.sp.leg.br/vereadores/projetos-de-lei/?projeto={}",
+        "https://www.saopaulo.sp.leg.br/",
+    ),
+    'ALESP': (
+        "https://www.al.sp.gov.br/propositura/?id={}",
+        "https://www.al.sp.gov.br/",
+    ),
+}
+
+# Chave do dicionário -> atributo do registro (ordem = ordem das chaves)
+_CAMPOS = {
+    'Nº': 'numero',
+    'Ano': 'ano',
+    'Casa': 'casa',
+    'Ementa': 'ementa',
+    'Autores': 'autores',
+    'Data': 'data',
+    'Link': 'link',
+    'Status': 'status',
+    'Fonte': 'fonte',
+}
+
+
+_RE_NAO_ALFANUMERICO = re.compile(r'[^0-9a-z]+')
+
+
+def normalizar_ementa(ementa: str) -> str:
+    """
+    Forma canônica da ementa para comparação: sem acentos, minúscula, sem
+    pontuação e com espaços simples ("Dispõe  sobre o 'Nome Social'." -> "dispoe sobre o nome social")
+    """
+    sem_acentos = unicodedata.normalize('NFKD', str(ementa or ''))
+    sem_acentos = ''.join(c for c in sem_acentos if not unicodedata.combining(c))
+    return _RE_NAO_ALFANUMERICO.sub(' ', sem_acentos.lower()).strip()
+
+
+def hash_ementa(ementa: str) -> str:
+    """Hash (hex) da ementa normalizada - igual para ementas que só diferem em caixa/acentos/pontuação"""
+    return hashlib.sha1(normalizar_ementa(ementa).encode('utf-8')).hexdigest()
+
+
+def _internar(valor) -> str:
+    return sys.intern(str(valor)) if valor is not None else 'N/A'
+
+
+class RegistroPL(MutableMapping):
+    """
+    Uma PL do radar, compatível com o dicionário que os buscar_* devolviam
+
+    Chaves extras (ex.: 'Termos_Encontrados', 'Classificação') são aceitas e
+    ficam num dicionário à parte, criado só quando necessário.
+    """
+
+    __slots__ = ('numero', 'ano', 'casa', 'ementa', 'autores', 'data', 'status', 'fonte',
+                 'id_origem', '_link', '_extras')
+
+    def __init__(
+        self,
+        numero: str,
+        ano,
+        casa: str,
+        ementa: str,
+        autores: str = 'N/A',
+        data: str = 'N/A',
+        status: str = 'N/A',
+        fonte: str = 'N/A',
+        id_origem: Optional[str] = None,
+        link: Optional[str] = None
+    ):
+        self.numero = numero
+        self.ano = _internar(ano)
+        self.casa = _internar(casa)
+        self.ementa = ementa
+        self.autores = autores
+        self.data = data
+        self.status = _internar(status)
+        self.fonte = _internar(fonte)
+        self.id_origem = id_origem
+        self._link = link
+        self._extras = None
+
+    @property
+    def link(self) -> str:
+        """Link explícito ou derivado do id de origem (LINKS_POR_CASA)"""
+        if self._link is not None:
+            return self._link
+        modelo, padrao = LINKS_POR_CASA.get(self.casa, ("{}", "N/A"))
+        return modelo.format(self.id_origem) if self.id_origem else padrao
+
+    @link.setter
+    def link(self, valor: str):
+        self._link = valor
+
+    @classmethod
+    def de_dict(cls, pl: Dict) -> 'RegistroPL':
+        """Cria um registro a partir do dicionário de PL (chaves desconhecidas viram extras)"""
+        registro = cls(
+            numero=pl.get('Nº', 'N/A'),
+            ano=pl.get('Ano', 'N/A'),
+            casa=pl.get('Casa', 'N/A'),
+            ementa=pl.get('Ementa', ''),
+            autores=pl.get('Autores', 'N/A'),
+            data=pl.get('Data', 'N/A'),
+            status=pl.get('Status', 'N/A'),
+            fonte=pl.get('Fonte', 'N/A'),
+            link=pl.get('Link'),
+        )
+        for chave, valor in pl.items():
+            if chave not in _CAMPOS:
+                registro[chave] = valor
+        return registro
+
+    def para_dict(self) -> Dict:
+        """Dicionário equivalente (para JSON, pandas ou código que exige dict)"""
+        return dict(self.items())
+
+    # Protocolo de dicionário
+
+    def __getitem__(self, chave):
+        atributo = _CAMPOS.get(chave)
+        if atributo is not None:
+            return getattr(self, atributo)
+        if self._extras is not None and chave in self._extras:
+            return self._extras[chave]
+        raise KeyError(chave)
+
+    def __setitem__(self, chave, valor):
+        atributo = _CAMPOS.get(chave)
+        if atributo in ('ano', 'casa', 'status', 'fonte'):
+            valor = _internar(valor)
+        if atributo is not None:
+            setattr(self, atributo, valor)
+        else:
+            if self._extras is None:
+                self._extras = {}
+            self._extras[chave] = valor
+
+    def __delitem__(self, chave):
+        if chave in _CAMPOS or self._extras is None or chave not in self._extras:
+            raise KeyError(chave)
+        del self._extras[chave]
+
+    def __iter__(self):
+        yield from _CAMPOS
+        if self._extras:
+            yield from self._extras
+
+    def __len__(self):
+        return len(_CAMPOS) + (len(self._extras) if self._extras else 0)
+
+    def __contains__(self, chave):
+        return chave in _CAMPOS or (self._extras is not None and chave in self._extras)
+
+    def __repr__(self):
+        return f"RegistroPL({self.numero!r}, {self.casa!r})"
+
+
+def para_dicts(pls: Iterable) -> List[Dict]:
+    """Converte registros (ou dicionários) em dicionários simples"""
+    return [pl.para_dict() if isinstance(pl, RegistroPL) else dict(pl) for pl in pls]
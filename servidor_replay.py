@@ -0,0 +1,292 @@
+"""
+Servidor local que substitui as APIs legislativas com respostas gravadas
+Permite rodar buscas, benchmarks e testes de regressão sem acessar a rede.
+
+Modos:
+    gravar    - repassa cada requisição à API real e grava a resposta
+    reproduzir - responde só com o que foi gravado (404 para o que não foi)
+
+As URLs têm o formato http://127.0.0.1:PORTA/{host real}/{caminho}; para apontar
+o radar para o servidor use api_radar.usar_servidor_local(url) ou a variável
+de ambiente RADAR_REPLAY_URL.
+
+Uso:
+    python servidor_replay.py --gravar              # capturar respostas reais
+    RADAR_REPLAY_URL=http://127.0.0.1:8765 python teste_rapido.py
+    python servidor_replay.py --latencia 0.2 --erros 0.05 --rps 5
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+
+DIR_GRAVACOES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gravacoes_api")
+
+# Hosts que o servidor aceita substituir
+HOSTS_PERMITIDOS = {
+    "dadosabertos.camara.leg.br",
+    "legis.senado.leg.br",
+    "splegisws.saopaulo.sp.leg.br",
+    "www.al.sp.gov.br",
+}
+
+# Headers da resposta real que valem a pena reproduzir
+HEADERS_GRAVADOS = ("Content-Type", "ETag", "Last-Modified")
+
+
+def chave_requisicao(host: str, caminho: str, query: str) -> str:
+    """Identificador estável da requisição (parâmetros em ordem alfabética)"""
+    query_normalizada = urlencode(sorted(parse_qsl(query, keep_blank_values=True)))
+    return hashlib.sha256(f"{host}{caminho}?{query_normalizada}".encode('utf-8')).hexdigest()[:24]
+
+
+class Gravacoes:
+    """Respostas gravadas em disco: {dir}/{host}/{chave}.json (meta) + .bin (corpo)"""
+
+    def __init__(self, diretorio: str):
+        self.diretorio = diretorio
+
+    def _caminhos(self, host: str, chave: str) -> Tuple[str, str]:
+        base = os.path.join(self.diretorio, host, chave)
+        return base + ".json", base + ".bin"
+
+    def ler(self, host: str, chave: str) -> Optional[Tuple[Dict, str]]:
+        """(meta, caminho do corpo) ou None se a requisição não foi gravada"""
+        caminho_meta, caminho_corpo = self._caminhos(host, chave)
+        if not os.path.exists(caminho_meta) or not os.path.exists(caminho_corpo):
+            return None
+        with open(caminho_meta, 'r', encoding='utf-8') as f:
+            return json.load(f), caminho_corpo
+
+    def gravar(self, host: str, chave: str, meta: Dict, response: requests.Response):
+        caminho_meta, caminho_corpo = self._caminhos(host, chave)
+        os.makedirs(os.path.dirname(caminho_meta), exist_ok=True)
+        tmp = caminho_corpo + ".tmp"
+        with open(tmp, 'wb') as f:
+            for bloco in response.iter_content(64 * 1024):
+                f.write(bloco)
+        os.replace(tmp, caminho_corpo)
+        with open(caminho_meta, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=1)
+
+
+class LimiteTaxa:
+    """Token bucket por host: `rps` requisições por segundo, rajada de até `rps`"""
+
+    def __init__(self, rps: float):
+        self.rps = rps
+        self._baldes = {}
+        self._lock = threading.Lock()
+
+    def permitir(self, host: str) -> bool:
+        if not self.rps:
+            return True
+        with self._lock:
+            agora = time.monotonic()
+            fichas, visto = self._baldes.get(host, (self.rps, agora))
+            fichas = min(self.rps, fichas + (agora - visto) * self.rps)
+            if fichas < 1:
+                self._baldes[host] = (fichas, agora)
+                return False
+            self._baldes[host] = (fichas - 1, agora)
+            return True
+
+
+class Configuracao:
+    """Comportamento do servidor (compartilhado por todas as threads)"""
+
+    def __init__(self, gravacoes: Gravacoes, gravar: bool = False, latencia: float = 0.0,
+                 variacao: float = 0.0, erros: float = 0.0, status_erro: int = 503,
+                 rps: float = 0.0, seed: Optional[int] = None):
+        self.gravacoes = gravacoes
+        self.gravar = gravar
+        self.latencia = latencia
+        self.variacao = variacao
+        self.erros = erros
+        self.status_erro = status_erro
+        self.limite = LimiteTaxa(rps)
+        self.aleatorio = random.Random(seed)
+        self.contadores = {"requisicoes": 0, "reproduzidas": 0, "gravadas": 0, "ausentes": 0,
+                           "erros_injetados": 0, "limitadas": 0, "bytes": 0}
+        self._lock = threading.Lock()
+
+    def contar(self, chave: str, valor: int = 1):
+        with self._lock:
+            self.contadores[chave] += valor
+
+    def sortear(self) -> float:
+        with self._lock:
+            return self.aleatorio.random()
+
+
+def criar_handler(config: Configuracao):
+    """Classe de handler HTTP ligada a uma configuração"""
+
+    class ReplayHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, formato, *args):
+            pass  # Sem log por requisição (atrapalha benchmarks)
+
+        def _responder_vazio(self, status: int, headers: Dict = None, mensagem: str = ""):
+            corpo = mensagem.encode('utf-8')
+            self.send_response(status)
+            for nome, valor in (headers or {}).items():
+                self.send_header(nome, valor)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Content-Length", str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def do_GET(self):
+            config.contar("requisicoes")
+            partes = urlsplit(self.path)
+            host, _, caminho = partes.path.lstrip('/').partition('/')
+            caminho = '/' + caminho
+            if host not in HOSTS_PERMITIDOS:
+                self._responder_vazio(400, mensagem=f"host desconhecido: {host}")
+                return
+
+            if config.latencia or config.variacao:
+                time.sleep(max(0.0, config.latencia + config.variacao * (2 * config.sortear() - 1)))
+
+            if not config.limite.permitir(host):
+                config.contar("limitadas")
+                self._responder_vazio(429, {"Retry-After": "1"}, "limite de taxa")
+                return
+
+            if config.erros and config.sortear() < config.erros:
+                config.contar("erros_injetados")
+                self._responder_vazio(config.status_erro, mensagem="erro injetado")
+                return
+
+            chave = chave_requisicao(host, caminho, partes.query)
+            gravada = config.gravacoes.ler(host, chave)
+
+            if gravada is None and config.gravar:
+                gravada = self._capturar(host, caminho, partes.query, chave)
+                if gravada is None:
+                    return
+            elif gravada is None:
+                config.contar("ausentes")
+                self._responder_vazio(404, mensagem=f"sem gravação para {host}{caminho}?{partes.query}")
+                return
+            else:
+                config.contar("reproduzidas")
+
+            meta, caminho_corpo = gravada
+            etag = meta["headers"].get("ETag")
+            if etag and self.headers.get("If-None-Match") == etag:
+                self._responder_vazio(304, {"ETag": etag})
+                return
+
+            tamanho = os.path.getsize(caminho_corpo)
+            self.send_response(meta["status"])
+            for nome, valor in meta["headers"].items():
+                self.send_header(nome, valor)
+            self.send_header("Content-Length", str(tamanho))
+            self.end_headers()
+            with open(caminho_corpo, 'rb') as f:
+                while True:
+                    bloco = f.read(64 * 1024)
+                    if not bloco:
+                        break
+                    self.wfile.write(bloco)
+            config.contar("bytes", tamanho)
+
+        def _capturar(self, host: str, caminho: str, query: str, chave: str):
+            """Busca na API real, grava e devolve (meta, corpo); None se já respondeu com erro"""
+            url = f"https://{host}{caminho}" + (f"?{query}" if query else "")
+            try:
+                response = requests.get(url, stream=True, timeout=120, headers={"Accept": self.headers.get("Accept", "*/*")})
+            except requests.RequestException as e:
+                self._responder_vazio(502, mensagem=f"falha ao acessar {url}: {e}")
+                return None
+            if response.status_code != 200:
+                # Erros da API real são repassados, mas não gravados
+                self._responder_vazio(response.status_code, mensagem=response.text[:500])
+                return None
+            meta = {
+                "url": url,
+                "status": 200,
+                "headers": {h: response.headers[h] for h in HEADERS_GRAVADOS if h in response.headers},
+                "gravado_em": time.time(),
+            }
+            config.gravacoes.gravar(host, chave, meta, response)
+            config.contar("gravadas")
+            print(f"   💾 Gravado: {url[:120]}")
+            return config.gravacoes.ler(host, chave)
+
+    return ReplayHandler
+
+
+def iniciar_servidor(
+    porta: int = 0,
+    diretorio: str = DIR_GRAVACOES,
+    gravar: bool = False,
+    latencia: float = 0.0,
+    variacao: float = 0.0,
+    erros: float = 0.0,
+    status_erro: int = 503,
+    rps: float = 0.0,
+    seed: Optional[int] = None
+) -> Tuple[ThreadingHTTPServer, Configuracao]:
+    """
+    Sobe o servidor numa thread em segundo plano
+
+    Args:
+        porta: Porta local (0 = escolher uma livre)
+        diretorio: Onde ficam as gravações
+        gravar: Repassar à API real e gravar o que ainda não foi gravado
+        latencia: Atraso fixo por requisição (segundos)
+        variacao: Variação aleatória (±) somada à latência
+        erros: Probabilidade de responder status_erro em vez da gravação
+        rps: Requisições por segundo por host antes de responder 429 (0 = sem limite)
+        seed: Semente para latência/erros reproduzíveis
+
+    Returns:
+        (servidor, configuração) - URL base em f"http://127.0.0.1:{servidor.server_port}";
+        encerrar com servidor.shutdown()
+    """
+    config = Configuracao(Gravacoes(diretorio), gravar, latencia, variacao, erros, status_erro, rps, seed)
+    servidor = ThreadingHTTPServer(("127.0.0.1", porta), criar_handler(config))
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, name="servidor-replay", daemon=True).start()
+    return servidor, config
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--dir", default=DIR_GRAVACOES, help="diretório das gravações")
+    parser.add_argument("--gravar", action="store_true", help="capturar respostas reais que faltarem")
+    parser.add_argument("--latencia", type=float, default=0.0, help="atraso por requisição (s)")
+    parser.add_argument("--variacao", type=float, default=0.0, help="variação ± da latência (s)")
+    parser.add_argument("--erros", type=float, default=0.0, help="fração de respostas com erro (0-1)")
+    parser.add_argument("--status-erro", type=int, default=503)
+    parser.add_argument("--rps", type=float, default=0.0, help="limite de requisições/s por host (0 = sem)")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    servidor, config = iniciar_servidor(
+        args.porta, args.dir, args.gravar, args.latencia, args.variacao,
+        args.erros, args.status_erro, args.rps, args.seed
+    )
+    modo = "gravando" if args.gravar else "reproduzindo"
+    print(f"🛰️ Servidor de respostas em http://127.0.0.1:{servidor.server_port} ({modo}, {args.dir})")
+    print(f"   Use: RADAR_REPLAY_URL=http://127.0.0.1:{servidor.server_port}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        servidor.shutdown()
+        print(f"\n📊 {config.contadores}")
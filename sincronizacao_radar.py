@@ -0,0 +1,203 @@
+"""
+Sincronização incremental das fontes do radar com o armazenamento local
+Anos já fechados são buscados uma única vez; o ano corrente é revisitado no
+máximo uma vez por dia, a partir da última data de apresentação já vista.
+"""
+
+import time
+from datetime import datetime
+from functools import partial
+from typing import Dict, List, Optional
+
+import armazenamento_radar
+from api_radar import (
+    buscar_camara_deputados,
+    buscar_senado_federal,
+    buscar_camara_sao_paulo,
+    buscar_alesp,
+    executar_em_paralelo,
+)
+
+# Intervalo mínimo entre revisitas de anos ainda abertos (ano corrente)
+SINCRONIZACAO_TTL_SEGUNDOS = 24 * 60 * 60
+
+# Sem limite prático: a sincronização quer todas as PLs relevantes do período
+LIMITE_SINCRONIZACAO = 100000
+
+
+def _buscar_camara(ano_inicio: int, ano_fim: int, desde: str = None, erros: List[str] = None) -> List[Dict]:
+    return buscar_camara_deputados(
+        sigla_tipo="PL",
+        limite=LIMITE_SINCRONIZACAO,
+        ano_inicio_manual=ano_inicio,
+        ano_fim_manual=ano_fim,
+        data_inicio=desde,
+        modo="palavras_chave",
+        erros=erros
+    )
+
+
+def _buscar_senado(ano_inicio: int, ano_fim: int, desde: str = None, erros: List[str] = None) -> List[Dict]:
+    # A API do Senado devolve o ano inteiro; `desde` é aplicado no merge
+    return buscar_senado_federal(
+        limite=LIMITE_SINCRONIZACAO, ano_inicio_manual=ano_inicio, ano_fim_manual=ano_fim, erros=erros
+    )
+
+
+def _buscar_alesp(ano_inicio: int, ano_fim: int, desde: str = None, erros: List[str] = None) -> List[Dict]:
+    return buscar_alesp(limite=LIMITE_SINCRONIZACAO, ano_inicio_manual=ano_inicio, ano_fim_manual=ano_fim, erros=erros)
+
+
+def _buscar_camara_sp(ano_inicio: int, ano_fim: int, desde: str = None, erros: List[str] = None) -> List[Dict]:
+    return buscar_camara_sao_paulo(
+        limite=LIMITE_SINCRONIZACAO, ano_inicio_manual=ano_inicio, ano_fim_manual=ano_fim, erros=erros
+    )
+
+
+# Identificador da fonte -> função de busca (ano_inicio, ano_fim, desde, erros);
+# cada requisição que falhar é acrescentada a `erros`
+FONTES = {
+    'camara': _buscar_camara,
+    'senado': _buscar_senado,
+    'alesp': _buscar_alesp,
+    'camara_sp': _buscar_camara_sp,
+}
+
+
+def _agrupar_anos(anos: List[int]) -> List[tuple]:
+    """Agrupa anos em intervalos contíguos: [2010, 2011, 2014] -> [(2010, 2011), (2014, 2014)]"""
+    intervalos = []
+    for ano in sorted(anos):
+        if intervalos and ano == intervalos[-1][1] + 1:
+            intervalos[-1] = (intervalos[-1][0], ano)
+        else:
+            intervalos.append((ano, ano))
+    return intervalos
+
+
+def anos_pendentes(fonte: str, ano_inicio: int, ano_fim: int, forcar: bool = False) -> Dict[int, str]:
+    """
+    Anos do intervalo que precisam ser buscados na fonte
+
+    Returns:
+        {ano: marca_dagua} - marca_dagua é None para anos nunca sincronizados
+        (busca completa) ou a última data vista para anos abertos (busca incremental)
+    """
+    estado = armazenamento_radar.estado_sincronizacao(fonte)
+    agora = time.time()
+    pendentes = {}
+
+    for ano in range(int(ano_inicio), int(ano_fim) + 1):
+        info = estado.get(ano)
+        if forcar or info is None:
+            pendentes[ano] = None
+        elif not info['completo'] and agora - info['sincronizado_em'] >= SINCRONIZACAO_TTL_SEGUNDOS:
+            pendentes[ano] = info['marca_dagua']
+
+    return pendentes
+
+
+def _avisar_falhas(fonte: str, periodo: str, erros: List[str]) -> int:
+    """Avisa que o período fica pendente por falhas na busca; devolve quantas foram"""
+    if erros:
+        print(f"   ⚠️ {fonte}: {len(erros)} requisição(ões) falharam em {periodo} - "
+              f"nova tentativa em {SINCRONIZACAO_TTL_SEGUNDOS // 3600}h")
+    return len(erros)
+
+
+def sincronizar_fonte(fonte: str, ano_inicio: int, ano_fim: int, forcar: bool = False) -> Dict:
+    """
+    Atualiza o armazenamento local com as PLs da fonte no intervalo de anos
+
+    Um ano é marcado como completo quando já estava fechado (anterior ao ano
+    corrente) no momento da sincronização, todas as requisições da busca deram
+    certo e ela retornou PLs. Anos com falhas, sem resultado (possível falha
+    silenciosa da API) ou ainda abertos são revisitados após
+    SINCRONIZACAO_TTL_SEGUNDOS; depois de uma falha, a marca d'água do ano não
+    avança, para a nova busca cobrir o que faltou.
+
+    Returns:
+        Estatísticas: {'anos_buscados', 'recebidas', 'novas', 'erros', 'tempo'}
+    """
+    inicio = time.time()
+    buscar = FONTES[fonte]
+    ano_atual = datetime.now().year
+    pendentes = anos_pendentes(fonte, ano_inicio, ano_fim, forcar)
+
+    if not pendentes:
+        print(f"   💾 {fonte}: {ano_inicio}-{ano_fim} já sincronizado localmente")
+        return {'anos_buscados': [], 'recebidas': 0, 'novas': 0, 'erros': 0, 'tempo': time.time() - inicio}
+
+    recebidas = 0
+    novas = 0
+    total_erros = 0
+
+    # Anos nunca vistos: busca completa em intervalos contíguos
+    completos = [ano for ano, marca in pendentes.items() if marca is None]
+    for a, b in _agrupar_anos(completos):
+        print(f"   🔄 {fonte}: sincronizando {a}-{b} (busca completa)")
+        erros = []
+        pls = buscar(a, b, erros=erros)
+        recebidas += len(pls)
+        novas += armazenamento_radar.salvar_pls(fonte, pls)
+        total_erros += _avisar_falhas(fonte, f"{a}-{b}", erros)
+        for ano in range(a, b + 1):
+            tem_pls = any(str(pl.get('Ano')) == str(ano) for pl in pls)
+            armazenamento_radar.registrar_sincronizacao(
+                fonte, ano, completo=ano < ano_atual and tem_pls and not erros, com_falhas=bool(erros)
+            )
+
+    # Anos abertos: só o que foi apresentado a partir da marca d'água
+    for ano, marca in pendentes.items():
+        if marca is None:
+            continue
+        print(f"   🔄 {fonte}: sincronizando {ano} (incremental desde {marca})")
+        erros = []
+        pls = [pl for pl in buscar(ano, ano, desde=marca, erros=erros) if str(pl.get('Data', ''))[:10] >= marca]
+        recebidas += len(pls)
+        novas += armazenamento_radar.salvar_pls(fonte, pls)
+        total_erros += _avisar_falhas(fonte, str(ano), erros)
+        tem_pls = bool(pls) or armazenamento_radar.marca_dagua(fonte, ano) is not None
+        armazenamento_radar.registrar_sincronizacao(
+            fonte, ano, completo=ano < ano_atual and tem_pls and not erros, com_falhas=bool(erros)
+        )
+
+    tempo = time.time() - inicio
+    print(f"   ✅ {fonte}: {recebidas} PLs recebidas, {novas} novas ({tempo:.1f}s)")
+    return {
+        'anos_buscados': sorted(pendentes), 'recebidas': recebidas, 'novas': novas,
+        'erros': total_erros, 'tempo': tempo
+    }
+
+
+def sincronizar(
+    fontes: List[str],
+    ano_inicio: int,
+    ano_fim: int,
+    forcar: bool = False,
+    timeout_por_fonte: Optional[Dict[str, float]] = None,
+    prazo_total: Optional[float] = None
+) -> Dict[str, Dict]:
+    """
+    Sincroniza várias fontes em paralelo; retorna as estatísticas de cada uma
+    
+    Fontes que estouram o tempo continuam gravando em segundo plano e ficam
+    com {'status': 'timeout'}; a consulta ao armazenamento usa o que já existir.
+    """
+    resultados, status = executar_em_paralelo(
+        {fonte: partial(sincronizar_fonte, fonte, ano_inicio, ano_fim, forcar) for fonte in fontes},
+        timeout_por_fonte=timeout_por_fonte,
+        prazo_total=prazo_total
+    )
+    
+    estatisticas = {}
+    for fonte in fontes:
+        info = status[fonte]
+        if info['status'] == 'erro':
+            print(f"   ⚠️ Erro ao sincronizar {fonte}: {info['erro'][:100]}")
+        elif info['status'] == 'timeout':
+            print(f"   ⏱️ {fonte}: sincronização passou de {info['tempo']:.0f}s, seguindo com a base local")
+        estatisticas[fonte] = {**resultados.get(fonte, {}), 'status': info['status'], 'tempo': info['tempo']}
+        if info['erro']:
+            estatisticas[fonte]['erro'] = info['erro']
+    return estatisticas
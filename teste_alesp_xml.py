@@ -0,0 +1,80 @@
+"""
+Teste do parsing incremental do proposituras.zip da ALESP
+Gera ZIPs sintéticos com <propositura> direto na raiz e dentro de um elemento
+intermediário, confere os registros lidos e que a memória não cresce com o
+número de proposituras.
+
+Uso: python teste_alesp_xml.py [--proposituras 100000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import tracemalloc
+import zipfile
+
+from api_radar import _iterar_proposituras_alesp
+
+PROPOSITURA = (
+    "<propositura><AnoLegislativo>2023</AnoLegislativo><NroLegislativo>{i}</NroLegislativo>"
+    "<Ementa>Dispõe sobre o uso do nome social de pessoas trans número {i}</Ementa>"
+    "<IdDocumento>{i}</IdDocumento><Autor>Autor {i}</Autor><Sigla>pl</Sigla>"
+    "<DtEntradaSistema>2023-05-01T10:00:00</DtEntradaSistema></propositura>"
+)
+
+# Estruturas testadas: prefixo/sufixo em volta das proposituras
+ESTRUTURAS = {
+    'na_raiz': ("<proposituras>", "</proposituras>"),
+    'aninhada': ("<dados><lista><proposituras>", "</proposituras></lista></dados>"),
+}
+
+
+def criar_zip(diretorio: str, nome: str, total: int, estrutura) -> str:
+    """ZIP com um XML de `total` proposituras, escrito em partes"""
+    caminho = os.path.join(diretorio, f"{nome}_{total}.zip")
+    abre, fecha = estrutura
+    with zipfile.ZipFile(caminho, 'w', zipfile.ZIP_DEFLATED) as zip_ref:
+        with zip_ref.open("proposituras.xml", 'w') as f:
+            f.write(f'<?xml version="1.0" encoding="UTF-8"?>{abre}'.encode('utf-8'))
+            for i in range(total):
+                f.write(PROPOSITURA.format(i=i).encode('utf-8'))
+            f.write(fecha.encode('utf-8'))
+    return caminho
+
+
+def pico_memoria(caminho_zip: str) -> int:
+    """Maior memória alocada (bytes) enquanto o ZIP é percorrido"""
+    tracemalloc.start()
+    for _ in _iterar_proposituras_alesp(caminho_zip):
+        pass
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return pico
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--proposituras", type=int, default=100000)
+    args = parser.parse_args()
+
+    falhas = 0
+    with tempfile.TemporaryDirectory() as diretorio:
+        for nome, estrutura in ESTRUTURAS.items():
+            registros = list(_iterar_proposituras_alesp(criar_zip(diretorio, nome, 3, estrutura)))
+            corretos = (
+                [r.numero for r in registros] == ['0', '1', '2']
+                and registros[1].sigla == 'PL' and registros[1].data == '2023-05-01'
+                and registros[2].ementa.endswith('número 2')
+            )
+            pequeno = pico_memoria(criar_zip(diretorio, nome, args.proposituras // 10, estrutura))
+            grande = pico_memoria(criar_zip(diretorio, nome, args.proposituras, estrutura))
+            # 10x mais proposituras não pode multiplicar a memória (folga para buffers do parser)
+            limitada = grande < pequeno * 2
+            falhas += not (corretos and limitada)
+            print(f"   {'✅' if corretos and limitada else '❌'} {nome:9} registros {'ok' if corretos else 'ERRADOS'} | "
+                  f"pico {pequeno / 1024:.0f} KB ({args.proposituras // 10}) → {grande / 1024:.0f} KB ({args.proposituras})")
+
+    if falhas:
+        sys.exit(1)
+    print("\n✅ Parsing incremental com memória constante nas duas estruturas")
@@ -0,0 +1,105 @@
+"""
+Teste de equivalência da cascata do Ensemble Híbrido
+Classifica as PLs anotadas (e variações sintéticas) com o ensemble completo e
+com a cascata, item a item e em lote, e confere que as classificações são
+idênticas; mostra quantas inferências dos modelos a cascata evitou.
+
+Sem --modelos, os modelos são substituídos por classificadores determinísticos
+que devolvem scores espalhados por todo o intervalo 0-1 (incluindo os extremos
+e falhas), o que exercita os limiares sem baixar os modelos reais.
+
+Uso: python teste_cascata.py [--modelos]
+"""
+
+import argparse
+import hashlib
+import sys
+
+from ensemble_híbrido import (
+    KEYWORDS_FAVORAVEIS,
+    KEYWORDS_DESFAVORAVEIS,
+    PADROES_ALTA_PRIORIDADE,
+    carregar_modelos,
+    classificar_ensemble,
+    classificar_ensemble_batch,
+)
+from processar_pls import processar_resultados_md
+
+
+class ModeloSimulado:
+    """Classificador determinístico com a interface do pipeline, que conta os textos vistos"""
+
+    def __init__(self, rotulos, semente: str):
+        self.rotulos = rotulos
+        self.semente = semente
+        self.textos_vistos = 0
+
+    def _saida(self, texto: str):
+        valor = int(hashlib.sha1(f"{self.semente}{texto}".encode('utf-8')).hexdigest(), 16) % 1003
+        if valor == 1002:
+            raise RuntimeError("falha simulada")
+        return {'label': self.rotulos[valor % 2], 'score': min(valor, 1000) / 1000}
+
+    def __call__(self, textos, **kwargs):
+        lista = [textos] if isinstance(textos, str) else list(textos)
+        self.textos_vistos += len(lista)
+        return [self._saida(t) for t in lista]
+
+
+def textos_de_teste():
+    """Ementas anotadas + frases sintéticas combinando padrões favoráveis/desfavoráveis"""
+    textos = []
+    for arquivo in ("resultados1.md", "resultados2.md"):
+        try:
+            textos += [str(e) for e in processar_resultados_md(arquivo)['Ementa'] if str(e).strip()]
+        except (OSError, KeyError):
+            pass
+    termos = [p.replace('.*', ' ').replace('\\', '').replace('(', '').replace(')', '').split('|')[0]
+              for p in KEYWORDS_FAVORAVEIS + KEYWORDS_DESFAVORAVEIS + PADROES_ALTA_PRIORIDADE]
+    for i in range(len(termos)):
+        textos.append(f"Dispõe sobre {termos[i]} e {termos[(i * 7) % len(termos)]}")
+        textos.append(f"Altera a lei para tratar de {termos[i]}")
+    textos.append("Institui o dia municipal do ciclista")
+    return textos
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modelos", action="store_true", help="usar os modelos reais (carregar_modelos)")
+    args = parser.parse_args()
+
+    textos = textos_de_teste()
+    if args.modelos:
+        combinacoes = [carregar_modelos()]
+    else:
+        radar = ModeloSimulado(['HATE', 'NOT_HATE'], 'radar')
+        azmina = ModeloSimulado(['LABEL_0', 'LABEL_1'], 'azmina')
+        combinacoes = [(radar, azmina), (radar, None), (None, azmina), (None, None)]
+    print(f"🧪 {len(textos)} textos, {len(combinacoes)} combinação(ões) de modelos\n")
+
+    divergencias = 0
+    for radar, azmina in combinacoes:
+        completo = [classificar_ensemble(t, radar, azmina, cascata=False) for t in textos]
+        cascata = [classificar_ensemble(t, radar, azmina, cascata=True) for t in textos]
+        cascata_lote = classificar_ensemble_batch(textos, radar, azmina, cascata=True)
+
+        for texto, a, b, c in zip(textos, completo, cascata, cascata_lote):
+            minimo, maximo = b['intervalo_score']
+            if not (a['classificacao'] == b['classificacao'] == c['classificacao']
+                    and minimo <= a['score_final'] <= maximo):
+                divergencias += 1
+                print(f"   ❌ {texto[:70]}: completo={a['classificacao']} ({a['score_final']:.4f}) "
+                      f"cascata={b['classificacao']} {b['intervalo_score']} lote={c['classificacao']}")
+
+        modelos_presentes = sum(m is not None for m in (radar, azmina))
+        evitadas = sum(len(r['sinais_nao_avaliados']) for r in cascata)
+        curtos = sum(r['curto_circuito'] for r in cascata)
+        total = modelos_presentes * len(textos)
+        nomes = f"radar={'sim' if radar else 'não'}, azmina={'sim' if azmina else 'não'}"
+        print(f"   {nomes}: {curtos}/{len(textos)} em curto-circuito, "
+              f"{evitadas}/{total} inferências evitadas" + (f" ({evitadas / total:.0%})" if total else ""))
+
+    if divergencias:
+        print(f"\n❌ {divergencias} classificações diferentes entre cascata e ensemble completo")
+        sys.exit(1)
+    print("\n✅ Cascata equivalente ao ensemble completo em todas as classificações")
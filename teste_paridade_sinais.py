@@ -0,0 +1,95 @@
+"""
+Teste de paridade dos sinais de keywords/padrões
+Compara o motor pré-compilado do ensemble_híbrido (avaliar_padroes) com a
+avaliação original (re.search padrão a padrão) nas PLs anotadas, e mede o ganho.
+
+Uso: python teste_paridade_sinais.py [resultados1.md ...]
+"""
+
+import re
+import sys
+import time
+
+from ensemble_híbrido import (
+    KEYWORDS_FAVORAVEIS,
+    KEYWORDS_DESFAVORAVEIS,
+    PADROES_ALTA_PRIORIDADE,
+    PADROES_RESTRITIVOS,
+    PADROES_FAVORAVEIS_ALTA,
+    extrair_keywords,
+    detectar_padroes_restritivos,
+    _score_keywords,
+    avaliar_padroes,
+)
+from processar_pls import processar_resultados_md
+
+
+def keywords_original(texto: str):
+    texto_lower = texto.lower()
+    favoraveis = sum(1 for kw in KEYWORDS_FAVORAVEIS if re.search(kw, texto_lower, re.IGNORECASE))
+    desfavoraveis = sum(1 for kw in KEYWORDS_DESFAVORAVEIS if re.search(kw, texto_lower, re.IGNORECASE))
+    if re.search(r'criminaliza.*terapia.*conversão', texto_lower, re.IGNORECASE):
+        desfavoraveis = max(0, desfavoraveis - 1)
+        favoraveis += 1
+    return favoraveis, desfavoraveis
+
+
+def padroes_original(texto: str) -> float:
+    texto_lower = texto.lower()
+    matches_alta = sum(1 for p in PADROES_ALTA_PRIORIDADE if re.search(p, texto_lower, re.IGNORECASE))
+    matches_normais = sum(1 for p in PADROES_RESTRITIVOS if re.search(p, texto_lower, re.IGNORECASE))
+    if matches_alta > 0:
+        return max(0.99, min(0.995, 0.99 + (matches_alta * 0.002)))
+    total_peso_max = (len(PADROES_ALTA_PRIORIDADE) * 2) + len(PADROES_RESTRITIVOS)
+    return min(((matches_alta * 2) + matches_normais) / total_peso_max, 1.0)
+
+
+def score_keywords_original(texto: str) -> float:
+    texto_lower = texto.lower()
+    if any(re.search(p, texto_lower, re.IGNORECASE) for p in PADROES_FAVORAVEIS_ALTA):
+        return 0.15
+    kw_fav, kw_desfav = keywords_original(texto)
+    return min(kw_desfav / (kw_fav + kw_desfav if (kw_fav + kw_desfav) > 0 else 1), 1.0)
+
+
+def sinais_original(texto: str):
+    return keywords_original(texto), padroes_original(texto), score_keywords_original(texto)
+
+
+def sinais_novo(texto: str):
+    casamentos = avaliar_padroes(texto)
+    return (extrair_keywords(texto, casamentos), detectar_padroes_restritivos(texto, casamentos),
+            _score_keywords(texto, casamentos))
+
+
+if __name__ == "__main__":
+    arquivos = sys.argv[1:] or ["resultados1.md", "resultados2.md"]
+    ementas = []
+    for arquivo in arquivos:
+        df = processar_resultados_md(arquivo)
+        ementas += [str(e) for e in df.get('Ementa', []) if str(e).strip()]
+    # Variações de caixa também precisam dar o mesmo resultado
+    textos = ementas + [e.upper() for e in ementas] + [e.title() for e in ementas]
+    print(f"🧪 {len(ementas)} ementas anotadas ({len(textos)} textos com variações de caixa)\n")
+
+    divergencias = [(t, sinais_original(t), sinais_novo(t)) for t in textos if sinais_original(t) != sinais_novo(t)]
+    for texto, antigo, novo in divergencias[:10]:
+        print(f"   ❌ {texto[:80]}\n      original={antigo} novo={novo}")
+
+    repeticoes = 20
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        for t in textos:
+            sinais_original(t)
+    t_original = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        for t in textos:
+            sinais_novo(t)
+    t_novo = time.perf_counter() - inicio
+
+    print(f"   original: {t_original:.3f}s | pré-compilado: {t_novo:.3f}s ({t_original / t_novo:.1f}x)")
+    if divergencias:
+        print(f"\n❌ {len(divergencias)} textos com sinais diferentes")
+        sys.exit(1)
+    print("\n✅ Paridade: sinais idênticos em todos os textos")